@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML write stage of Xenocrates.
+
+Compares the original per-entry print() writer with the buffered,
+template-compiled write_index() renderer on a synthetic sorted index,
+and checks that both produce byte-identical output.
+
+Run with: python benchmarks/bench_render.py [--entries N] [--repeat R]
+"""
+
+import argparse
+import html
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+# Add parent directory to path so we can import xenocrates
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import xenocrates  # noqa: E402
+
+
+def make_entries(count, seed=401):
+    """Build a deterministic, sorted synthetic index."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(2000)]
+    books = [f"SEC{n}" for n in (401, 503, 504, 542, 560)]
+    entries = []
+    for _ in range(count):
+        title = " ".join(rng.choices(words, k=rng.randint(1, 4))).upper()
+        description = " ".join(rng.choices(words, k=rng.randint(5, 30))) + " <a & b>"
+        course = rng.choice(["", "GSE"])
+        entries.append([title, description, str(rng.randint(1, 300)), rng.choice(books), course])
+    entries.sort(key=lambda entry: entry[0])
+    return entries
+
+
+def legacy_write_index(entries, output):
+    """The original writer: one print() per line of every entry and header."""
+    current_section = 0
+    for title_upper, description, page, book, course in entries:
+        first_char = title_upper.strip('"')[:1]
+        if not first_char:
+            continue
+        section_num, section_header = xenocrates.get_section_header(first_char)
+        if section_num != current_section:
+            print(section_header, file=output)
+            current_section = section_num
+
+        title_escaped = html.escape(title_upper, quote=True)
+        desc_escaped = html.escape(description, quote=True)
+        page_escaped = html.escape(page, quote=True)
+        book_escaped = html.escape(book, quote=True)
+        course_escaped = html.escape(course, quote=True) if course else ""
+        print("<span class=topic><b><span style='color:blue'>", file=output)
+        print(f" {title_escaped} ", file=output)
+        print("</span></b></span><span style='color:black'>&nbsp;", file=output)
+        if course:
+            ref_str = f"{{c-{course_escaped} / b-{book_escaped} / p-{page_escaped}}}"
+        else:
+            ref_str = f"{{b-{book_escaped} / p-{page_escaped}}}"
+        print(f"<br><i>{ref_str}</i><br>{desc_escaped}<br></span>", file=output)
+
+
+def time_writer(writer, entries, path, repeat):
+    """Return the best wall time of writer() over repeat runs, writing to path."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as output:
+            writer(entries, output)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML write stage")
+    parser.add_argument("--entries", type=int, default=200_000, help="Number of synthetic entries (default: 200000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per writer; the best time is reported")
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.html")
+        buffered_path = os.path.join(tmp, "buffered.html")
+
+        legacy = time_writer(legacy_write_index, entries, legacy_path, args.repeat)
+        buffered = time_writer(xenocrates.write_index, entries, buffered_path, args.repeat)
+
+        with open(legacy_path, "rb") as a, open(buffered_path, "rb") as b:
+            identical = a.read() == b.read()
+
+    print(f"Entries:           {args.entries:,}")
+    print(f"print() writer:    {legacy:.3f}s ({args.entries / legacy:,.0f} entries/s)")
+    print(f"write_index():     {buffered:.3f}s ({args.entries / buffered:,.0f} entries/s)")
+    print(f"Speedup:           {legacy / buffered:.2f}x")
+    print(f"Byte-identical:    {'yes' if identical else 'NO'}")
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
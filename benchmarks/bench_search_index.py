@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark the embedded client-side search index (--search-index).
+
+Measures how long ClientSearchIndex takes to collect postings while the
+HTML is written, and how large the embedded data makes the page, raw and
+gzip-compressed, relative to the index itself.
+
+Run with: python benchmarks/bench_search_index.py [--entries N] [--repeat R]
+"""
+
+import argparse
+import gzip
+import io
+import os
+import sys
+import time
+
+# Add parent directory to path so we can import xenocrates
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_render import make_entries  # noqa: E402
+
+import xenocrates  # noqa: E402
+
+
+def render(entries, search=None):
+    """Render entries to a string, collecting postings into search if given."""
+    output = io.StringIO()
+    xenocrates.write_index(search.observe(entries) if search else entries, output)
+    if search:
+        output.write(search.render_script())
+    return output.getvalue()
+
+
+def best_time(func, repeat):
+    """Return the best wall time and the last result of func() over repeat runs."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the embedded search index")
+    parser.add_argument("--entries", type=int, default=200_000, help="Number of synthetic entries (default: 200000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best time is reported")
+    args = parser.parse_args()
+
+    entries = [xenocrates.Entry(*entry) for entry in make_entries(args.entries)]
+
+    plain_time, plain = best_time(lambda: render(entries), args.repeat)
+    search_time, searchable = best_time(lambda: render(entries, xenocrates.ClientSearchIndex()), args.repeat)
+
+    plain_bytes = plain.encode("utf-8")
+    script_bytes = searchable.encode("utf-8")[len(plain_bytes) :]
+    plain_gz = len(gzip.compress(plain_bytes))
+    script_gz = len(gzip.compress(plain_bytes + script_bytes)) - plain_gz
+
+    print(f"Entries:           {args.entries:,}")
+    print(f"Render only:       {plain_time:.3f}s")
+    print(f"Render + postings: {search_time:.3f}s (+{search_time - plain_time:.3f}s)")
+    print(f"HTML size:         {len(plain_bytes):,} bytes ({plain_gz:,} gzip)")
+    print(
+        f"Search data:       {len(script_bytes):,} bytes ({len(script_bytes) / len(plain_bytes):.0%}), "
+        f"{script_gz:,} gzip ({script_gz / plain_gz:.0%})"
+    )
+
+    if not searchable.startswith(plain):
+        print("Index HTML changed by --search-index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Fixtures for the pytest-benchmark suite (see test_bench_stages.py).
+
+Synthetic corpora from tests/create_test_files.py are generated on first use
+and kept in benchmarks/.corpus, so repeated runs time the same files.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+# Import xenocrates and the corpus generator
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+import create_test_files  # noqa: E402
+
+CORPUS_DIR = os.path.join(BENCH_DIR, ".corpus")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--corpus-size",
+        default="10k",
+        help=f"Rows in the benchmark corpora: {', '.join(create_test_files.CORPUS_SIZES)} or a number (default: 10k)",
+    )
+
+
+@pytest.fixture(scope="session")
+def corpus_size(request):
+    return request.config.getoption("--corpus-size").lower()
+
+
+@pytest.fixture(scope="session")
+def corpus(corpus_size):
+    """Return a function giving the path of a corpus file, generating it if needed."""
+
+    def get(file_format, gse=False):
+        path = os.path.join(CORPUS_DIR, create_test_files.corpus_filename(corpus_size, file_format, gse))
+        if not os.path.exists(path):
+            os.makedirs(CORPUS_DIR, exist_ok=True)
+            # Generated aside and moved in, so an interrupted run leaves no partial corpus
+            with tempfile.TemporaryDirectory(dir=CORPUS_DIR) as tmp:
+                shutil.move(create_test_files.create_corpus(corpus_size, file_format, tmp, gse), path)
+        return path
+
+    return get
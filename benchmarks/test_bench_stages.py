@@ -0,0 +1,110 @@
+"""
+Benchmark every stage of index generation separately, with pytest-benchmark.
+
+Run with `make bench` (compares against the stored baseline and fails on a
+regression) or `make bench-baseline` (stores a new baseline); see the
+Makefile for the corpus size and threshold. Diagnostics are collected
+instead of printed, so the timings do not include terminal output.
+"""
+
+import io
+import os
+
+import pytest
+
+import xenocrates
+
+READERS = {
+    "tsv": xenocrates.read_csv_data,
+    "csv": xenocrates.read_csv_data,
+    "xlsx": xenocrates.read_excel_data,
+    "json": xenocrates.read_json_data,
+}
+
+
+def quiet(func, *args, **kwargs):
+    """Call func with diagnostics collected instead of printed."""
+    with xenocrates.collect_diagnostics():
+        return func(*args, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def entries(corpus):
+    """The TSV corpus, in file order."""
+    return quiet(xenocrates.read_csv_data, corpus("tsv"))[0]
+
+
+@pytest.fixture(scope="module")
+def sorted_entries(entries):
+    return list(xenocrates.sort_entries(entries))
+
+
+@pytest.mark.parametrize("file_format", ["tsv", "csv"])
+def test_detect_delimiter(benchmark, corpus, file_format):
+    path = corpus(file_format)
+    assert benchmark(xenocrates.detect_delimiter, path) == ("\t" if file_format == "tsv" else ",")
+
+
+@pytest.mark.parametrize("file_format", list(READERS))
+def test_read_data(benchmark, corpus, file_format):
+    path = corpus(file_format)
+    benchmark.extra_info["bytes"] = os.path.getsize(path)
+    entries, has_course = benchmark(quiet, READERS[file_format], path)
+    assert entries and not has_course
+
+
+def test_read_data_gse(benchmark, corpus):
+    entries, has_course = benchmark(quiet, xenocrates.read_csv_data, corpus("tsv", gse=True))
+    assert entries and has_course
+
+
+def test_sort(benchmark, entries, sorted_entries):
+    assert benchmark(lambda: list(xenocrates.sort_entries(entries))) == sorted_entries
+
+
+def test_print_entry_to_file(benchmark, sorted_entries):
+    """The per-entry renderer, as used by the original writer."""
+
+    def render():
+        output = io.StringIO()
+        for entry in sorted_entries:
+            xenocrates.print_entry_to_file(*entry, output)
+        return output
+
+    benchmark(render)
+
+
+def test_write_index(benchmark, sorted_entries):
+    """The buffered writer used by generate_index()."""
+    benchmark(lambda: xenocrates.write_index(sorted_entries, io.StringIO()))
+
+
+def test_client_search_index(benchmark, sorted_entries):
+    """Postings for --search-index; the embedded size is kept with the timings."""
+
+    def build():
+        search = xenocrates.ClientSearchIndex()
+        for _ in search.observe(sorted_entries):
+            pass
+        return search.render_script()
+
+    benchmark.extra_info["script_bytes"] = len(benchmark(build).encode("utf-8"))
+
+
+def test_cross_references(benchmark, sorted_entries):
+    """Automaton build and one scan of every description for --see-also."""
+
+    def link():
+        references = xenocrates.CrossReferences()
+        for entry in references.observe(sorted_entries):
+            references.find(entry[0], entry[1])
+
+    benchmark(link)
+
+
+@pytest.mark.parametrize("gse", [False, True], ids=["standard", "gse"])
+def test_generate_index(benchmark, corpus, tmp_path, gse):
+    source = corpus("tsv", gse=gse)
+    output = tmp_path / "index.html"
+    benchmark(quiet, xenocrates.generate_index, source, str(output))
+    assert output.stat().st_size > 0
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 """
 Script to create test files for Excel and JSON format testing.
+
+Without arguments, the small fixture files in this directory are (re)created.
+With --corpus, large synthetic corpora for the benchmarks are written instead:
+
+    python create_test_files.py --corpus 10k 100k 1m --formats tsv csv xlsx json --output-dir /tmp/corpus
 """
 
+import argparse
+import csv
 import json
-from openpyxl import Workbook
+import os
+import random
 
 # Test data (subset of test-data-basic.tsv)
 test_entries = [
@@ -95,72 +103,271 @@ gse_entries = [
     },
 ]
 
-# Create Excel file - standard format
-print("Creating test-data-excel.xlsx...")
-wb = Workbook()
-ws = wb.active
-ws.title = "Index"
-
-# Write headers
-ws.append(["Title", "Book", "Page", "Description"])
-
-# Write data
-for entry in test_entries:
-    ws.append([entry["Title"], entry["Book"], entry["Page"], entry["Description"]])
-
-wb.save("test-data-excel.xlsx")
-print(f"  ✓ Created with {len(test_entries)} entries")
-
-# Create Excel file - GSE format with Course column
-print("Creating test-data-excel-gse.xlsx...")
-wb_gse = Workbook()
-ws_gse = wb_gse.active
-ws_gse.title = "Index"
-
-# Write headers
-ws_gse.append(["Title", "Book", "Page", "Description", "Course"])
-
-# Write data
-for entry in gse_entries:
-    ws_gse.append([entry["Title"], entry["Book"], entry["Page"], entry["Description"], entry["Course"]])
-
-wb_gse.save("test-data-excel-gse.xlsx")
-print(f"  ✓ Created with {len(gse_entries)} entries (GSE mode)")
-
-# Create Excel file - lowercase columns
-print("Creating test-excel-lowercase-columns.xlsx...")
-wb_lower = Workbook()
-ws_lower = wb_lower.active
-ws_lower.title = "Index"
-
-# Write headers in lowercase
-ws_lower.append(["title", "book", "page", "description"])
-
-# Write first 3 entries
-for entry in test_entries[:3]:
-    ws_lower.append([entry["Title"], entry["Book"], entry["Page"], entry["Description"]])
-
-wb_lower.save("test-excel-lowercase-columns.xlsx")
-print(f"  ✓ Created with lowercase column names")
-
-# Create JSON file - wrapped format
-print("Creating test-data.json...")
-json_data = {"entries": test_entries}
-with open("test-data.json", "w", encoding="utf-8") as f:
-    json.dump(json_data, f, indent=2, ensure_ascii=False)
-print(f"  ✓ Created with {len(test_entries)} entries (wrapped format)")
-
-# Create JSON file - direct array format
-print("Creating test-data-json-direct.json...")
-with open("test-data-json-direct.json", "w", encoding="utf-8") as f:
-    json.dump(test_entries, f, indent=2, ensure_ascii=False)
-print(f"  ✓ Created (direct array format)")
-
-# Create JSON file - GSE format
-print("Creating test-data-json-gse.json...")
-json_gse = {"entries": gse_entries}
-with open("test-data-json-gse.json", "w", encoding="utf-8") as f:
-    json.dump(json_gse, f, indent=2, ensure_ascii=False)
-print(f"  ✓ Created with {len(gse_entries)} entries (GSE mode)")
-
-print("\n✅ All test files created successfully!")
+
+def create_fixture_files():
+    """Create the small Excel, JSON and JSON Lines fixtures in the current directory."""
+    from openpyxl import Workbook
+
+    # Create Excel file - standard format
+    print("Creating test-data-excel.xlsx...")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Index"
+
+    # Write headers
+    ws.append(["Title", "Book", "Page", "Description"])
+
+    # Write data
+    for entry in test_entries:
+        ws.append([entry["Title"], entry["Book"], entry["Page"], entry["Description"]])
+
+    wb.save("test-data-excel.xlsx")
+    print(f"  ✓ Created with {len(test_entries)} entries")
+
+    # Create Excel file - GSE format with Course column
+    print("Creating test-data-excel-gse.xlsx...")
+    wb_gse = Workbook()
+    ws_gse = wb_gse.active
+    ws_gse.title = "Index"
+
+    # Write headers
+    ws_gse.append(["Title", "Book", "Page", "Description", "Course"])
+
+    # Write data
+    for entry in gse_entries:
+        ws_gse.append([entry["Title"], entry["Book"], entry["Page"], entry["Description"], entry["Course"]])
+
+    wb_gse.save("test-data-excel-gse.xlsx")
+    print(f"  ✓ Created with {len(gse_entries)} entries (GSE mode)")
+
+    # Create Excel file - lowercase columns
+    print("Creating test-excel-lowercase-columns.xlsx...")
+    wb_lower = Workbook()
+    ws_lower = wb_lower.active
+    ws_lower.title = "Index"
+
+    # Write headers in lowercase
+    ws_lower.append(["title", "book", "page", "description"])
+
+    # Write first 3 entries
+    for entry in test_entries[:3]:
+        ws_lower.append([entry["Title"], entry["Book"], entry["Page"], entry["Description"]])
+
+    wb_lower.save("test-excel-lowercase-columns.xlsx")
+    print(f"  ✓ Created with lowercase column names")
+
+    # Create JSON file - wrapped format
+    print("Creating test-data.json...")
+    json_data = {"entries": test_entries}
+    with open("test-data.json", "w", encoding="utf-8") as f:
+        json.dump(json_data, f, indent=2, ensure_ascii=False)
+    print(f"  ✓ Created with {len(test_entries)} entries (wrapped format)")
+
+    # Create JSON file - direct array format
+    print("Creating test-data-json-direct.json...")
+    with open("test-data-json-direct.json", "w", encoding="utf-8") as f:
+        json.dump(test_entries, f, indent=2, ensure_ascii=False)
+    print(f"  ✓ Created (direct array format)")
+
+    # Create JSON file - GSE format
+    print("Creating test-data-json-gse.json...")
+    json_gse = {"entries": gse_entries}
+    with open("test-data-json-gse.json", "w", encoding="utf-8") as f:
+        json.dump(json_gse, f, indent=2, ensure_ascii=False)
+    print(f"  ✓ Created with {len(gse_entries)} entries (GSE mode)")
+
+    # Create JSON Lines file - one object per line
+    print("Creating test-data.jsonl...")
+    with open("test-data.jsonl", "w", encoding="utf-8") as f:
+        for entry in test_entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    print(f"  ✓ Created with {len(test_entries)} entries (JSON Lines format)")
+
+    print("\n✅ All test files created successfully!")
+
+
+# Synthetic corpora for the benchmarks (benchmarks/test_bench_stages.py)
+CORPUS_SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+CORPUS_FORMATS = ("tsv", "csv", "xlsx", "json")
+CORPUS_SEED = 401
+
+# Share of rows repeating an earlier entry (same title, book, page and course),
+# and of rows with a long, multi-sentence description
+CORPUS_DUPLICATE_RATE = 0.02
+CORPUS_LONG_RATE = 0.05
+
+CORPUS_TERMS = [
+    "AES", "API", "ARP", "Active Directory", "Kerberos", "NTLM", "LDAP", "DNS", "DHCP", "TLS", "SSH", "SMB",
+    "HTTP", "Cookie", "Session", "Token", "Hash", "Salt", "Cipher", "Firewall", "Proxy", "VPN", "IPsec",
+    "Malware", "Ransomware", "Rootkit", "Botnet", "Phishing", "Exploit", "Payload", "Shellcode", "Buffer",
+    "Overflow", "Injection", "SQL", "XSS", "CSRF", "SSRF", "Deserialization", "Privilege", "Escalation",
+    "Lateral", "Movement", "Persistence", "Registry", "Prefetch", "Timeline", "Memory", "Volatility",
+    "Packet", "Capture", "Wireshark", "Nmap", "Metasploit", "Burp", "Snort", "Zeek", "Sysmon", "Event Log",
+    "PowerShell", "Bash", "Python", "Regex", "YARA", "Sigma", "SIEM", "IDS", "IPS", "WAF", "Sandbox",
+    "Container", "Docker", "Kubernetes", "Cloud", "IAM", "S3 Bucket", "Azure AD", "OAuth", "SAML", "JWT",
+    "Certificate", "PKI", "Entropy", "Steganography", "Forensics", "Incident", "Response", "Triage",
+    "Vulnerability", "Scanner", "Patch", "Baseline", "Hardening", "Audit", "Compliance", "Risk", "Threat",
+]
+CORPUS_WORDS = [
+    "attack", "defense", "protocol", "server", "client", "network", "traffic", "analysis", "detection",
+    "configuration", "default", "port", "service", "user", "account", "password", "credential", "key",
+    "encryption", "decryption", "signature", "integrity", "authentication", "authorization", "file", "disk",
+    "process", "thread", "kernel", "module", "driver", "browser", "request", "response", "header", "field",
+    "record", "query", "table", "log", "alert", "rule", "policy", "control", "artifact", "evidence",
+    "timestamp", "command", "option", "flag", "tool", "framework", "technique", "tactic", "mitigation",
+]
+CORPUS_BOOKS = ["SEC401", "SEC503", "SEC504", "SEC542", "SEC560", "FOR500", "FOR508", "FOR572"]
+CORPUS_COURSES = ["", "GCIH", "GCIA", "GPEN", "GCFA"]
+
+
+def _corpus_sentence(rng):
+    """One sentence of security-flavoured prose, with the odd comma, quote or markup character."""
+    words = rng.choices(CORPUS_WORDS, k=rng.randint(4, 14))
+    words.insert(rng.randrange(len(words)), rng.choice(CORPUS_TERMS))
+    sentence = " ".join(words).capitalize()
+    extra = rng.random()
+    if extra < 0.1:
+        sentence += ', e.g. "' + rng.choice(CORPUS_TERMS) + '"'
+    elif extra < 0.15:
+        sentence += " (<script> & co.)"
+    return sentence + "."
+
+
+def corpus_entries(rows, gse=False, seed=CORPUS_SEED):
+    """
+    Generate a realistic synthetic index of the given size, deterministically.
+
+    Titles are one to three security terms, some numbered (e.g. 'Port 445');
+    descriptions are one or two sentences, or 5-40 for long ones. A share of
+    rows repeats an earlier entry (duplicates), and with gse every row has a
+    Course column (empty for some rows).
+
+    Args:
+        rows: Number of rows
+        gse: Add a Course column
+        seed: Random seed
+
+    Yields:
+        Dicts with Title, Description, Page, Book (and Course) keys
+    """
+    rng = random.Random(seed)
+    recent = []
+    for _ in range(rows):
+        if recent and rng.random() < CORPUS_DUPLICATE_RATE:
+            yield rng.choice(recent)
+            continue
+
+        title = " ".join(rng.sample(CORPUS_TERMS, rng.randint(1, 3)))
+        if rng.random() < 0.1:
+            title += f" {rng.randint(1, 65535)}"
+        if rng.random() < 0.5:
+            title = title.lower()
+        sentences = rng.randint(5, 40) if rng.random() < CORPUS_LONG_RATE else rng.randint(1, 2)
+        entry = {
+            "Title": title,
+            "Description": " ".join(_corpus_sentence(rng) for _ in range(sentences)),
+            "Page": str(rng.randint(1, 400)),
+            "Book": rng.choice(CORPUS_BOOKS),
+        }
+        if gse:
+            entry["Course"] = rng.choice(CORPUS_COURSES)
+
+        # Duplicates repeat a recent entry, like a note pasted twice
+        if len(recent) < 1000:
+            recent.append(entry)
+        else:
+            recent[rng.randrange(1000)] = entry
+        yield entry
+
+
+def write_corpus(path, file_format, entries, gse=False):
+    """
+    Write corpus entries to a file in one of CORPUS_FORMATS.
+
+    Args:
+        path: Output file
+        file_format: 'tsv', 'csv', 'xlsx' or 'json' (wrapped {"entries": [...]})
+        entries: Iterable of entry dicts from corpus_entries()
+        gse: Whether the entries have a Course column
+    """
+    columns = ["Title", "Description", "Page", "Book"] + (["Course"] if gse else [])
+
+    if file_format in ("tsv", "csv"):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, columns, delimiter="\t" if file_format == "tsv" else ",")
+            writer.writeheader()
+            writer.writerows(entries)
+    elif file_format == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"entries": [')
+            for i, entry in enumerate(entries):
+                f.write(("," if i else "") + "\n  " + json.dumps(entry, ensure_ascii=False))
+            f.write("\n]}\n")
+    elif file_format == "xlsx":
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Index")
+        sheet.append(columns)
+        for entry in entries:
+            sheet.append([entry[column] for column in columns])
+        workbook.save(path)
+    else:
+        raise ValueError(f"Unknown corpus format '{file_format}' (expected one of: {', '.join(CORPUS_FORMATS)})")
+
+
+def corpus_filename(size, file_format, gse=False):
+    """Return the file name create_corpus() uses, e.g. 'corpus-100k.tsv' or 'corpus-10k-gse.json'."""
+    return f"corpus-{str(size).lower()}{'-gse' if gse else ''}.{file_format}"
+
+
+def create_corpus(size, file_format, output_dir=".", gse=False, seed=CORPUS_SEED):
+    """
+    Write one synthetic corpus file, named e.g. 'corpus-100k.tsv' or 'corpus-10k-gse.json'.
+
+    Args:
+        size: Key of CORPUS_SIZES ('10k', '100k', '1m') or a row count
+        file_format: One of CORPUS_FORMATS
+        output_dir: Directory to write to
+        gse: Add a Course column
+        seed: Random seed
+
+    Returns:
+        Path of the written file
+    """
+    rows = CORPUS_SIZES.get(str(size).lower()) or int(size)
+    path = os.path.join(output_dir, corpus_filename(size, file_format, gse))
+    write_corpus(path, file_format, corpus_entries(rows, gse, seed), gse)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create Xenocrates test fixtures or synthetic benchmark corpora")
+    parser.add_argument(
+        "--corpus",
+        nargs="+",
+        metavar="SIZE",
+        help=f"Write synthetic corpora of these sizes ({', '.join(CORPUS_SIZES)} or a row count) "
+        "instead of the fixtures",
+    )
+    parser.add_argument(
+        "--formats", nargs="+", choices=CORPUS_FORMATS, default=list(CORPUS_FORMATS), help="Corpus formats"
+    )
+    parser.add_argument("--gse", action="store_true", help="Add a Course column to the corpora")
+    parser.add_argument("--seed", type=int, default=CORPUS_SEED, help="Random seed (default: %(default)s)")
+    parser.add_argument("--output-dir", default=".", help="Directory for the corpora (default: current)")
+    args = parser.parse_args()
+
+    if not args.corpus:
+        create_fixture_files()
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for size in args.corpus:
+        for file_format in args.formats:
+            path = create_corpus(size, file_format, args.output_dir, args.gse, args.seed)
+            print(f"  ✓ Created {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,13 @@ Automated tests for Xenocrates.
 Run with: pytest tests/test_xenocrates.py -v
 """
 
+import gzip
+import io
+import json
 import os
+import pstats
 import sys
+import time
 
 import pytest
 
@@ -35,6 +40,11 @@ class TestFileFormatDetection:
         """Test .json extension detection."""
         assert xenocrates.detect_file_format("test.json") == "json"
 
+    def test_detect_jsonl_format(self):
+        """Test .jsonl and .ndjson extension detection."""
+        assert xenocrates.detect_file_format("test.jsonl") == "jsonl"
+        assert xenocrates.detect_file_format("test.ndjson") == "jsonl"
+
     def test_detect_txt_as_csv(self):
         """Test .txt extension defaults to csv."""
         assert xenocrates.detect_file_format("test.txt") == "csv"
@@ -49,6 +59,23 @@ class TestFileFormatDetection:
         assert xenocrates.detect_file_format("test.CSV") == "csv"
         assert xenocrates.detect_file_format("test.XLSX") == "excel"
 
+    def test_detect_compressed_formats(self):
+        """Test a compression extension is looked through to the data format."""
+        assert xenocrates.detect_file_format("notes.tsv.gz") == "tsv"
+        assert xenocrates.detect_file_format("notes.json.xz") == "json"
+        assert xenocrates.detect_file_format("notes.CSV.BZ2") == "csv"
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            xenocrates.detect_file_format("notes.gz")
+
+    def test_sniff_format_from_content(self):
+        """Test formats are recognized from the leading bytes of a stream."""
+        assert xenocrates.sniff_format(b"Title\tDescription\tPage\tBook\n") == "csv"
+        assert xenocrates.sniff_format(b"PK\x03\x04\x14\x00") == "excel"
+        assert xenocrates.sniff_format(b'\n  [{"Title": "AES"}]') == "json"
+        assert xenocrates.sniff_format(b'{\n  "entries": []\n}') == "json"
+        assert xenocrates.sniff_format(b'{"entries": [{"Title": "AES"}]}') == "json"
+        assert xenocrates.sniff_format(b'{"Title": "AES", "Book": "B1"}\n{"Title": "RSA"') == "jsonl"
+
 
 class TestColumnValidation:
     """Test column name validation and normalization."""
@@ -99,6 +126,14 @@ class TestColumnValidation:
         is_valid, error_msg, column_map = xenocrates.validate_columns(fieldnames)
         assert is_valid is True
 
+    def test_custom_required_columns(self):
+        """Test a custom required set (e.g. Book filled from the sheet name)."""
+        fieldnames = ["Title", "Page", "Description"]
+        required = xenocrates.REQUIRED_COLUMNS - {"Book"}
+        is_valid, error_msg, column_map = xenocrates.validate_columns(fieldnames, required)
+        assert is_valid is True
+        assert "Book" not in column_map
+
 
 class TestCSVReading:
     """Test CSV/TSV file reading."""
@@ -165,6 +200,57 @@ class TestExcelReading:
         assert isinstance(first_entry[3], str)  # book
         assert isinstance(first_entry[4], str)  # course (empty string if no course)
 
+    def test_builtin_reader_matches_openpyxl(self, monkeypatch):
+        """Test the built-in XLSX reader produces the same entries as openpyxl."""
+        files = [
+            "tests/test-data-excel.xlsx",
+            "tests/test-data-excel-gse.xlsx",
+            "tests/test-excel-lowercase-columns.xlsx",
+        ]
+        fast = [xenocrates.read_excel_data(f) for f in files]
+
+        def bail_out(self, wanted=None):
+            raise xenocrates._XlsxFallback()
+            yield
+
+        monkeypatch.setattr(xenocrates._XlsxSheetReader, "iter_rows", bail_out)
+        assert fast == [xenocrates.read_excel_data(f) for f in files]
+
+    def test_date_cells_fall_back_to_openpyxl(self, tmp_path):
+        """Test a date-formatted cell hands the rest of the sheet over to openpyxl."""
+        openpyxl = pytest.importorskip("openpyxl")
+        import datetime
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(["Title", "Book", "Page", "Description"])
+        ws.append(["Alpha", "SEC401", 1, "First"])
+        ws.append(["Beta", "SEC401", 2, datetime.datetime(2024, 5, 1)])
+        ws.append(["Gamma", "SEC401", 3.5, "Third"])
+        path = tmp_path / "dates.xlsx"
+        wb.save(path)
+
+        index, _ = xenocrates.read_excel_data(str(path))
+        assert index == [
+            xenocrates.Entry("ALPHA", "First", "1", "SEC401", ""),
+            xenocrates.Entry("BETA", "2024-05-01 00:00:00", "2", "SEC401", ""),
+            xenocrates.Entry("GAMMA", "Third", "3.5", "SEC401", ""),
+        ]
+
+    def test_blank_header_cells_keep_column_positions(self, tmp_path):
+        """Test columns after an empty header cell are read from the right position."""
+        openpyxl = pytest.importorskip("openpyxl")
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(["Title", None, "Book", "Page", "Description"])
+        ws.append(["Alpha", "ignored", "SEC401", 7, "First"])
+        path = tmp_path / "gap.xlsx"
+        wb.save(path)
+
+        index, _ = xenocrates.read_excel_data(str(path))
+        assert index == [xenocrates.Entry("ALPHA", "First", "7", "SEC401", "")]
+
 
 class TestJSONReading:
     """Test JSON file reading."""
@@ -197,6 +283,57 @@ class TestJSONReading:
             assert isinstance(field, str)
 
 
+class TestJSONLinesReading:
+    """Test streaming JSON Lines file reading."""
+
+    def test_read_jsonl(self):
+        """Test JSON Lines entries match the equivalent JSON array."""
+        index, has_course = xenocrates.read_jsonl_data("tests/test-data.jsonl")
+        json_index, _ = xenocrates.read_json_data("tests/test-data.json")
+        assert index == json_index
+        assert has_course is False
+
+    def test_reads_jsonl_via_dispatcher(self):
+        """Test dispatcher correctly routes JSON Lines files."""
+        index, _ = xenocrates.read_input_file("tests/test-data.jsonl")
+        assert len(index) == 10
+
+    def test_bad_lines_reported_and_skipped(self, tmp_path, capsys):
+        """Test invalid lines are reported by line number, with case-insensitive columns."""
+        source = tmp_path / "notes.ndjson"
+        source.write_text(
+            '{"title": "AES", "description": "Cipher", "page": 1, "book": "SEC401", "course": "GSE"}\n'
+            "\n"
+            '{"title": "broken", \n'
+            "[1, 2]\n"
+            '{"title": "RSA", "description": "Public key", "page": 2, "book": "SEC401", "course": "GSE"}\n',
+            encoding="utf-8",
+        )
+
+        index, has_course = xenocrates.read_jsonl_data(str(source))
+
+        assert [entry[0] for entry in index] == ["AES", "RSA"]
+        assert index[0] == xenocrates.Entry("AES", "Cipher", "1", "SEC401", "GSE")
+        assert has_course is True
+        err = capsys.readouterr().err
+        assert "Invalid JSON on line 3" in err
+        assert "Line 4 is not a JSON object" in err
+
+    def test_missing_columns_error(self, tmp_path):
+        """Test column validation applies to the first object."""
+        source = tmp_path / "notes.jsonl"
+        source.write_text('{"Title": "AES", "Book": "SEC401"}\n', encoding="utf-8")
+        with pytest.raises(ValueError, match="Missing required columns"):
+            xenocrates.read_jsonl_data(str(source))
+
+    def test_empty_file_error(self, tmp_path):
+        """Test a file without entries raises ValueError."""
+        source = tmp_path / "notes.jsonl"
+        source.write_text("\n\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="contains no entries"):
+            xenocrates.read_jsonl_data(str(source))
+
+
 class TestUnifiedReader:
     """Test unified read_input_file() dispatcher."""
 
@@ -221,6 +358,384 @@ class TestUnifiedReader:
         assert len(index) == 10
 
 
+class TestStreamingReaders:
+    """Test generator-based readers and the ReadSummary they fill in."""
+
+    def test_iter_csv_is_lazy(self):
+        """Test streaming reader yields entries one at a time."""
+        summary = xenocrates.ReadSummary()
+        entries = xenocrates.iter_csv_data("tests/test-data-basic.tsv", summary)
+
+        first = next(entries)
+        assert len(first) == 5
+        assert summary.entry_count == 1
+
+        assert 1 + sum(1 for _ in entries) == 79
+        assert summary.entry_count == 79
+
+    def test_streaming_matches_list_readers(self):
+        """Test streaming readers produce the same entries as read_*_data."""
+        for filename in [
+            "tests/test-gse-with-course.tsv",
+            "tests/test-data-excel.xlsx",
+            "tests/test-data-json-gse.json",
+        ]:
+            summary = xenocrates.ReadSummary()
+            streamed = list(xenocrates.iter_input_file(filename, summary))
+            index, has_course = xenocrates.read_input_file(filename)
+            assert streamed == index
+            assert summary.has_course_column == has_course
+
+    def test_summary_tracks_duplicates_and_empty_titles(self, capsys):
+        """Test duplicates and empty titles are reported through the summary."""
+        summary = xenocrates.ReadSummary()
+        list(xenocrates.iter_csv_data("tests/test-data-edge-cases.tsv", summary))
+
+        assert summary.empty_title_count >= 1
+        assert summary.duplicates()
+
+        summary.report()
+        captured = capsys.readouterr()
+        assert "duplicate entries" in captured.err
+        assert "on rows:" in captured.err
+
+    def test_json_summary_reports_entries(self, capsys):
+        """Test JSON duplicate reports refer to entry numbers."""
+        summary = xenocrates.ReadSummary()
+        list(xenocrates.iter_json_data("tests/test-data.json", summary))
+        summary.record("AES ENCRYPTION", "", "142", "SEC401", "", 99)
+
+        summary.report()
+        assert "in entries:" in capsys.readouterr().err
+
+    def test_entries_share_repeated_values(self):
+        """Test entries are compact Entry tuples sharing one string per Page/Book/Course value."""
+        summary = xenocrates.ReadSummary()
+        first = summary.record("AES", "Cipher", "".join(["1", "42"]), "".join(["SEC", "401"]), "", 2)
+        second = summary.record("RSA", "Public key", "".join(["14", "2"]), "".join(["SEC4", "01"]), "", 3)
+
+        assert isinstance(first, xenocrates.Entry)
+        title_upper, description, page, book, course = second
+        assert (title_upper, page, book) == ("RSA", "142", "SEC401")
+        assert second.page is first.page
+        assert second.book is first.book
+
+    def test_locations_become_lists_on_repeat(self):
+        """Test single occurrences are stored bare and repeats collect every location."""
+        summary = xenocrates.ReadSummary()
+        summary.record("AES", "Cipher", "142", "SEC401", "", 2)
+        summary.record("RSA", "Public key", "10", "SEC401", "", 3)
+        summary.record("AES", "Cipher again", "142", "SEC401", "", 7)
+
+        assert summary.duplicates() == {("AES", "SEC401", "142"): [2, 7]}
+        assert list(summary.iter_locations()) == [(("AES", "SEC401", "142"), [2, 7]), (("RSA", "SEC401", "10"), [3])]
+
+
+class TestMultiFileInput:
+    """Test multi-file and directory ingestion."""
+
+    def test_expand_directory(self, tmp_path):
+        """Test directories expand to supported files, skipping hidden and lock files."""
+        (tmp_path / "book1.tsv").write_text("Title\tDescription\tPage\tBook\n", encoding="utf-8")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "book2.json").write_text("[]", encoding="utf-8")
+        (tmp_path / "notes.pdf").write_text("", encoding="utf-8")
+        (tmp_path / ".hidden.tsv").write_text("", encoding="utf-8")
+        (tmp_path / "~$book3.xlsx").write_text("", encoding="utf-8")
+
+        filenames = xenocrates.expand_input_paths([str(tmp_path), "extra.csv"])
+
+        assert filenames == [
+            str(tmp_path / "book1.tsv"),
+            str(tmp_path / "sub" / "book2.json"),
+            "extra.csv",
+        ]
+
+    def test_empty_directory_raises(self, tmp_path):
+        """Test a directory without input files raises ValueError."""
+        with pytest.raises(ValueError, match="No supported input files"):
+            xenocrates.expand_input_paths([str(tmp_path)])
+
+    def test_split_cli_paths(self, tmp_path):
+        """Test the legacy 'input output' form and multiple inputs are told apart."""
+        assert xenocrates.split_cli_paths(["notes.tsv"]) == (["notes.tsv"], None)
+        assert xenocrates.split_cli_paths(["notes.tsv", "index.html"]) == (["notes.tsv"], "index.html")
+        # An existing input file in second place is still the output (e.g. a previous 'in.tsv out.tsv' run)
+        both = ["tests/test-data.json", "tests/test-data-basic.tsv"]
+        assert xenocrates.split_cli_paths(both) == (both[:1], both[1])
+        three = both + ["missing.tsv"]
+        assert xenocrates.split_cli_paths(three) == (three, None)
+        assert xenocrates.split_cli_paths(["notes.tsv", str(tmp_path)]) == (["notes.tsv", str(tmp_path)], None)
+
+    def test_multiple_files_merge(self, tmp_path):
+        """Test several files merge into one index, identically with a worker pool."""
+        sources = ["tests/test-data.json", "tests/test-data-excel.xlsx", "tests/test-gse-with-course.tsv"]
+        serial = tmp_path / "serial.html"
+        parallel = tmp_path / "parallel.html"
+
+        xenocrates.generate_index(sources, str(serial))
+        xenocrates.generate_index(sources, str(parallel), jobs=3)
+
+        content = serial.read_text(encoding="utf-8")
+        assert content.count("class=topic") == 24
+        assert "{c-" in content
+        assert parallel.read_bytes() == serial.read_bytes()
+
+    def test_cross_file_duplicates(self, capsys):
+        """Test duplicates spanning files are found and reported."""
+        summaries = []
+        entries = list(xenocrates.iter_input_files(["tests/test-data.json", "tests/test-data-excel.xlsx"], summaries))
+        assert len(entries) == 20
+
+        duplicates = xenocrates.find_cross_file_duplicates(summaries)
+        assert ("AES ENCRYPTION", "SEC401", "142") in duplicates
+
+        xenocrates.report_input_summaries(summaries)
+        err = capsys.readouterr().err
+        assert "duplicate entries across files" in err
+        assert "tests/test-data.json (entries 1); tests/test-data-excel.xlsx (rows 2)" in err
+
+
+class TestCompressedFiles:
+    """Test transparent .gz/.bz2/.xz input and output."""
+
+    @pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+    def test_compressed_inputs_match_plain(self, tmp_path, suffix):
+        """Test compressed CSV, JSON and JSON Lines files read like the originals."""
+        for name in ("test-data-csv.csv", "test-data.json", "test-data.jsonl"):
+            source = os.path.join("tests", name)
+            compressed = tmp_path / (name + suffix)
+            with open(source, "rb") as f, xenocrates.open_binary(str(compressed), "wb") as out:
+                out.write(f.read())
+
+            assert xenocrates.read_input_file(str(compressed)) == xenocrates.read_input_file(source)
+
+    def test_compressed_output(self, tmp_path):
+        """Test an .html.gz output holds the same index, and is reproducible."""
+        plain = tmp_path / "index.html"
+        first = tmp_path / "index.html.gz"
+        second = tmp_path / "copy" / "index.html.gz"
+        second.parent.mkdir()
+
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(plain))
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(first))
+        xenocrates.write_file_atomically(str(second), lambda output: output.write(plain.read_text(encoding="utf-8")))
+
+        assert gzip.decompress(first.read_bytes()) == plain.read_bytes()
+        assert second.read_bytes() == first.read_bytes()
+
+    def test_compressed_workbook_rejected(self, tmp_path):
+        """Test .xlsx.gz is refused with an explanation instead of a zip error."""
+        workbook = tmp_path / "notes.xlsx.gz"
+        workbook.write_bytes(gzip.compress(open("tests/test-data-excel.xlsx", "rb").read()))
+
+        with pytest.raises(ValueError, match="zip archive already"):
+            xenocrates.read_input_file(str(workbook))
+
+
+class TestStdinInput:
+    """Test reading input from stdin ('-') with content sniffing."""
+
+    def _stdin(self, monkeypatch, path):
+        with open(path, "rb") as f:
+            monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(f.read())))
+
+    @pytest.mark.parametrize(
+        "path",
+        ["tests/test-data-basic.tsv", "tests/test-data.json", "tests/test-data.jsonl", "tests/test-data-excel.xlsx"],
+    )
+    def test_stdin_matches_file(self, monkeypatch, path):
+        """Test every format read from stdin gives the same entries as the file."""
+        self._stdin(monkeypatch, path)
+        assert list(xenocrates.iter_input_file("-")) == list(xenocrates.iter_input_file(path))
+
+    def test_sniffed_stream_replays_head(self):
+        """Test the bytes read while sniffing are returned by the stream, even past the head."""
+        data = b"\n" + b"Title,Description,Page,Book\n" + b"AES,x,1,B\n" * 20000
+        file_format, stream = xenocrates.sniff_input(io.BytesIO(data))
+        assert file_format == "csv"
+        assert stream.read() == data
+
+    def test_stdin_with_files_and_jobs(self, monkeypatch, tmp_path):
+        """Test stdin merges with other inputs, in-process even with a worker pool, and is not cached."""
+        output = tmp_path / "stdin.html"
+        expected = tmp_path / "files.html"
+        xenocrates.generate_index(["tests/test-data.json", "tests/test-gse-with-course.tsv"], str(expected))
+
+        self._stdin(monkeypatch, "tests/test-gse-with-course.tsv")
+        cache = str(tmp_path / "cache.sqlite3")
+        xenocrates.generate_index(["tests/test-data.json", "-"], str(output), jobs=2, cache_path=cache)
+
+        assert output.read_bytes() == expected.read_bytes()
+
+    def test_split_cli_paths_keeps_stdin(self):
+        """Test a trailing '-' is an input, not the output file."""
+        assert xenocrates.split_cli_paths(["notes.tsv", "-"]) == (["notes.tsv", "-"], None)
+        assert xenocrates.split_cli_paths(["-", "index.html"]) == (["-"], "index.html")
+
+
+class TestMultiSheetExcel:
+    """Test reading several worksheets of one workbook."""
+
+    def _workbook(self, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Book 1"
+        ws.append(["Title", "Page", "Description"])
+        ws.append(["Alpha", 1, "First"])
+        ws = wb.create_sheet("Book 2")
+        ws.append(["Title", "Page", "Description"])
+        ws.append(["Beta", 2, "Second"])
+        ws = wb.create_sheet("Labs")
+        ws.append(["Title", "Book", "Page", "Description"])
+        ws.append(["Gamma", "SEC401", 3, "Third"])
+        path = tmp_path / "books.xlsx"
+        wb.save(path)
+        return str(path)
+
+    def test_select_worksheets(self, tmp_path):
+        """Test 'all' lists sheets in workbook order and unknown names raise ValueError."""
+        path = self._workbook(tmp_path)
+        assert xenocrates.list_worksheets(path) == (["Book 1", "Book 2", "Labs"], "Book 1")
+        assert xenocrates.select_worksheets(path, "all") == ["Book 1", "Book 2", "Labs"]
+        assert xenocrates.select_worksheets(path, ["Labs", "Book 1"]) == ["Labs", "Book 1"]
+        with pytest.raises(ValueError, match="Worksheet 'Book 9' not found"):
+            xenocrates.select_worksheets(path, ["Book 9"])
+
+    def test_book_from_sheet(self, tmp_path):
+        """Test sheets without a Book column take the sheet name; others keep their column."""
+        path = self._workbook(tmp_path)
+        summaries = []
+        entries = list(xenocrates.iter_input_files([path], summaries, sheets="all", book_from_sheet=True))
+
+        assert [(entry[0], entry[3]) for entry in entries] == [
+            ("ALPHA", "Book 1"),
+            ("BETA", "Book 2"),
+            ("GAMMA", "SEC401"),
+        ]
+        assert [label for label, _ in summaries] == [f"{path} [Book 1]", f"{path} [Book 2]", f"{path} [Labs]"]
+
+    def test_missing_book_names_the_sheet(self, tmp_path):
+        """Test a sheet without Book fails validation unless book_from_sheet is set."""
+        path = self._workbook(tmp_path)
+        with pytest.raises(ValueError, match="Worksheet 'Book 2': Missing required columns: Book"):
+            list(xenocrates.iter_input_files([path], [], sheets=["Book 2"]))
+
+    def test_parallel_and_cached_sheets_match(self, tmp_path, capsys):
+        """Test worksheets parsed in workers or loaded from the cache give identical output."""
+        path = self._workbook(tmp_path)
+        cache_path = str(tmp_path / "cache.sqlite3")
+        outputs = [tmp_path / f"out{i}.html" for i in range(3)]
+
+        xenocrates.generate_index(path, str(outputs[0]), sheets="all", book_from_sheet=True)
+        xenocrates.generate_index(
+            path, str(outputs[1]), jobs=3, cache_path=cache_path, sheets="all", book_from_sheet=True
+        )
+        xenocrates.generate_index(path, str(outputs[2]), cache_path=cache_path, sheets="all", book_from_sheet=True)
+
+        assert outputs[1].read_bytes() == outputs[0].read_bytes()
+        assert outputs[2].read_bytes() == outputs[0].read_bytes()
+        assert "{b-Book 2 / p-2}" in outputs[0].read_text(encoding="utf-8")
+        assert "Parse cache: 3 hits, 0 misses" in capsys.readouterr().err
+
+
+class TestParseCache:
+    """Test the persistent SQLite parse cache."""
+
+    def _read(self, cache, filename):
+        summaries = []
+        entries = list(xenocrates.iter_input_files([filename], summaries, cache=cache))
+        return entries, summaries[0][1]
+
+    def test_hit_after_miss(self, tmp_path):
+        """Test an unchanged file loads from the cache with identical entries and statistics."""
+        cache = xenocrates.ParseCache(str(tmp_path / "cache.sqlite3"))
+        try:
+            first, first_summary = self._read(cache, "tests/test-data-edge-cases.tsv")
+            second, second_summary = self._read(cache, "tests/test-data-edge-cases.tsv")
+        finally:
+            cache.close()
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert second == first
+        assert second_summary.duplicates() == first_summary.duplicates()
+        assert second_summary.empty_title_count == first_summary.empty_title_count
+
+    def test_invalidation(self, tmp_path):
+        """Test touched files hit via the content hash, and edited files miss."""
+        source = tmp_path / "notes.tsv"
+        source.write_text("Title\tDescription\tPage\tBook\nAES\tCipher\t1\tSEC401\n", encoding="utf-8")
+        cache = xenocrates.ParseCache(str(tmp_path / "cache.sqlite3"))
+        try:
+            self._read(cache, str(source))
+
+            stat = source.stat()
+            os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self._read(cache, str(source))
+            assert (cache.hits, cache.misses) == (1, 1)
+
+            source.write_text("Title\tDescription\tPage\tBook\nRSA\tPublic key\t2\tSEC401\n", encoding="utf-8")
+            entries, _ = self._read(cache, str(source))
+            assert (cache.hits, cache.misses) == (1, 2)
+            assert entries[0][0] == "RSA"
+        finally:
+            cache.close()
+
+    def test_streams_while_storing(self, tmp_path, monkeypatch):
+        """Test a miss yields entries before the file is stored and a hit decodes batches across read chunks."""
+        monkeypatch.setattr(xenocrates, "CACHE_ROW_BATCH", 3)
+        monkeypatch.setattr(xenocrates, "CACHE_READ_CHUNK_SIZE", 16)
+        cache = xenocrates.ParseCache(str(tmp_path / "cache.sqlite3"))
+        try:
+            summaries = []
+            stream = xenocrates.iter_input_files(["tests/test-data-edge-cases.tsv"], summaries, cache=cache)
+            first = [next(stream)]
+            assert cache.connection.execute("SELECT COUNT(*) FROM parsed_files").fetchone() == (0,)
+            first += stream
+            assert cache.connection.execute("SELECT COUNT(*) FROM parsed_files").fetchone() == (1,)
+
+            second, second_summary = self._read(cache, "tests/test-data-edge-cases.tsv")
+        finally:
+            cache.close()
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert second == first
+        assert second_summary.duplicates() == summaries[0][1].duplicates()
+
+    def test_version_change_misses(self, tmp_path, monkeypatch):
+        """Test entries written by another release are not reused."""
+        cache = xenocrates.ParseCache(str(tmp_path / "cache.sqlite3"))
+        try:
+            self._read(cache, "tests/test-data.json")
+            monkeypatch.setattr(xenocrates, "CACHE_VERSION", "0:old")
+            self._read(cache, "tests/test-data.json")
+        finally:
+            cache.close()
+
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_unusable_cache_is_disabled(self, tmp_path, capsys):
+        """Test an unwritable cache location falls back to parsing without a cache."""
+        blocker = tmp_path / "file"
+        blocker.write_text("", encoding="utf-8")
+
+        assert xenocrates.open_parse_cache(str(blocker / "cache.sqlite3")) is None
+        assert "Parse cache disabled" in capsys.readouterr().err
+
+    def test_generate_index_reports_cache(self, tmp_path, capsys):
+        """Test cached runs produce identical output and report hits on stderr."""
+        cache_path = str(tmp_path / "cache.sqlite3")
+        first = tmp_path / "first.html"
+        second = tmp_path / "second.html"
+
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(first), cache_path=cache_path)
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(second), cache_path=cache_path)
+
+        assert second.read_bytes() == first.read_bytes()
+        assert "Parse cache: 1 hits, 0 misses" in capsys.readouterr().err
+
+
 class TestDataQuality:
     """Test data quality features (duplicates, empty entries, etc.)."""
 
@@ -245,6 +760,147 @@ class TestDataQuality:
             assert title_upper == title_upper.upper()
 
 
+class TestDeduplication:
+    """Test the drop/merge duplicate policies and hashed duplicate keys."""
+
+    def _write(self, path, rows):
+        lines = ["Title\tDescription\tPage\tBook"] + ["\t".join(row) for row in rows]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return str(path)
+
+    def test_drop_and_merge_sorted_entries(self):
+        """Test later duplicates are dropped, or merged into the first occurrence."""
+        E = xenocrates.Entry
+        entries = [
+            E("AES", "Cipher", "1", "SEC401", ""),
+            E("AES", "Block cipher", "1", "SEC401", ""),
+            E("AES", "Other book", "1", "SEC501", ""),
+            E("AES", "Cipher", "1", "SEC401", ""),
+            E("RSA", "Public key", "2", "SEC401", ""),
+        ]
+
+        dropper = xenocrates.Deduplicator("drop")
+        assert list(dropper.apply(entries)) == [entries[0], entries[2], entries[4]]
+        assert dropper.removed == 2
+
+        merger = xenocrates.Deduplicator("merge")
+        merged = list(merger.apply(entries))
+        assert merged[0].description == "Cipher; Block cipher"
+        assert merged[1:] == [entries[2], entries[4]]
+        assert merger.removed == 2
+
+    def test_dedupe_across_files_in_every_mode(self, tmp_path, capsys):
+        """Test duplicates spanning files are merged identically serially, in parallel and spilled."""
+        first = self._write(
+            tmp_path / "a.tsv", [("AES", "Cipher", "1", "SEC401"), ("RSA", "Public key", "2", "SEC401")]
+        )
+        second = self._write(tmp_path / "b.tsv", [("AES", "Block cipher", "1", "SEC401")])
+        outputs = [tmp_path / f"out{i}.html" for i in range(3)]
+
+        xenocrates.generate_index([first, second], str(outputs[0]), dedupe="merge")
+        xenocrates.generate_index([first, second], str(outputs[1]), dedupe="merge", jobs=2)
+        xenocrates.generate_index([first, second], str(outputs[2]), dedupe="merge", max_memory=1)
+
+        content = outputs[0].read_text(encoding="utf-8")
+        assert content.count("class=topic") == 2
+        assert "Cipher; Block cipher" in content
+        assert outputs[1].read_bytes() == outputs[0].read_bytes()
+        assert outputs[2].read_bytes() == outputs[0].read_bytes()
+        assert "Success: Generated index with 2 entries" in capsys.readouterr().err
+
+    def test_unknown_policy_raises(self, tmp_path):
+        """Test an unknown dedupe policy is rejected."""
+        with pytest.raises(ValueError, match="Unknown dedupe policy"):
+            xenocrates.generate_index("tests/test-data-basic.tsv", str(tmp_path / "out.html"), dedupe="keep")
+
+    def test_hashed_keys_find_the_same_duplicates(self):
+        """Test hashed duplicate keys report the same duplicates, within and across files."""
+        exact = xenocrates.ReadSummary()
+        hashed = xenocrates.ReadSummary(hash_keys=True)
+        list(xenocrates.iter_csv_data("tests/test-data-edge-cases.tsv", exact))
+        list(xenocrates.iter_csv_data("tests/test-data-edge-cases.tsv", hashed))
+        assert hashed.duplicates() == exact.duplicates()
+        assert all(isinstance(key, int) for key in hashed.duplicate_tracker)
+
+        sources = ["tests/test-data.json", "tests/test-data-excel.xlsx"]
+        summaries = []
+        list(xenocrates.iter_input_files(sources, summaries, hash_keys=True))
+        assert len(xenocrates.find_cross_file_duplicates(summaries)) == 10
+
+
+class TestNearDuplicates:
+    """Test MinHash/LSH near-duplicate title detection."""
+
+    def _index(self, titles):
+        finder = xenocrates.NearDuplicateIndex()
+        for title, book in titles:
+            finder.add(xenocrates.Entry(title.upper(), "", "1", book, ""))
+        return finder
+
+    def test_variants_are_clustered(self):
+        """Test spelling, punctuation and spacing variants form one cluster, unrelated titles none."""
+        finder = self._index(
+            [
+                ("SQL Injection", "SEC542"),
+                ("SQL-Injection", "SEC504"),
+                ("SQLi Injection", "SEC401"),
+                ("Cross-Site Scripting", "SEC542"),
+                ("Cross Site Scripting (XSS)", "SEC504"),
+                ("AES Encryption", "SEC401"),
+                ("RSA Encryption", "SEC401"),
+                ("Kerberos", "SEC505"),
+            ]
+        )
+        assert finder.clusters() == [
+            ["CROSS SITE SCRIPTING (XSS)", "CROSS-SITE SCRIPTING"],
+            ["SQL INJECTION", "SQL-INJECTION", "SQLI INJECTION"],
+        ]
+
+    def test_similar_chain_does_not_merge_everything(self):
+        """Test every title in a cluster is similar to the cluster centre, not only to a neighbour."""
+        words = "ALPHA BRAVO CHARLIE DELTA ECHO FOXTROT GOLF HOTEL INDIA JULIET KILO LIMA".split()
+        # Neighbouring windows share four of five words, windows two apart only three
+        chain = [" ".join(words[i : i + 5]) for i in range(len(words) - 4)]
+        clusters = self._index([(title, "B1") for title in chain]).clusters()
+        assert sum(len(cluster) for cluster in clusters) == len(chain)
+        assert all(len(cluster) <= 3 for cluster in clusters)
+
+    def test_generate_index_reports_clusters(self, tmp_path, capsys):
+        """Test --near-duplicates reports clusters with their books and leaves the output unchanged."""
+        source = tmp_path / "notes.tsv"
+        source.write_text(
+            "Title\tDescription\tPage\tBook\n"
+            "SQL Injection\tA\t1\tSEC542\n"
+            "SQL-Injection\tB\t2\tSEC504\n"
+            "Kerberos\tC\t3\tSEC505\n",
+            encoding="utf-8",
+        )
+        plain, checked = tmp_path / "plain.html", tmp_path / "checked.html"
+        xenocrates.generate_index(str(source), str(plain))
+        capsys.readouterr()
+        xenocrates.generate_index(str(source), str(checked), near_duplicates=True)
+
+        err = capsys.readouterr().err
+        assert "Found 1 groups of near-duplicate titles" in err
+        assert "'SQL INJECTION' (SEC542) ~ 'SQL-INJECTION' (SEC504)" in err
+        assert checked.read_bytes() == plain.read_bytes()
+
+    def test_report_is_capped(self, monkeypatch, capsys):
+        """Test only the first clusters are listed, followed by the number of others."""
+        monkeypatch.setattr(xenocrates, "NEAR_DUPLICATE_REPORT_LIMIT", 2)
+        words = ["Kerberos", "Mimikatz", "Netcat", "Wireshark"]
+        self._index([(f"{word} {suffix}", "B1") for word in words for suffix in ("Basics", "basics!")]).report()
+
+        lines = capsys.readouterr().err.splitlines()
+        assert lines[0] == "Warning: Found 4 groups of near-duplicate titles:"
+        assert len(lines) == 4 and lines[-1] == "  ... and 2 more groups"
+
+    def test_no_near_duplicates(self, capsys):
+        """Test the report for a clean title set."""
+        self._index([("AES", "B1"), ("Kerberos", "B1")]).report()
+        assert "No near-duplicate titles found" in capsys.readouterr().err
+
+
 class TestErrorHandling:
     """Test error handling and edge cases."""
 
@@ -311,6 +967,690 @@ class TestSectionHeaders:
         assert "Numbers & Special Characters" in header_html
 
 
+class TestHTMLWriter:
+    """Test the buffered, template-based HTML writer."""
+
+    def test_render_entry_format(self):
+        """Test rendered entries keep the original line layout and escaping."""
+        rendered = xenocrates.render_entry("A<B", "x & y", "5", "SEC401")
+        assert rendered == (
+            "<span class=topic><b><span style='color:blue'>\n"
+            " A&lt;B \n"
+            "</span></b></span><span style='color:black'>&nbsp;\n"
+            "<br><i>{b-SEC401 / p-5}</i><br>x &amp; y<br></span>\n"
+        )
+
+    def test_render_entry_with_course(self):
+        """Test GSE entries include the course reference."""
+        rendered = xenocrates.render_entry("KERBEROS", "Tickets", "201", "SEC505", "SEC575")
+        assert "<br><i>{c-SEC575 / b-SEC505 / p-201}</i><br>Tickets<br></span>\n" in rendered
+
+    def test_matches_sample_outputs(self, tmp_path):
+        """Test generated HTML is byte-identical to the committed sample outputs."""
+        for source, sample in [
+            ("tests/test-data-minimal.tsv", "tests/sample-output.html"),
+            ("tests/test-gse-with-course.tsv", "tests/sample-output-gse.html"),
+        ]:
+            output = tmp_path / "out.html"
+            xenocrates.generate_index(source, str(output))
+            with open(sample, "rb") as f:
+                assert output.read_bytes() == f.read()
+
+    def test_chunked_writes_identical(self, monkeypatch):
+        """Test flushing in small chunks produces the same HTML."""
+        import io
+
+        index, _ = xenocrates.read_csv_data("tests/test-data-basic.tsv")
+        index.sort(key=lambda entry: entry[0])
+
+        whole = io.StringIO()
+        xenocrates.write_index(index, whole)
+
+        monkeypatch.setattr(xenocrates, "WRITE_CHUNK_ENTRIES", 3)
+        chunked = io.StringIO()
+        xenocrates.write_index(index, chunked)
+
+        assert chunked.getvalue() == whole.getvalue()
+
+
+class TestParallelRender:
+    """Test partitioned sorting and rendering across worker processes (--jobs)."""
+
+    def test_partitions_concatenate_to_sorted_order(self):
+        """Test partitions in key order reproduce the global stable sort."""
+        index, _ = xenocrates.read_csv_data("tests/test-data-basic.tsv")
+        partitions = xenocrates.partition_entries(index)
+
+        for partition in partitions:
+            partition.sort(key=lambda entry: entry[0])
+        merged = [entry for partition in partitions for entry in partition]
+
+        assert merged == sorted(index, key=lambda entry: entry[0])
+
+    def test_parallel_output_identical(self, tmp_path):
+        """Test --jobs output matches the serial writer, including quoted titles."""
+        source = tmp_path / "notes.tsv"
+        source.write_text(
+            "Title\tDescription\tPage\tBook\n"
+            '"Zebra"\tQuoted title sorts before letters\t1\tSEC401\n'
+            "Apple\tFruit\t2\tSEC401\n"
+            '"Apple"\tQuoted apple\t3\tSEC401\n'
+            "~Tilde\tSorts after Z\t4\tSEC401\n"
+            "123 Numbers\tDigits\t5\tSEC401\n"
+            "Zulu\tLast letter\t6\tSEC401\n"
+            "apple\tSame title, later row\t7\tSEC401\n",
+            encoding="utf-8",
+        )
+        serial = tmp_path / "serial.html"
+        parallel = tmp_path / "parallel.html"
+
+        xenocrates.generate_index(str(source), str(serial))
+        xenocrates.generate_index(str(source), str(parallel), jobs=2)
+
+        assert parallel.read_bytes() == serial.read_bytes()
+
+    @pytest.mark.parametrize("cache", [False, True])
+    def test_parallel_repeated_input(self, tmp_path, monkeypatch, cache):
+        """Test --jobs accepts a source given twice (also as a file inside a given directory) like the serial path."""
+        notes = tmp_path / "notes"
+        notes.mkdir()
+        source = notes / "basic.tsv"
+        with open("tests/test-data-basic.tsv", "rb") as f:
+            source.write_bytes(f.read())
+        serial = tmp_path / "serial.html"
+        parallel = tmp_path / "parallel.html"
+        cache_option = ["--cache", str(tmp_path / "cache.sqlite3")] if cache else ["--no-cache"]
+
+        # With the cache, the second parallel run loads every source from it
+        for jobs, output in (("1", serial), ("2", parallel), ("2", parallel)):
+            argv = ["xenocrates.py", str(source), str(notes), "-o", str(output), "-j", jobs, *cache_option]
+            monkeypatch.setattr(sys, "argv", argv)
+            xenocrates.main()
+            assert output.read_bytes() == serial.read_bytes()
+
+    def test_jobs_with_max_memory_rejected(self):
+        """Test --jobs cannot be combined with --max-memory."""
+        with pytest.raises(ValueError, match="cannot be combined"):
+            xenocrates.generate_index("tests/test-data-basic.tsv", None, max_memory=1024, jobs=2)
+
+
+class TestOutputFormats:
+    """Test rendering one sorted index to several output formats (--output FORMAT:PATH)."""
+
+    def test_parse_output_spec(self):
+        """Test explicit formats, formats from extensions and the HTML default."""
+        assert xenocrates.parse_output_spec("md:notes.txt") == ("markdown", "notes.txt")
+        assert xenocrates.parse_output_spec("JSON:-") == ("json", "-")
+        assert xenocrates.parse_output_spec("sorted.tsv.gz") == ("tsv", "sorted.tsv.gz")
+        assert xenocrates.parse_output_spec("index.out") == ("html", "index.out")
+        assert xenocrates.parse_output_spec("C:\\index.md") == ("markdown", "C:\\index.md")
+        with pytest.raises(ValueError, match="no path"):
+            xenocrates.parse_output_spec("csv:")
+
+    def test_fan_out_matches_single_outputs(self, tmp_path):
+        """Test every output of one run matches its own single-format run, also with --jobs."""
+        targets = {
+            "html": "index.html",
+            "markdown": "index.md",
+            "csv": "index.csv",
+            "tsv": "index.tsv",
+            "json": "index.json",
+        }
+        for jobs in (1, 2):
+            run = tmp_path / f"fan-out-{jobs}"
+            run.mkdir()
+            outputs = [f"{fmt}:{run / name}" for fmt, name in targets.items()]
+            xenocrates.generate_index("tests/test-data-basic.tsv", None, jobs=jobs, dedupe="drop", outputs=outputs)
+
+            for fmt, name in targets.items():
+                single = tmp_path / f"single-{name}"
+                outputs = [(fmt, str(single))]
+                xenocrates.generate_index("tests/test-data-basic.tsv", None, dedupe="drop", outputs=outputs)
+                assert (run / name).read_bytes() == single.read_bytes()
+
+        html = tmp_path / "legacy.html"
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(html), dedupe="drop")
+        assert (tmp_path / "fan-out-1" / "index.html").read_bytes() == html.read_bytes()
+
+    def test_tabular_outputs_read_back(self, tmp_path):
+        """Test CSV, TSV and JSON outputs are valid inputs holding the sorted index."""
+        index, _ = xenocrates.read_input_file("tests/test-gse-with-course.tsv")
+        outputs = [str(tmp_path / name) for name in ("sorted.csv", "sorted.tsv", "sorted.json")]
+        xenocrates.generate_index("tests/test-gse-with-course.tsv", None, outputs=outputs)
+
+        for path in outputs:
+            entries, has_course = xenocrates.read_input_file(path)
+            assert has_course
+            assert entries == sorted(index, key=lambda entry: entry[0])
+
+    def test_positional_output_is_html(self, tmp_path, monkeypatch):
+        """Test the legacy positional output is HTML whatever its extension, while -o follows the extension."""
+        positional = tmp_path / "index.json"
+        monkeypatch.setattr(sys, "argv", ["xenocrates.py", "tests/test-data-basic.tsv", str(positional), "--no-cache"])
+        xenocrates.main()
+        assert positional.read_text(encoding="utf-8").startswith("<")
+
+        option = tmp_path / "sorted.json"
+        argv = ["xenocrates.py", "tests/test-data-basic.tsv", "-o", str(option), "--no-cache"]
+        monkeypatch.setattr(sys, "argv", argv)
+        xenocrates.main()
+        assert json.loads(option.read_text(encoding="utf-8"))
+
+    def test_renderer_needs_entry(self):
+        """Test a renderer must implement entry()."""
+        with pytest.raises(TypeError, match="entry"):
+            xenocrates.IndexRenderer()
+
+    def test_markdown_escapes_fields(self):
+        """Test Markdown syntax in fields is escaped and line breaks are folded."""
+        rendered = xenocrates.MarkdownRenderer().entry("A_B *C*", "x <y>\nz", "5", "SEC401", "")
+        assert rendered == "- **A\\_B \\*C\\*** *{b-SEC401 / p-5}* x \\<y\\> z\n"
+
+
+class TestSplitSections:
+    """Test writing one HTML file per section plus a table of contents (--split-sections)."""
+
+    def _write(self, path, titles):
+        rows = [f"{title}\tAbout {title}\t{page}\tSEC401" for page, title in enumerate(titles, start=1)]
+        path.write_text("Title\tDescription\tPage\tBook\n" + "\n".join(rows) + "\n", encoding="utf-8")
+
+    def test_section_files_and_contents(self, tmp_path):
+        """Test each section file holds its sorted section and the contents link to them."""
+        source = tmp_path / "notes.tsv"
+        self._write(source, ["beta", "Alpha", '"Apple"', "123", "~tilde", "Bravo"])
+        toc = tmp_path / "index.html"
+
+        for jobs in (1, 2):
+            xenocrates.generate_index(str(source), str(toc), jobs=jobs, split_sections=True)
+            names = sorted(os.listdir(tmp_path))
+            assert names == ["index-a.html", "index-b.html", "index-numbers.html", "index.html", "notes.tsv"]
+
+            index, _ = xenocrates.read_csv_data(str(source))
+            expected = io.StringIO()
+            xenocrates.write_index(sorted([index[1], index[2]], key=lambda entry: entry[0]), expected)
+            assert (tmp_path / "index-a.html").read_text(encoding="utf-8") == expected.getvalue()
+
+            contents = toc.read_text(encoding="utf-8")
+            assert "<a href='index-a.html'>Aa</a> <i>(2)</i>" in contents
+            assert contents.index("index-b.html") < contents.index("index-numbers.html")
+
+    def test_unchanged_sections_not_rewritten(self, tmp_path):
+        """Test only the sections whose entries changed are rewritten, and empty ones removed."""
+        source = tmp_path / "notes.tsv"
+        toc = tmp_path / "index.html.gz"
+        self._write(source, ["Alpha", "Bravo", "Charlie"])
+        xenocrates.generate_index(str(source), str(toc), split_sections=True)
+
+        for name in ("index-a.html.gz", "index-b.html.gz", "index-c.html.gz"):
+            os.utime(tmp_path / name, (1, 1))
+        self._write(source, ["Alpha", "Bravo", "Bravo Two"])
+        xenocrates.generate_index(str(source), str(toc), split_sections=True)
+
+        assert os.path.getmtime(tmp_path / "index-a.html.gz") == 1
+        assert os.path.getmtime(tmp_path / "index-b.html.gz") != 1
+        assert not (tmp_path / "index-c.html.gz").exists()
+
+    def test_needs_one_html_file(self):
+        """Test --split-sections without an output file (or with several) is rejected."""
+        with pytest.raises(ValueError, match="single HTML output file"):
+            xenocrates.generate_index("tests/test-data-basic.tsv", None, split_sections=True)
+        with pytest.raises(ValueError, match="single HTML output file"):
+            xenocrates.generate_index("tests/test-data-basic.tsv", "a.html", outputs=["b.md"], split_sections=True)
+
+
+class TestLibraryAPI:
+    """Test build_index() and the Index object."""
+
+    def test_build_and_render_match_generate_index(self, tmp_path, capsys):
+        """Test the rendered Index equals the CLI output and nothing is printed."""
+        expected = tmp_path / "index.html"
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(expected), dedupe="drop")
+        capsys.readouterr()
+
+        index = xenocrates.build_index("tests/test-data-basic.tsv", dedupe="drop")
+
+        assert capsys.readouterr().err == ""
+        assert index.render() == expected.read_bytes()
+        binary, text = io.BytesIO(), io.StringIO()
+        index.render(binary)
+        index.render(text, "md")
+        assert binary.getvalue() == expected.read_bytes()
+        assert text.getvalue().startswith("# Index\n")
+
+    def test_sections_and_diagnostics(self):
+        """Test sections follow the document order and warnings are returned as data."""
+        index = xenocrates.build_index(["tests/test-data-edge-cases.tsv", "tests/test-data-csv.csv"], jobs=2)
+
+        assert any("DUPLICATE ENTRY" in message for message in index.warnings)
+        assert xenocrates.Diagnostic("info", "Read 2 entries from tests/test-data-csv.csv") in index.diagnostics
+        sections = index.sections()
+        assert sum(len(section.entries) for section in sections) <= len(index)
+        assert [entry for section in sections for entry in section.entries] == [
+            entry for entry in index if xenocrates.entry_first_char(entry[0])
+        ]
+        assert all(a.number != b.number for a, b in zip(sections, sections[1:]))
+
+    def test_concurrent_builds_keep_diagnostics_apart(self):
+        """Test builds in several threads each collect only their own diagnostics."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        sources = ["tests/test-data-edge-cases.tsv", "tests/test-data-basic.tsv"] * 4
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            indexes = list(executor.map(xenocrates.build_index, sources))
+
+        for source, index in zip(sources, indexes):
+            assert index.entries == xenocrates.build_index(source).entries
+            assert bool(index.warnings) == (source == "tests/test-data-edge-cases.tsv")
+
+
+class TestSearchServer:
+    """Test the inverted search index and the local query server (serve)."""
+
+    def test_search_modes_and_filters(self):
+        """Test full-text, prefix-word and title-prefix queries with field filters."""
+        search = xenocrates.SearchIndex(xenocrates.build_index("tests/test-gse-with-course.tsv"))
+
+        assert [e.title_upper for e in search.search("protocol")[1]] == ["KERBEROS", "LDAP"]
+        assert [e.title_upper for e in search.search("auth* protocol")[1]] == ["KERBEROS"]
+        assert [e.title_upper for e in search.search("protocol", course="sec575", book="SEC505")[1]] == [
+            "KERBEROS",
+            "LDAP",
+        ]
+        assert search.search("protocol", page="167")[0] == 1
+        assert [e.title_upper for e in search.search("sql in", mode="prefix")[1]] == ["SQL INJECTION"]
+        assert search.search("", limit=2) == (4, list(search.index.entries[:2]))
+        assert search.search("nothing matches this")[0] == 0
+        with pytest.raises(ValueError, match="Unknown filter"):
+            search.search("x", chapter="1")
+
+    def test_http_queries_and_reload(self, tmp_path, monkeypatch):
+        """Test /search answers JSON and picks up a changed input file."""
+        import threading
+        import urllib.error
+        import urllib.request
+
+        source = tmp_path / "notes.tsv"
+        source.write_text("Title\tDescription\tPage\tBook\nKerberos\tTickets\t1\tB1\n", encoding="utf-8")
+        index_server = xenocrates.IndexServer([str(source)], cache_path=None)
+        server = index_server.make_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/search"
+
+        def get(query):
+            with urllib.request.urlopen(f"{url}?{query}") as response:
+                return json.loads(response.read())
+
+        try:
+            assert get("q=tick*")["results"][0]["title"] == "KERBEROS"
+            with pytest.raises(urllib.error.HTTPError):
+                get("q=x&mode=fuzzy")
+
+            assert not index_server.reload_if_changed()
+            source.write_text("Title\tDescription\tPage\tBook\nNTLM\tHashes\t2\tB1\n", encoding="utf-8")
+            os.utime(source, ns=(1, 1))
+            assert index_server.reload_if_changed()
+            assert get("q=hashes")["total"] == 1
+            assert get("q=tickets")["total"] == 0
+
+            # Any reload error is reported; the previous index keeps serving
+            def broken_build_index(*args, **kwargs):
+                raise RuntimeError("boom")
+
+            os.utime(source, ns=(2, 2))
+            monkeypatch.setattr(xenocrates, "build_index", broken_build_index)
+            with xenocrates.collect_diagnostics() as messages:
+                assert not index_server.reload_if_changed()
+            assert "RuntimeError('boom')" in messages[0]
+            assert get("q=hashes")["total"] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestPipelineStats:
+    """Test per-stage timing (--stats) and profiling (--profile)."""
+
+    def test_untimed_without_record_stats(self):
+        """Test the pipeline hooks do nothing outside record_stats()."""
+        entries = [xenocrates.Entry("A", "", "1", "B1", "")]
+        assert xenocrates.timed_iter("read", entries) is entries
+        assert type(xenocrates.new_read_summary()) is xenocrates.ReadSummary
+        with xenocrates.timed_stage("sort") as first, xenocrates.timed_stage("write") as second:
+            assert first is not second
+            first.rows += 5
+        with xenocrates.timed_stage("sort") as again:
+            assert again.rows == 0 and second.rows == 0
+
+    def test_nested_stages_are_exclusive(self):
+        """Test an outer stage does not count the time of stages nested in it."""
+        with xenocrates.record_stats() as stats:
+            with xenocrates.timed_stage("outer"):
+                time.sleep(0.01)
+                for _ in xenocrates.timed_iter("inner", (time.sleep(0.01) for _ in range(3))):
+                    pass
+        outer, inner = stats.stages["outer"], stats.stages["inner"]
+        assert inner.rows == 3 and inner.seconds >= 0.03
+        assert 0.01 <= outer.seconds < inner.seconds
+        assert outer.seconds + inner.seconds <= stats.total_seconds
+
+    def test_generate_index_stages(self, tmp_path):
+        """Test generate_index() reports its stages with rows and the JSON report."""
+        with xenocrates.record_stats() as stats:
+            xenocrates.generate_index("tests/test-data-edge-cases.tsv", str(tmp_path / "index.html"), dedupe="drop")
+        assert list(stats.stages) == ["read", "sort", "track duplicates", "write", "dedupe"]
+        read = stats.stages["read"].rows
+        assert read == stats.stages["sort"].rows == stats.stages["track duplicates"].rows > 0
+        assert stats.stages["write"].rows < read  # Duplicates dropped
+
+        stats.write_json(str(tmp_path / "stats.json"))
+        report = json.loads((tmp_path / "stats.json").read_text())
+        assert [stage["name"] for stage in report["stages"]] == list(stats.stages)
+        assert report["stages"][0]["rows"] == read and report["total_seconds"] > 0
+
+    def test_read_input_file_stages(self):
+        """Test read_input_file() times reading and duplicate tracking separately."""
+        with xenocrates.record_stats() as stats:
+            entries, _ = xenocrates.read_input_file("tests/test-data-basic.tsv")
+        assert stats.stages["read"].rows == stats.stages["track duplicates"].rows == len(entries)
+
+    def test_profile_and_collapsed_stacks(self, tmp_path):
+        """Test --profile writes pstats data and caller;callee collapsed stacks."""
+        path = str(tmp_path / "run.prof")
+        with xenocrates.collect_diagnostics():
+            with xenocrates.profile_to(path):
+                xenocrates.read_input_file("tests/test-data-basic.tsv")
+
+        assert pstats.Stats(path).total_calls > 0
+        lines = open(path + ".collapsed", encoding="utf-8").read().splitlines()
+        assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any(line.startswith("read_input_file (xenocrates.py:") and ";read_csv_data " in line for line in lines)
+
+
+class TestCrossReferences:
+    """Test automatic 'see also' references between entries (--see-also)."""
+
+    TITLES = ["KERBEROS", "KERBEROS TICKET", "KDC", "NTLM", "C++", "IP", '"QUOTED"']
+
+    def _references(self, limit=xenocrates.SEE_ALSO_MAX_LINKS):
+        references = xenocrates.CrossReferences(limit)
+        list(references.observe(xenocrates.Entry(title, "", "1", "B1", "") for title in self.TITLES))
+        return references
+
+    def _titles(self, references, title, description):
+        return [found for _, found in references.find(title, description)]
+
+    def test_whole_words_only(self):
+        """Test titles match case-insensitively on word boundaries only."""
+        references = self._references()
+        assert self._titles(references, "X", "Uses ntlm, unlike NTLMv2 or XNTLM") == ["NTLM"]
+        assert self._titles(references, "X", "Written in C++, not C") == ["C++"]
+        assert self._titles(references, "X", "Matches quoted text") == ['"QUOTED"']
+
+    def test_longest_mention_wins_and_own_title_skipped(self):
+        """Test overlapping mentions refer to the longest title and never to the entry itself."""
+        references = self._references()
+        assert self._titles(references, "KDC", "Issues a Kerberos ticket; also Kerberos") == [
+            "KERBEROS TICKET",
+            "KERBEROS",
+        ]
+        assert self._titles(references, "KERBEROS TICKET", "A Kerberos ticket from the KDC") == ["KDC"]
+
+    def test_short_titles_limit_and_repeats(self):
+        """Test short titles are ignored, each title is referred to once and the limit holds."""
+        references = self._references(limit=2)
+        assert self._titles(references, "X", "IP over NTLM, NTLM, KDC, Kerberos") == ["NTLM", "KDC"]
+        assert references.anchor("IP") is None
+        assert references.anchor("NTLM") is not None
+
+    def test_html_links_and_anchors(self, tmp_path):
+        """Test HTML gets anchors and links, identical with --jobs; without the option nothing changes."""
+        notes = tmp_path / "notes.tsv"
+        notes.write_text(
+            "Title\tDescription\tPage\tBook\n"
+            "Kerberos\tAuthentication, see NTLM\t1\tB1\n"
+            "Kerberos\tDuplicate title\t2\tB1\n"
+            "NTLM\tWeaker than <Kerberos>\t3\tB1\n",
+            encoding="utf-8",
+        )
+        plain = tmp_path / "plain.html"
+        xenocrates.generate_index(str(notes), str(plain))
+        assert "see-" not in plain.read_text(encoding="utf-8")
+
+        outputs = []
+        for jobs in (1, 2):
+            linked = tmp_path / f"linked-{jobs}.html"
+            xenocrates.generate_index(str(notes), str(linked), jobs=jobs, see_also=5)
+            outputs.append(linked.read_text(encoding="utf-8"))
+        assert outputs[0] == outputs[1]
+
+        html_text = outputs[0]
+        assert html_text.count("<a id=see-") == 2
+        assert "Authentication, see NTLM<br><i>See also: <a href='#see-1'>NTLM</a></i>" in html_text
+        assert "Weaker than &lt;Kerberos&gt;<br><i>See also: <a href='#see-0'>KERBEROS</a></i>" in html_text
+        assert html_text.replace("<a id=see-0></a>", "").replace("<a id=see-1></a>", "").count("see-") == 2
+
+    def test_text_formats(self, tmp_path):
+        """Test formats without links get the references as text."""
+        notes = tmp_path / "notes.tsv"
+        notes.write_text("Title\tDescription\tPage\tBook\nKerberos\tSee NTLM\t1\tB1\nNTLM\tOld\t2\tB1\n")
+        markdown = tmp_path / "index.md"
+        xenocrates.generate_index(str(notes), outputs=[f"md:{markdown}"], see_also=5)
+        assert "See NTLM (see also: NTLM)" in markdown.read_text(encoding="utf-8")
+
+    def test_not_with_split_sections(self, tmp_path):
+        """Test --see-also is rejected with --split-sections."""
+        with pytest.raises(ValueError, match="--split-sections"):
+            xenocrates.generate_index(
+                "tests/test-data-basic.tsv", str(tmp_path / "index.html"), split_sections=True, see_also=5
+            )
+
+
+class TestEmbeddedSearchIndex:
+    """Test the prebuilt search postings appended to the HTML (--search-index)."""
+
+    def _decode(self, data):
+        postings = {}
+        for token, gaps in zip(data["t"], data["p"]):
+            ids, total = [], 0
+            for gap in gaps.split("."):
+                total += int(gap, 36)
+                ids.append(total)
+            postings[token] = ids
+        return postings
+
+    def test_postings_follow_rendered_order(self):
+        """Test entry ids count only rendered entries and tokens are sorted."""
+        entries = [
+            xenocrates.Entry("AES", "Block cipher", "1", "B1", ""),
+            xenocrates.Entry('""', "Skipped: no title character", "2", "B1", ""),
+            xenocrates.Entry("RSA", "Public key cipher", "3", "B1", ""),
+        ]
+        search = xenocrates.ClientSearchIndex()
+        assert list(search.observe(entries)) == entries
+
+        data = json.loads(search.to_json())
+        assert data["t"] == sorted(data["t"])
+        postings = self._decode(data)
+        assert postings["cipher"] == [0, 1]
+        assert postings["rsa"] == [1]
+        assert "skipped" not in postings
+
+    def test_html_gets_search_script(self, tmp_path):
+        """Test the index is unchanged before the appended script, also with --jobs and dedupe."""
+        plain = tmp_path / "plain.html"
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(plain), dedupe="drop")
+        expected = plain.read_text(encoding="utf-8")
+
+        outputs = []
+        for jobs in (1, 2):
+            searchable = tmp_path / f"search-{jobs}.html"
+            xenocrates.generate_index(
+                "tests/test-data-basic.tsv", str(searchable), jobs=jobs, dedupe="drop", search_index=True
+            )
+            outputs.append(searchable.read_text(encoding="utf-8"))
+
+        assert outputs[0] == outputs[1]
+        assert outputs[0].startswith(expected)
+        script = outputs[0][len(expected) :]
+        assert "<script>" in script and script.count("</script>") == 1
+        data = json.loads(script[script.index("var D=") + 6 : script.index(",T=D.t")])
+        assert len(self._decode(data)["kerberos"]) == 1
+
+    def test_script_tag_in_text_is_escaped(self):
+        """Test '</script>' in a description cannot close the embedded script."""
+        search = xenocrates.ClientSearchIndex()
+        list(search.observe([xenocrates.Entry("</SCRIPT>", "x", "1", "B1", "")]))
+        assert search.render_script().count("</script>") == 1
+
+    def test_needs_single_html_output(self):
+        """Test --search-index is rejected with other output formats."""
+        with pytest.raises(ValueError, match="single HTML output"):
+            xenocrates.generate_index("tests/test-data-basic.tsv", "a.html", outputs=["b.md"], search_index=True)
+
+
+class TestChunkedCSV:
+    """Test memory-mapped, chunk-parallel CSV/TSV parsing (--jobs on large files)."""
+
+    def test_boundaries_skip_quoted_newlines(self):
+        """Test chunk boundaries never fall inside a quoted multi-line field."""
+        data = b'A\t"one\ntwo\nthree"\t1\nB\tb\t2\nC\t"x\ny"\t3\n'
+        offsets, balanced = xenocrates.find_record_boundaries(data, 0, chunk_size=4, delimiter=b"\t")
+
+        assert balanced
+        assert offsets[0] == 0 and offsets[-1] == len(data)
+        records = [data[start:end] for start, end in zip(offsets, offsets[1:])]
+        assert records == [b'A\t"one\ntwo\nthree"\t1\n', b"B\tb\t2\n", b'C\t"x\ny"\t3\n']
+
+    def test_boundaries_ignore_quotes_inside_fields(self):
+        """Test a quote only opens a quoted field at the start of a field, as in the csv module."""
+        data = b'A\t3.5" disk\t1\nB\t"x\ny"\t2\nC\tsize 5"\t3\nD,"\t"a""\nb"\t4\n'
+        offsets, balanced = xenocrates.find_record_boundaries(data, 0, chunk_size=1, delimiter=b"\t")
+
+        assert balanced
+        records = [data[start:end] for start, end in zip(offsets, offsets[1:])]
+        assert records == [b'A\t3.5" disk\t1\n', b'B\t"x\ny"\t2\n', b'C\tsize 5"\t3\n', b'D,"\t"a""\nb"\t4\n']
+
+    def test_unbalanced_quotes_detected(self):
+        """Test an unterminated quoted field is reported as unbalanced."""
+        _, balanced = xenocrates.find_record_boundaries(b'A\t"open\nB\tb\n', 0, chunk_size=2, delimiter=b"\t")
+        assert not balanced
+
+    def test_chunked_matches_serial(self, tmp_path, monkeypatch, capsys):
+        """Test chunked parsing yields the same entries, duplicates and row warnings."""
+        source = tmp_path / "notes.tsv"
+        rows = ["Title\tDescription\tPage\tBook"]
+        for i in range(300):
+            if i % 50 == 7:
+                rows.append(f'"Multi {i}"\t"line one\nline ""two"""\t{i}\tSEC401')
+            elif i % 50 in (3, 30):
+                rows.append(f'Disk {i}\tA 3.5" floppy\t{i}\tSEC401')
+            elif i % 60 == 11:
+                rows.append(f"\tNo title\t{i}\tSEC401")
+            else:
+                rows.append(f"Term {i % 40}\tDescription {i}\t{i % 40}\tSEC401")
+        source.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+        serial = xenocrates.ReadSummary(hash_keys=True)
+        expected = list(xenocrates.iter_csv_data(str(source), serial))
+        serial_err = capsys.readouterr().err
+
+        monkeypatch.setattr(xenocrates, "PARALLEL_CSV_MIN_SIZE", 0)
+        monkeypatch.setattr(xenocrates, "PARALLEL_CSV_CHUNK_SIZE", 256)
+        assert len(xenocrates.plan_csv_chunks(str(source))[0]) > 10
+
+        chunked = xenocrates.ReadSummary(hash_keys=True)
+        entries = list(xenocrates.iter_csv_data(str(source), chunked, jobs=2))
+
+        assert entries == expected
+        assert capsys.readouterr().err == serial_err
+        assert chunked.entry_count == serial.entry_count
+        assert chunked.empty_title_count == serial.empty_title_count
+        assert chunked.duplicates() == serial.duplicates()
+
+
+class TestWatchMode:
+    """Test incremental regeneration used by --watch."""
+
+    def _write(self, path, rows, mtime_offset=0):
+        path.write_text("Title\tDescription\tPage\tBook\n" + "".join(rows), encoding="utf-8")
+        # Make sure the change is visible even on filesystems with coarse mtimes
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset * 10**9))
+
+    def test_incremental_rebuild_matches_full_build(self, tmp_path):
+        """Test only dirty partitions are rebuilt and the result matches a full build."""
+        book1 = tmp_path / "book1.tsv"
+        book2 = tmp_path / "book2.tsv"
+        output = tmp_path / "index.html"
+        full = tmp_path / "full.html"
+        self._write(book1, ["Apple\tFruit\t1\tSEC401\n", "Zulu\tLetter\t2\tSEC401\n"])
+        self._write(book2, ["Banana\tFruit\t3\tSEC504\n", "apple\tLater duplicate title\t4\tSEC504\n"])
+
+        watcher = xenocrates.IndexWatcher([str(book1), str(book2)], str(output))
+        assert watcher.refresh() is True
+        assert watcher.refresh() is False  # Nothing changed
+
+        self._write(book2, ["Banana\tFruit\t3\tSEC504\n", "Cherry\tFruit\t5\tSEC504\n"], mtime_offset=1)
+        fragments_before = dict(watcher._fragments)
+        assert watcher.refresh() is True
+
+        # Partitions not changed by the edit were reused as-is
+        assert watcher._fragments["Z"] is fragments_before["Z"]
+        assert watcher._fragments["B"] is fragments_before["B"]
+        assert watcher._fragments["A"] is not fragments_before["A"]
+        assert "CHERRY" in output.read_text(encoding="utf-8")
+
+        xenocrates.generate_index([str(book1), str(book2)], str(full))
+        assert output.read_bytes() == full.read_bytes()
+
+    def test_parse_error_keeps_previous_output(self, tmp_path):
+        """Test a broken edit leaves the last good output in place."""
+        book = tmp_path / "book.tsv"
+        output = tmp_path / "index.html"
+        self._write(book, ["Apple\tFruit\t1\tSEC401\n"])
+
+        watcher = xenocrates.IndexWatcher([str(book)], str(output))
+        watcher.refresh()
+        good = output.read_bytes()
+
+        book.write_text("Title\tBook\nBroken\tSEC401\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="Missing required columns"):
+            watcher.refresh()
+
+        assert output.read_bytes() == good
+        assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+    def test_reports_cross_file_duplicates(self, tmp_path):
+        """Test duplicates spanning input files are reported like a full build, also with hashed keys."""
+        book1 = tmp_path / "book1.tsv"
+        book2 = tmp_path / "book2.tsv"
+        self._write(book1, ["Apple\tFruit\t1\tSEC401\n"])
+        self._write(book2, ["Apple\tAgain\t1\tSEC401\n"])
+
+        for hash_keys in (False, True):
+            output = str(tmp_path / "index.html")
+            watcher = xenocrates.IndexWatcher([str(book1), str(book2)], output, hash_keys=hash_keys)
+            with xenocrates.collect_diagnostics() as messages:
+                watcher.refresh()
+            assert "Warning: Found 1 duplicate entries across files:" in messages
+
+    @pytest.mark.parametrize(
+        "option, message",
+        [
+            (["--jobs", "2"], "--jobs"),
+            (["--cache", "other.sqlite3"], "--cache"),
+            (["--max-memory", "1M"], "--max-memory"),
+        ],
+    )
+    def test_rejects_unsupported_options(self, tmp_path, monkeypatch, capsys, option, message):
+        """Test options the watcher cannot honour are rejected instead of being ignored."""
+        argv = ["xenocrates.py", "tests/test-data-basic.tsv", str(tmp_path / "index.html"), "--watch", *option]
+        monkeypatch.setattr(sys, "argv", argv)
+        with pytest.raises(SystemExit):
+            xenocrates.main()
+        assert "cannot be combined with " + message in capsys.readouterr().err
+
+
 class TestIntegration:
     """Integration tests for end-to-end functionality."""
 
@@ -373,6 +1713,176 @@ class TestIntegration:
                 os.unlink(temp_output)
 
 
+class TestExternalSort:
+    """Test the disk-spilling sort used by --max-memory."""
+
+    def test_parse_memory_size(self):
+        """Test human-readable memory sizes are parsed as binary units."""
+        assert xenocrates.parse_memory_size("65536") == 65536
+        assert xenocrates.parse_memory_size("512K") == 512 * 1024
+        assert xenocrates.parse_memory_size("512M") == 512 * 1024**2
+        assert xenocrates.parse_memory_size("2GiB") == 2 * 1024**3
+        assert xenocrates.parse_memory_size("1.5g") == int(1.5 * 1024**3)
+
+    def test_parse_memory_size_invalid(self):
+        """Test invalid memory sizes raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid memory size"):
+            xenocrates.parse_memory_size("lots")
+        with pytest.raises(ValueError, match="must be positive"):
+            xenocrates.parse_memory_size("0")
+
+    def test_external_sort_matches_sorted(self, monkeypatch):
+        """Test spilled runs merge to exactly the in-memory sorted order (stable on ties)."""
+        monkeypatch.setattr(xenocrates, "MERGE_FAN_IN", 3)
+        entries = [[title, str(i), "1", "B", ""] for i, title in enumerate("DACBADCABDCA" * 5)]
+
+        # A 1-byte budget spills every entry into its own run
+        result = list(xenocrates.sort_entries(iter(entries), max_memory=1))
+
+        assert result == sorted(entries, key=lambda entry: entry[0])
+
+    def test_external_sort_output_identical(self, tmp_path):
+        """Test --max-memory output is byte-identical to the in-memory path."""
+        in_memory = tmp_path / "in-memory.html"
+        spilled = tmp_path / "spilled.html"
+
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(in_memory))
+        xenocrates.generate_index("tests/test-data-basic.tsv", str(spilled), max_memory=2048)
+
+        assert spilled.read_bytes() == in_memory.read_bytes()
+
+
+class TestBatch:
+    """Test manifest batches ('xenocrates.py batch')."""
+
+    def _notes(self, tmp_path):
+        shared = tmp_path / "shared.tsv"
+        shared.write_text("Title\tDescription\tPage\tBook\nKerberos\tSee NTLM\t1\tB1\nNTLM\tOld\t2\tB1\n")
+        extra = tmp_path / "extra.tsv"
+        extra.write_text("Title\tDescription\tPage\tBook\nAES\tBlock cipher\t3\tB2\n")
+        return shared, extra
+
+    def test_toml_and_json_manifests(self, tmp_path):
+        """Test both manifest formats give the same jobs, with defaults and relative paths."""
+        (tmp_path / "m.toml").write_text(
+            '[defaults]\ndedupe = "merge"\nmax_memory = "1M"\n\n'
+            '[[jobs]]\nname = "all"\ninputs = ["shared.tsv", "extra.tsv"]\n'
+            'output = "out/all.html"\noutputs = ["md:out/all.md"]\nsee_also = true\n\n'
+            '[[jobs]]\ninput = "shared.tsv"\noutput = "out/one.html"\ndedupe = "drop"\nsheets = "all"\n'
+        )
+        (tmp_path / "m.json").write_text(
+            json.dumps(
+                {
+                    "defaults": {"dedupe": "merge", "max_memory": "1M"},
+                    "jobs": [
+                        {
+                            "name": "all",
+                            "inputs": ["shared.tsv", "extra.tsv"],
+                            "output": "out/all.html",
+                            "outputs": ["md:out/all.md"],
+                            "see_also": True,
+                        },
+                        {"input": "shared.tsv", "output": "out/one.html", "dedupe": "drop", "sheets": "all"},
+                    ],
+                }
+            )
+        )
+        jobs = xenocrates.load_manifest(str(tmp_path / "m.toml"))
+        assert jobs == xenocrates.load_manifest(str(tmp_path / "m.json"))
+
+        first, second = jobs
+        assert first.name == "all"
+        assert first.inputs == [str(tmp_path / "shared.tsv"), str(tmp_path / "extra.tsv")]
+        assert first.outputs == [("html", str(tmp_path / "out/all.html")), ("markdown", str(tmp_path / "out/all.md"))]
+        assert first.options == {"dedupe": "merge", "max_memory": 1024**2, "see_also": xenocrates.SEE_ALSO_MAX_LINKS}
+        assert second.name == str(tmp_path / "out/one.html")
+        assert second.options == {"dedupe": "drop", "max_memory": 1024**2, "sheets": "all"}
+
+    @pytest.mark.parametrize(
+        "job, message",
+        [
+            ({"inputs": "a.tsv", "output": "a.html", "jobs": 4}, "unknown option 'jobs'"),
+            ({"inputs": "a.tsv"}, "'output' or 'outputs'"),
+            ({"output": "a.html"}, "'inputs'"),
+            ({"inputs": "a.tsv", "output": "-"}, "stdin/stdout"),
+            ({"inputs": "a.tsv", "output": "a.html", "dedupe": "keep"}, "invalid value for 'dedupe'"),
+            ({"inputs": "a.tsv", "output": "html:"}, "Job 1: Output 'html:' has no path"),
+        ],
+    )
+    def test_invalid_jobs(self, tmp_path, job, message):
+        """Test invalid jobs are loaded with their error and never run."""
+        manifest = tmp_path / "m.json"
+        manifest.write_text(json.dumps({"jobs": [job, "a.tsv"]}))
+        invalid, not_a_table = xenocrates.load_manifest(str(manifest))
+        assert invalid.name == "job 1" and message in invalid.error
+        assert not_a_table.error == "Job 2: expected a table/object"
+
+        results = xenocrates.run_batch([invalid, not_a_table])
+        assert [(result.name, result.error) for result in results] == [
+            ("job 1", invalid.error),
+            ("job 2", not_a_table.error),
+        ]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_shared_inputs_parsed_once(self, tmp_path, workers):
+        """Test shared inputs come from the parse cache in every job and a failed job does not stop the others."""
+        shared, extra = self._notes(tmp_path)
+        bad = tmp_path / "bad.tsv"
+        bad.write_text("Titel\tDescription\tPage\tBook\nX\tY\t1\tB1\n")
+        jobs = [
+            xenocrates.BatchJob("all", [str(shared), str(extra)], [("html", str(tmp_path / "all.html"))], {}),
+            xenocrates.BatchJob("one", [str(shared)], [("html", str(tmp_path / "one.html"))], {}),
+            xenocrates.BatchJob("bad", [str(bad), str(shared)], [("html", str(tmp_path / "bad.html"))], {}),
+        ]
+        assert xenocrates.shared_batch_inputs(jobs) == [(str(shared), None, False)]
+
+        results = xenocrates.run_batch(jobs, workers)
+        assert [(result.name, result.error is None) for result in results] == [
+            ("all", True),
+            ("one", True),
+            ("bad", False),
+        ]
+        assert "Missing required columns" in results[2].error
+        for result in results[:2]:
+            cache_lines = [d.message for d in result.diagnostics if d.message.startswith("Parse cache:")]
+            assert cache_lines and cache_lines[0].startswith("Parse cache: 1 hits")
+
+        expected = tmp_path / "expected.html"
+        xenocrates.generate_index(str(shared), str(expected))
+        assert (tmp_path / "one.html").read_text(encoding="utf-8") == expected.read_text(encoding="utf-8")
+        assert not (tmp_path / "bad.html").exists()
+
+    def test_batch_command(self, tmp_path, monkeypatch, capsys):
+        """Test the command reports every job and exits with an error if one failed."""
+        self._notes(tmp_path)
+        manifest = tmp_path / "m.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "jobs": [
+                        {"name": "ok", "inputs": "shared.tsv", "output": "ok.html"},
+                        {"name": "missing", "inputs": "missing.tsv", "output": "missing.html"},
+                        {"name": "invalid", "inputs": "shared.tsv", "output": "invalid.html", "dedupe": "keep"},
+                        {"name": "nested", "inputs": "shared.tsv", "output": "out/sub/nested.html"},
+                    ]
+                }
+            )
+        )
+        monkeypatch.setattr(sys, "argv", ["xenocrates.py", "batch", str(manifest), "-j", "1", "--no-cache"])
+        with pytest.raises(SystemExit) as exit_info:
+            xenocrates.main()
+        assert exit_info.value.code == 1
+
+        err = capsys.readouterr().err
+        assert "Success: [ok] built in" in err
+        assert "Error: [missing] File" in err and "missing.tsv' not found" in err
+        assert "Error: [invalid] Job 3 (invalid): invalid value for 'dedupe'" in err
+        assert "Success: [nested] built in" in err
+        assert "2 of 4 jobs succeeded" in err
+        assert (tmp_path / "ok.html").exists()
+        assert (tmp_path / "out/sub/nested.html").exists()
+
+
 # Run tests if executed directly
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -9,6 +9,8 @@ Supported Input Formats:
     - CSV/TSV (.csv, .tsv, .txt) - Comma or tab-delimited files
     - Excel (.xlsx) - Excel 2010+ spreadsheets
     - JSON (.json) - Structured JSON data
+    - JSON Lines (.jsonl, .ndjson) - One JSON object per line, streamed
+    - Any of the text formats compressed (.gz, .bz2, .xz), e.g. notes.tsv.gz
 
 Usage:
     python xenocrates.py input_file.tsv output_file.html
@@ -16,22 +18,477 @@ Usage:
     python xenocrates.py input_file.xlsx output_file.html
     python xenocrates.py input_file.json output_file.html
     python xenocrates.py input_file.tsv > output.html  (legacy mode)
+    cat input_file.tsv | python xenocrates.py - output_file.html
+    python xenocrates.py input_file.tsv -o index.html -o md:index.md -o sorted.tsv
 
-The script automatically detects file format and delimiters.
+The script automatically detects file format and delimiters; input read
+from stdin ('-') is recognized by its content. Compressed inputs are
+decompressed while they are read, and an output file ending in .gz, .bz2
+or .xz is written compressed.
 """
 
+import abc
 import argparse
+import bisect
+import bz2
+import contextlib
+import contextvars
+import cProfile
 import csv
+import gzip
+import hashlib
+import heapq
 import html
+import io
+import itertools
 import json
+import lzma
+import mmap
+import operator
 import os
+import pickle
+import posixpath
+import pstats
+import random
+import re
+import sqlite3
 import string
 import sys
-from collections import defaultdict
+import tempfile
+import threading
+import time
+import urllib.parse
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from operator import itemgetter
+from xml.parsers import expat
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported
+    resource = None
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: batch manifests must be JSON
+    tomllib = None
 
 __version__ = "2.0.0"
 
+# Columns every input must provide (Course is optional)
+REQUIRED_COLUMNS = frozenset({"Title", "Book", "Page", "Description"})
+
+# External sort tuning: entries per pickled block in a spilled run, and the
+# maximum number of runs merged at once (bounds open temporary files)
+SPILL_BLOCK_SIZE = 1024
+MERGE_FAN_IN = 64
+
+# Parse cache entries written by a different schema, parser revision or release
+# are ignored. Bump PARSER_REVISION with every change to the readers that changes
+# the entries, row numbers or statistics they produce for the same input
+CACHE_SCHEMA_VERSION = 2
+PARSER_REVISION = 1
+CACHE_VERSION = f"{CACHE_SCHEMA_VERSION}:{PARSER_REVISION}:{__version__}"
+
+# Rows per JSON line in a parse cache payload, compressed bytes decoded at a time,
+# and the zlib level (1 is about 5x faster than the default for ~20% larger payloads)
+CACHE_ROW_BATCH = 1024
+CACHE_READ_CHUNK_SIZE = 256 * 1024
+CACHE_COMPRESSION_LEVEL = 1
+
+# Input path that reads from standard input, and the most bytes read ahead
+# from a stream to recognize its format
+STDIN_PATH = "-"
+SNIFF_SIZE = 64 * 1024
+
+# Chunk-parallel CSV/TSV parsing (--jobs): files of at least PARALLEL_CSV_MIN_SIZE
+# bytes are split into ranges of about PARALLEL_CSV_CHUNK_SIZE bytes that end on
+# record boundaries, and every range is parsed in a worker process
+PARALLEL_CSV_MIN_SIZE = 16 * 1024 * 1024
+PARALLEL_CSV_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Compressed inputs and outputs, recognized by their last extension
+COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz")
+
+
+# Messages collected by the innermost collect_diagnostics() of the current thread
+# (or asyncio task); None prints them to stderr
+_diagnostics = contextvars.ContextVar("xenocrates_diagnostics", default=None)
+
+# One reported line: level is 'info', 'warning', 'success' or 'error'; detail
+# lines (e.g. '  - ...' under a duplicate warning) take the level of their heading
+Diagnostic = namedtuple("Diagnostic", ["level", "message"])
+DIAGNOSTIC_LEVELS = ("Info", "Warning", "Success", "Error")
+
+
+def diagnostic(message):
+    """
+    Report an info/warning line: printed to stderr, or collected by collect_diagnostics().
+
+    Args:
+        message: Line as shown to the user, e.g. 'Warning: ...'
+    """
+    messages = _diagnostics.get()
+    if messages is None:
+        print(message, file=sys.stderr)
+    else:
+        messages.append(message)
+
+
+@contextlib.contextmanager
+def collect_diagnostics():
+    """
+    Collect the diagnostic() lines reported in this thread instead of printing them.
+
+    Yields:
+        List receiving the message strings, in order
+    """
+    messages = []
+    token = _diagnostics.set(messages)
+    try:
+        yield messages
+    finally:
+        _diagnostics.reset(token)
+
+
+def parse_diagnostics(messages):
+    """
+    Turn collected message lines into Diagnostic tuples.
+
+    Args:
+        messages: Lines from collect_diagnostics()
+
+    Returns:
+        List of Diagnostic(level, message) with the 'Level: ' prefix removed
+    """
+    diagnostics = []
+    for line in messages:
+        prefix, colon, rest = line.partition(": ")
+        if colon and prefix in DIAGNOSTIC_LEVELS:
+            diagnostics.append(Diagnostic(prefix.lower(), rest))
+        else:
+            diagnostics.append(Diagnostic(diagnostics[-1].level if diagnostics else "info", line))
+    return diagnostics
+
+
+# PipelineStats of the innermost record_stats() of the current thread; None
+# (the default) makes every stage untimed
+_stats = contextvars.ContextVar("xenocrates_stats", default=None)
+
+
+def peak_memory():
+    """
+    Return the peak resident memory so far, in bytes, or None where unknown (Windows).
+
+    Worker processes count too: the result is the larger of this process's
+    peak and that of its largest finished child.
+    """
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is in KiB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * scale
+
+
+class StageTiming:
+    """
+    Totals of one pipeline stage (see PipelineStats).
+
+    Attributes:
+        name: Stage name, e.g. 'read', 'sort' or 'write'
+        seconds: Wall time spent in the stage itself (nested stages excluded)
+        rows: Entries that passed through the stage
+        peak_memory: Peak resident memory in bytes when the stage last ended, or None
+    """
+
+    __slots__ = ("name", "seconds", "rows", "peak_memory")
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = 0
+        self.peak_memory = None
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.rows and self.seconds else None
+
+
+class PipelineStats:
+    """
+    Wall time, rows/sec and peak memory per pipeline stage (--stats).
+
+    Active within record_stats(); the pipeline reports to it through
+    timed_stage() and timed_iter(), which cost one context variable lookup
+    when no stats are recorded. Stages nest: the time of an inner stage
+    (e.g. reading, pulled by the sort) is not counted in the outer one, so
+    the stage times add up to the total. A stage entered several times
+    accumulates. Only this process is timed; work done in worker processes
+    counts towards the stage that waits for it.
+
+    Attributes:
+        stages: Dict of stage name -> StageTiming, in the order stages were first entered
+        total_seconds: Wall time of the whole record_stats() block (so far, while it runs)
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._open = []  # Time spent in nested stages, per open stage
+        self._start = time.perf_counter()
+        self._end = None
+
+    @property
+    def total_seconds(self):
+        return (self._end or time.perf_counter()) - self._start
+
+    def timing(self, name):
+        """Return the StageTiming of a stage, creating it on first use."""
+        timing = self.stages.get(name)
+        if timing is None:
+            timing = self.stages[name] = StageTiming(name)
+        return timing
+
+    def add(self, timing, seconds, rows=0):
+        """Add time spent inside a stage (nested in the currently open one, if any)."""
+        timing.seconds += seconds
+        timing.rows += rows
+        if self._open:
+            self._open[-1] += seconds
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Time a block as one stage.
+
+        Yields:
+            The stage's StageTiming (set its rows inside the block)
+        """
+        timing = self.timing(name)
+        self._open.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            elapsed = time.perf_counter() - start
+            timing.seconds += elapsed - self._open.pop()
+            if self._open:
+                self._open[-1] += elapsed
+            timing.peak_memory = peak_memory()
+
+    def iter(self, name, iterable):
+        """
+        Time the production of every item of a stream as one stage, counting the items as rows.
+
+        Returns:
+            Iterator over the items of iterable
+        """
+        # The stage is listed from now on, not from the first item pulled
+        return self._iter(self.timing(name), iterable)
+
+    def _iter(self, timing, iterable):
+        clock = time.perf_counter
+        open_stages = self._open
+        iterator = iter(iterable)
+        try:
+            while True:
+                open_stages.append(0.0)
+                start = clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed = clock() - start
+                    timing.seconds += elapsed - open_stages.pop()
+                    if open_stages:
+                        open_stages[-1] += elapsed
+                timing.rows += 1
+                yield item
+        finally:
+            timing.peak_memory = peak_memory()
+
+    def to_dict(self):
+        """Return the stats as JSON-serializable data (the --stats-json report)."""
+        return {
+            "total_seconds": round(self.total_seconds, 6),
+            "peak_memory_bytes": peak_memory(),
+            "stages": [
+                {
+                    "name": timing.name,
+                    "seconds": round(timing.seconds, 6),
+                    "rows": timing.rows,
+                    "rows_per_second": round(timing.rows_per_second) if timing.rows_per_second else None,
+                    "peak_memory_bytes": timing.peak_memory,
+                }
+                for timing in self.stages.values()
+            ],
+        }
+
+    def report(self):
+        """Report a per-stage summary table (see diagnostic())."""
+        memory = peak_memory()
+        memory_str = f", peak memory {memory / 2**20:,.1f} MB" if memory else ""
+        diagnostic(f"Info: Pipeline stages (total {self.total_seconds:.3f}s{memory_str}):")
+        for timing in self.stages.values():
+            line = f"  - {timing.name:<18} {timing.seconds:9.3f}s"
+            if timing.rows:
+                line += f" {timing.rows:>11,} rows"
+                if timing.rows_per_second:
+                    line += f" {timing.rows_per_second:>13,.0f} rows/s"
+            if timing.peak_memory:
+                line += f"  peak {timing.peak_memory / 2**20:,.1f} MB"
+            diagnostic(line)
+
+    def write_json(self, path):
+        """Write the stats as a JSON report."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+
+@contextlib.contextmanager
+def record_stats():
+    """
+    Record pipeline stage statistics in this thread (see PipelineStats).
+
+    Yields:
+        PipelineStats, complete once the block exits
+    """
+    stats = PipelineStats()
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        stats._end = time.perf_counter()
+        _stats.reset(token)
+
+
+def timed_stage(name):
+    """
+    Time a block as a pipeline stage if record_stats() is active (see PipelineStats.stage()).
+
+    Without active stats the block gets a fresh, unrecorded StageTiming, so
+    callers can update it unconditionally.
+    """
+    stats = _stats.get()
+    return contextlib.nullcontext(StageTiming(name)) if stats is None else stats.stage(name)
+
+
+def timed_iter(name, iterable):
+    """Time a stream as a pipeline stage if record_stats() is active, else return it unchanged."""
+    stats = _stats.get()
+    return iterable if stats is None else stats.iter(name, iterable)
+
+
+# Call paths whose share of a function's time is below this many seconds are
+# left out of the collapsed stacks (bounds the walk over the call graph)
+PROFILE_MIN_PATH_SECONDS = 1e-6
+
+
+def _profile_label(function):
+    """Name a cProfile function key (filename, line, name) as 'name (file.py:line)'."""
+    filename, line, name = function
+    if not line:  # Built-in functions
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(profile_stats):
+    """
+    Derive collapsed stacks ('outer;inner;leaf microseconds') from cProfile data, for flame graphs.
+
+    cProfile keeps the time of every caller/callee pair, not whole stacks, so
+    a function's own time is split over the call paths leading to it in
+    proportion to the time each caller spent in it. Recursive calls are
+    folded into the first occurrence on a path.
+
+    Args:
+        profile_stats: pstats.Stats
+
+    Returns:
+        List of lines in the collapsed stack format of flamegraph.pl and speedscope
+    """
+    functions = profile_stats.stats  # function -> (calls, total calls, own time, cumulative time, callers)
+    callees = defaultdict(dict)
+    for function, (*_, callers) in functions.items():
+        for caller, (*_, cumulative) in callers.items():
+            callees[caller][function] = callees[caller].get(function, 0.0) + cumulative
+
+    samples = defaultdict(float)
+    # Depth-first over call paths: (function, path of labels, functions on the path, share of its time)
+    pending = [(function, (), frozenset(), 1.0) for function, (*_, callers) in functions.items() if not callers]
+    while pending:
+        function, path, on_path, share = pending.pop()
+        _, _, own, _, _ = functions[function]
+        path = (*path, _profile_label(function))
+        on_path = on_path | {function}
+        samples[";".join(path)] += own * share
+        for callee, cumulative in callees.get(function, {}).items():
+            total = functions[callee][3]
+            if callee in on_path or not total or cumulative * share < PROFILE_MIN_PATH_SECONDS:
+                continue
+            pending.append((callee, path, on_path, share * min(cumulative / total, 1.0)))
+
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(samples.items()) if seconds >= 5e-7]
+
+
+def write_profile(profiler, path):
+    """
+    Save a cProfile run: pstats data to path and collapsed stacks to path + '.collapsed'.
+
+    Args:
+        profiler: Disabled cProfile.Profile
+        path: Output file for the pstats data (read with 'python -m pstats PATH' or snakeviz)
+    """
+    profile_stats = pstats.Stats(profiler)
+    profile_stats.dump_stats(path)
+    with open(path + ".collapsed", "w", encoding="utf-8") as f:
+        f.writelines(line + "\n" for line in collapsed_stacks(profile_stats))
+    diagnostic(f"Info: Profile written to {path} (pstats) and {path}.collapsed (flame graph stacks)")
+
+
+@contextlib.contextmanager
+def profile_to(path):
+    """Profile the block with cProfile and save it with write_profile(), also if it fails."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        write_profile(profiler, path)
+
+
+def delimiter_from_header(first_line):
+    """
+    Choose the delimiter (tab or comma) from the header line of a CSV/TSV file.
+
+    Args:
+        first_line: First line of the file
+
+    Returns:
+        Detected delimiter character ('\t' or ',')
+    """
+    # Count tabs and commas
+    tab_count = first_line.count("\t")
+    comma_count = first_line.count(",")
+
+    # Prefer tabs (TSV) over commas (CSV)
+    if tab_count >= comma_count and tab_count > 0:
+        return "\t"
+    elif comma_count > 0:
+        diagnostic("Info: Detected comma-delimited file (CSV)")
+        return ","
+    else:
+        # Default to tab if unclear
+        diagnostic("Warning: Could not detect delimiter, defaulting to tab")
+        return "\t"
+
 
 def detect_delimiter(filename):
     """
@@ -43,46 +500,91 @@ def detect_delimiter(filename):
     Returns:
         Detected delimiter character ('\t' or ',')
     """
-    with open(filename, "r", newline="", encoding="utf-8") as f:
-        # Read first line to detect delimiter
-        first_line = f.readline()
+    with open_text_input(filename) as f:
+        return delimiter_from_header(f.readline())
 
-        # Count tabs and commas
-        tab_count = first_line.count("\t")
-        comma_count = first_line.count(",")
 
-        # Prefer tabs (TSV) over commas (CSV)
-        if tab_count >= comma_count and tab_count > 0:
-            return "\t"
-        elif comma_count > 0:
-            print("Info: Detected comma-delimited file (CSV)", file=sys.stderr)
-            return ","
-        else:
-            # Default to tab if unclear
-            print("Warning: Could not detect delimiter, defaulting to tab", file=sys.stderr)
-            return "\t"
+def compression_suffix(filename):
+    """
+    Get the compression extension of a path ('.gz', '.bz2', '.xz'), or '' if it is not compressed.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return ext if ext in COMPRESSION_SUFFIXES else ""
+
+
+def open_binary(path, mode="rb", fileobj=None):
+    """
+    Open a file in binary mode, (de)compressing it when its extension asks for it.
+
+    Data is streamed through gzip/bz2/lzma, so no temporary files are written.
+    Gzip output carries no timestamp: the same content always compresses to
+    the same bytes.
+
+    Args:
+        path: File path; its extension selects the compression
+        mode: 'rb' or 'wb'
+        fileobj: Optional binary file already opened for path (e.g. a temporary
+            file); it is wrapped instead of opening path and is not closed
+
+    Returns:
+        Binary file object
+    """
+    suffix = compression_suffix(path)
+    target = path if fileobj is None else fileobj
+    if suffix == ".gz":
+        # The original file name is stored in the gzip header, also for temporary files
+        return gzip.GzipFile(os.path.basename(path) if fileobj else path, mode, fileobj=fileobj, mtime=0)
+    if suffix == ".bz2":
+        return bz2.BZ2File(target, mode)
+    if suffix == ".xz":
+        return lzma.LZMAFile(target, mode)
+    return open(path, mode) if fileobj is None else fileobj
+
+
+def open_text_output(path, fileobj=None):
+    """
+    Open an output file for UTF-8 text, compressed if its name ends in .gz, .bz2 or .xz.
+
+    Args:
+        path: Output file path
+        fileobj: Optional binary file to write to instead of opening path (see open_binary())
+
+    Returns:
+        Text file object
+    """
+    if fileobj is None and not compression_suffix(path):
+        return open(path, "w", encoding="utf-8")
+    return io.TextIOWrapper(open_binary(path, "wb", fileobj), encoding="utf-8")
 
 
 def detect_file_format(filename):
     """
     Detect input file format from extension.
 
+    A compression extension (.gz, .bz2, .xz) is ignored: notes.tsv.gz is 'tsv'.
+
     Args:
         filename: Path to input file
 
     Returns:
-        str: Format identifier ('csv', 'tsv', 'excel', 'json')
+        str: Format identifier ('csv', 'tsv', 'excel', 'json', 'jsonl')
 
     Raises:
         ValueError: If extension is not recognized
     """
-    ext = os.path.splitext(filename)[1].lower()
+    base = os.fspath(filename)
+    suffix = compression_suffix(base)
+    if suffix:
+        base = base[: -len(suffix)]
+    ext = os.path.splitext(base)[1].lower()
 
     format_map = {
         ".xlsx": "excel",
         ".csv": "csv",
         ".tsv": "tsv",
         ".json": "json",
+        ".jsonl": "jsonl",
+        ".ndjson": "jsonl",
         ".txt": "csv",  # Assume CSV/TSV, will auto-detect delimiter
     }
 
@@ -92,7 +594,103 @@ def detect_file_format(filename):
 
     # Unknown extension - provide helpful error
     supported = ", ".join(sorted(format_map.keys()))
-    raise ValueError(f"Unsupported file format: '{ext}'\n" f"Supported formats: {supported}")
+    raise ValueError(
+        f"Unsupported file format: '{ext}'\n"
+        f"Supported formats: {supported} (optionally compressed: {', '.join(COMPRESSION_SUFFIXES)})"
+    )
+
+
+def sniff_format(head):
+    """
+    Detect the input format from the first bytes of a file.
+
+    Args:
+        head: Leading bytes of the input (up to the end of its first non-blank line)
+
+    Returns:
+        str: Format identifier ('csv', 'excel', 'json', 'jsonl')
+    """
+    if head.startswith(b"PK\x03\x04"):
+        return "excel"  # Zip archive
+
+    text = head.decode("utf-8", errors="ignore").lstrip("\ufeff \t\r\n")
+    if text.startswith("["):
+        return "json"
+    if text.startswith("{"):
+        # JSON Lines holds a complete object on the first line; a JSON document
+        # is either spread over several lines or wraps its entries in one object
+        try:
+            first = json.loads(text.split("\n", 1)[0])
+        except ValueError:
+            return "json"
+        return "json" if isinstance(first, dict) and isinstance(first.get("entries"), list) else "jsonl"
+    return "csv"
+
+
+class _PrefixedReader(io.RawIOBase):
+    """Raw stream returning already consumed bytes before the rest of another stream."""
+
+    def __init__(self, prefix, stream):
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def sniff_input(stream):
+    """
+    Detect the format of a binary stream without rewinding it.
+
+    Reads ahead up to the end of the first non-blank line (at most SNIFF_SIZE
+    bytes), so pipes and stdin work; the bytes read are replayed by the
+    returned stream.
+
+    Args:
+        stream: Binary stream positioned at the start of the input
+
+    Returns:
+        Tuple of (format identifier as returned by sniff_format(), buffered binary stream)
+    """
+    head = b""
+    while len(head) < SNIFF_SIZE:
+        chunk = stream.read1(SNIFF_SIZE) if hasattr(stream, "read1") else stream.read(SNIFF_SIZE)
+        if not chunk:
+            break
+        head += chunk
+        if b"\n" in head.lstrip():
+            break
+    return sniff_format(head), io.BufferedReader(_PrefixedReader(head, stream))
+
+
+def open_text_input(source):
+    """
+    Open an input path, or wrap a binary stream, as UTF-8 text (newline='' for csv).
+
+    Compressed paths (.gz, .bz2, .xz) are decompressed as they are read.
+
+    Args:
+        source: Path to input file, or binary stream (see sniff_input())
+
+    Returns:
+        Text file object
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if compression_suffix(os.fspath(source)):
+            source = open_binary(os.fspath(source))
+        else:
+            return open(source, "r", newline="", encoding="utf-8")
+    return io.TextIOWrapper(source, encoding="utf-8", newline="")
 
 
 def normalize_column_names(fieldnames):
@@ -176,13 +774,14 @@ def suggest_column_fix(wrong_name, valid_columns):
     return best_match
 
 
-def validate_columns(fieldnames):
+def validate_columns(fieldnames, required=None):
     """
     Validate that required columns are present in the CSV file.
     Case-insensitive matching with helpful error messages.
 
     Args:
         fieldnames: List of column names from CSV header
+        required: Optional set of required column names (default: REQUIRED_COLUMNS)
 
     Returns:
         Tuple of (is_valid, error_message, normalized_column_map)
@@ -194,7 +793,7 @@ def validate_columns(fieldnames):
     normalized = normalize_column_names(fieldnames)
 
     # Required columns
-    required = {"Title", "Book", "Page", "Description"}
+    required = REQUIRED_COLUMNS if required is None else set(required)
 
     # Check what's present
     present = set(normalized.keys())
@@ -220,7 +819,7 @@ def validate_columns(fieldnames):
     suggestions = []
     for field in fieldnames:
         if field not in normalized.values():  # This column wasn't recognized
-            suggestion = suggest_column_fix(field, list(required))
+            suggestion = suggest_column_fix(field, sorted(required))
             if suggestion:
                 suggestions.append(f"  '{field}' → Did you mean '{suggestion}'?")
 
@@ -236,270 +835,1115 @@ def validate_columns(fieldnames):
     return False, "\n".join(error_parts), {}
 
 
-def read_csv_data(filename):
+# One index entry. A tuple subclass: it indexes and unpacks like the original
+# 5-element lists but is smaller and immutable, so repeated values can be shared
+Entry = namedtuple("Entry", ["title_upper", "description", "page", "book", "course"])
+
+
+def hash_entry_key(title_upper, book, page, course):
     """
-    Read and parse CSV/TSV file into index entries.
+    Hash a duplicate key to a 64-bit integer.
 
-    Args:
-        filename: Path to CSV/TSV file with columns: Title, Description, Page, Book, Course (optional)
+    Unlike hash(), the value is the same in every process, so keys from
+    worker processes and different files can be compared.
 
     Returns:
-        Tuple of (index_data, has_course_column)
-            - index_data: List of [title_upper, description, page, book, course]
-            - has_course_column: Boolean indicating if Course column present
-
-    Raises:
-        FileNotFoundError: If input file doesn't exist
-        csv.Error: If CSV parsing fails
-        ValueError: If required columns are missing
+        int: BLAKE2b-64 digest of the key
     """
-    index = []
-    empty_title_count = 0
-    duplicate_tracker = defaultdict(list)
-    has_course_column = False
+    data = "\x1f".join((title_upper, book, page, course)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
 
-    # Auto-detect delimiter
-    delimiter = detect_delimiter(filename)
-
-    # Use newline='' for cross-platform CSV compatibility (Mac/Windows/Linux)
-    with open(filename, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f, delimiter=delimiter)
 
-        # Validate required columns are present
-        if reader.fieldnames:
-            is_valid, error_msg, column_map = validate_columns(reader.fieldnames)
-            if not is_valid:
-                raise ValueError(error_msg)
+class ReadSummary:
+    """
+    Statistics and diagnostics collected while streaming entries from an input file.
+
+    The streaming readers (iter_*_data) fill this in as entries are yielded, so
+    the caller can report empty titles and duplicates once the stream is
+    exhausted without the reader holding on to the entries.
+
+    Attributes:
+        has_course_column: True once a Course column has been detected
+        entry_count: Number of entries yielded so far
+        empty_title_count: Number of rows skipped for having an empty title
+        duplicate_tracker: Maps duplicate keys to the row/entry they appear on, or to a
+            list of rows once a key repeats (see iter_locations())
+        location_label: How locations are described in reports ('rows', 'entries' or 'lines')
+        hash_keys: Track duplicate keys as 64-bit hashes (see hash_entry_key()) instead of
+            (title, book, page[, course]) tuples; only repeated keys keep a readable label
+    """
 
-            # Check if optional Course column is present
-            has_course_column = "Course" in column_map
-            if has_course_column:
-                print("Info: Course column detected (GSE mode)", file=sys.stderr)
+    def __init__(self, hash_keys=False):
+        self.has_course_column = False
+        self.entry_count = 0
+        self.empty_title_count = 0
+        self.duplicate_tracker = {}
+        self.location_label = "rows"
+        self.hash_keys = hash_keys
+        self._key_labels = {}
+        # Page/Book/Course take few distinct values: entries share one string per value
+        self._shared_values = {}
+
+    def key(self, title_upper, book, page, course):
+        """Return the duplicate_tracker key of an entry."""
+        if self.hash_keys:
+            return hash_entry_key(title_upper, book, page, course)
+        return (title_upper, book, page, course) if self.has_course_column else (title_upper, book, page)
+
+    def key_label(self, key):
+        """Return the readable (title, book, page[, course]) tuple of a key, or None if it was not kept."""
+        return self._key_labels.get(key) if self.hash_keys else key
+
+    def record(self, title_upper, description, page, book, course, location):
+        """
+        Count an entry and track it for duplicate detection.
+
+        Args:
+            title_upper: Uppercase entry title
+            description: Entry description
+            page: Page number
+            book: Book identifier
+            course: Course identifier (empty string without a Course column)
+            location: Row or entry number the entry was read from
+
+        Returns:
+            The index Entry
+        """
+        shared = self._shared_values
+        page = shared.setdefault(page, page)
+        book = shared.setdefault(book, book)
+        course = shared.setdefault(course, course)
+
+        # Track duplicates (same title, book, page, course)
+        dup_key = self.key(title_upper, book, page, course)
+        # Most keys occur once: store the bare location and only switch to a list on repeats
+        tracker = self.duplicate_tracker
+        previous = tracker.get(dup_key)
+        if previous is None:
+            tracker[dup_key] = location
+        elif type(previous) is list:
+            previous.append(location)
+        else:
+            tracker[dup_key] = [previous, location]
+            if self.hash_keys:
+                label = (title_upper, book, page, course) if self.has_course_column else (title_upper, book, page)
+                self._key_labels[dup_key] = label
+        self.entry_count += 1
+
+        return Entry(title_upper, description, page, book, course)
+
+    def iter_locations(self):
+        """Yield (key, list of locations) for every tracked key, in first-seen order."""
+        for key, locations in self.duplicate_tracker.items():
+            yield key, locations if type(locations) is list else [locations]
+
+    def duplicates(self):
+        """Return the tracked keys that occur more than once, mapped to their locations."""
+        return {self.key_label(k): v for k, v in self.duplicate_tracker.items() if type(v) is list}
+
+    def merge(self, other, offset=0, entries=()):
+        """
+        Add the statistics of the following part of the same input (e.g. a parsed chunk).
+
+        Args:
+            other: ReadSummary of the next part of the input
+            offset: Added to the locations (row numbers) tracked by other
+            entries: Entries recorded in other; with hash_keys, they provide the labels
+                of keys that occur once in each part
+        """
+        self.entry_count += other.entry_count
+        self.empty_title_count += other.empty_title_count
+        if self.hash_keys:
+            self._key_labels.update(other._key_labels)
+
+        tracker = self.duplicate_tracker
+        unlabeled = set()
+        for key, locations in other.iter_locations():
+            locations = [location + offset for location in locations]
+            previous = tracker.get(key)
+            if previous is None:
+                tracker[key] = locations if len(locations) > 1 else locations[0]
+            elif type(previous) is list:
+                previous.extend(locations)
+            else:
+                tracker[key] = [previous, *locations]
+                if self.hash_keys and key not in self._key_labels:
+                    unlabeled.add(key)
+
+        for title_upper, _, page, book, course in entries if unlabeled else ():
+            key = self.key(title_upper, book, page, course)
+            if key in unlabeled:
+                label = (title_upper, book, page, course) if self.has_course_column else (title_upper, book, page)
+                self._key_labels[key] = label
+                unlabeled.discard(key)
+                if not unlabeled:
+                    break
+
+    def report(self):
+        """Report empty-title statistics and duplicate warnings (see diagnostic())."""
+        if self.empty_title_count > 0:
+            diagnostic(f"Info: Skipped {self.empty_title_count} entries with empty titles")
+
+        duplicates = self.duplicates()
+        if not duplicates:
+            return
+
+        where = {"rows": "on rows", "entries": "in entries", "lines": "on lines"}[self.location_label]
+        diagnostic(f"Warning: Found {len(duplicates)} duplicate entries:")
+        for dup_key, locations in list(duplicates.items())[:5]:  # Show first 5
+            locations_str = ", ".join(map(str, locations))
+            if self.has_course_column:
+                title, book, page, course = dup_key
+                diagnostic(f"  - '{title}' (Book: {book}, Course: {course}, Page: {page}) {where}: {locations_str}")
+            else:
+                title, book, page = dup_key
+                diagnostic(f"  - '{title}' (Book: {book}, Page: {page}) {where}: {locations_str}")
+        if len(duplicates) > 5:
+            diagnostic(f"  ... and {len(duplicates) - 5} more duplicates")
 
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is line 1)
-            try:
-                # Use case-insensitive column access via normalized map
-                # Get the actual column name from user's file
-                title_col = column_map.get("Title", "Title")
-                desc_col = column_map.get("Description", "Description")
-                page_col = column_map.get("Page", "Page")
-                book_col = column_map.get("Book", "Book")
-                course_col = column_map.get("Course", "Course")
-
-                # Extract values
-                title = row.get(title_col, "").strip()
-                description = row.get(desc_col, "").strip()
-                page = row.get(page_col, "").strip()
-                book = row.get(book_col, "").strip()
-                course = row.get(course_col, "").strip() if has_course_column else ""
-
-                # Skip entries with empty titles but warn user
-                if not title:
-                    empty_title_count += 1
-                    continue
 
-                # Track duplicates (same title, book, page, course)
-                dup_key = (title.upper(), book, page, course) if has_course_column else (title.upper(), book, page)
-                duplicate_tracker[dup_key].append(row_num)
-
-                # Store with uppercase title for sorting, original values for display
-                index.append(
-                    [
-                        title.upper(),  # For case-insensitive sorting
-                        description,
-                        page,
-                        book,
-                        course,  # Will be empty string if no Course column
-                    ]
-                )
+class _TimedReadSummary(ReadSummary):
+    """ReadSummary that times record() (counting and duplicate tracking) as its own stage."""
 
-            except KeyError as e:
-                # Handle missing column
-                print(f"Warning: Missing column {e} in row {row_num}, skipping", file=sys.stderr)
-                continue
-            except Exception as e:
-                # Handle other parsing errors
-                print(f"Warning: Error parsing row {row_num}: {e}, skipping", file=sys.stderr)
-                continue
+    def __init__(self, stats, hash_keys=False):
+        super().__init__(hash_keys)
+        self._stats = stats
+        self._timing = stats.timing("track duplicates")
 
-    # Report statistics
-    if empty_title_count > 0:
-        print(f"Info: Skipped {empty_title_count} entries with empty titles", file=sys.stderr)
+    def record(self, *args):
+        start = time.perf_counter()
+        entry = super().record(*args)
+        self._stats.add(self._timing, time.perf_counter() - start, 1)
+        return entry
 
-    # Report duplicates
-    duplicates = {k: v for k, v in duplicate_tracker.items() if len(v) > 1}
-    if duplicates:
-        print(f"Warning: Found {len(duplicates)} duplicate entries:", file=sys.stderr)
-        for dup_key, rows in list(duplicates.items())[:5]:  # Show first 5
-            if has_course_column:
-                title, book, page, course = dup_key
-                print(
-                    f"  - '{title}' (Book: {book}, Course: {course}, Page: {page}) on rows: {', '.join(map(str, rows))}",  # noqa: E501
-                    file=sys.stderr,
-                )
-            else:
-                title, book, page = dup_key
-                print(
-                    f"  - '{title}' (Book: {book}, Page: {page}) on rows: {', '.join(map(str, rows))}", file=sys.stderr
-                )
-        if len(duplicates) > 5:
-            print(f"  ... and {len(duplicates) - 5} more duplicates", file=sys.stderr)
 
-    return index, has_course_column
+def new_read_summary(hash_keys=False):
+    """Return a ReadSummary for a reader; with record_stats() active, its duplicate tracking is timed."""
+    stats = _stats.get()
+    return ReadSummary(hash_keys) if stats is None else _TimedReadSummary(stats, hash_keys)
 
 
-def read_excel_data(filename):
+def _csv_columns(fieldnames, summary):
     """
-    Read and parse Excel file (.xlsx) into index entries.
+    Validate the header fields of a CSV/TSV file.
 
     Args:
-        filename: Path to Excel file (.xlsx)
+        fieldnames: Header fields (None for an empty file)
+        summary: ReadSummary; has_course_column is set from the header
 
     Returns:
-        Tuple of (index_data, has_course_column)
-            - index_data: List of [title_upper, description, page, book, course]
-            - has_course_column: Boolean indicating if Course column present
+        Tuple of the file's (Title, Description, Page, Book, Course) column names
 
     Raises:
-        ImportError: If openpyxl not installed
-        ValueError: If required columns missing or validation fails
-        Exception: If Excel file cannot be read
+        ValueError: If required columns are missing
     """
-    # Try to import openpyxl with helpful error message
-    try:
-        from openpyxl import load_workbook
-    except ImportError:
-        raise ImportError(
-            "Excel file support requires the 'openpyxl' library.\n"
-            "Install with: pip install openpyxl\n\n"
-            "Alternatively, export your Excel file to CSV format."
-        )
+    column_map = {}
 
-    # Load Excel workbook (read-only mode for performance)
-    try:
-        wb = load_workbook(filename, read_only=True, data_only=True)
-        ws = wb.active  # Use first/active worksheet
-    except Exception as e:
-        raise ValueError(f"Unable to read Excel file: {e}")
+    # Validate required columns are present
+    if fieldnames:
+        is_valid, error_msg, column_map = validate_columns(fieldnames)
+        if not is_valid:
+            raise ValueError(error_msg)
 
-    # Read headers from first row
-    headers_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), None)
-    if not headers_row:
-        raise ValueError("Excel file appears to be empty (no header row)")
+        # Check if optional Course column is present
+        summary.has_course_column = "Course" in column_map
+        if summary.has_course_column:
+            diagnostic("Info: Course column detected (GSE mode)")
 
-    # Convert headers to strings, filter out None values
-    headers = [str(h).strip() if h is not None else "" for h in headers_row]
-    headers = [h for h in headers if h]  # Remove empty strings
+    # Use case-insensitive column access via normalized map
+    # Get the actual column name from user's file
+    return tuple(column_map.get(name, name) for name in ("Title", "Description", "Page", "Book", "Course"))
 
-    # Validate columns using existing validation logic
-    is_valid, error_msg, column_map = validate_columns(headers)
-    if not is_valid:
-        raise ValueError(error_msg)
 
-    # Check if optional Course column is present
-    has_course_column = "Course" in column_map
-    if has_course_column:
-        print("Info: Course column detected (GSE mode)", file=sys.stderr)
-
-    # Get column indices for required fields
-    title_idx = headers.index(column_map.get("Title", "Title"))
-    desc_idx = headers.index(column_map.get("Description", "Description"))
-    page_idx = headers.index(column_map.get("Page", "Page"))
-    book_idx = headers.index(column_map.get("Book", "Book"))
-    course_idx = headers.index(column_map.get("Course", "Course")) if has_course_column else None
-
-    # Parse data rows
-    index = []
-    empty_title_count = 0
-    duplicate_tracker = defaultdict(list)
-
-    for row_num, row_values in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-        try:
-            # Handle empty rows or rows shorter than expected
-            if not row_values or all(v is None or str(v).strip() == "" for v in row_values):
-                continue
+def _print_row_warning(row_num, prefix, suffix):
+    """Report a skipped-row warning (see diagnostic())."""
+    diagnostic(f"{prefix}{row_num}{suffix}")
 
-            # Extract values, converting None to empty string
-            def get_cell_value(idx):
-                if idx < len(row_values) and row_values[idx] is not None:
-                    return str(row_values[idx]).strip()
-                return ""
 
-            title = get_cell_value(title_idx)
-            description = get_cell_value(desc_idx)
-            page = get_cell_value(page_idx)
-            book = get_cell_value(book_idx)
-            course = get_cell_value(course_idx) if course_idx is not None else ""
+def _iter_csv_entries(reader, columns, summary, warn=_print_row_warning, first_row=2):
+    """
+    Turn csv.DictReader rows into entries (shared by the serial and chunk-parallel readers).
 
-            # Skip entries with empty titles
+    Args:
+        reader: csv.DictReader over the data rows
+        columns: Column names as returned by _csv_columns()
+        summary: ReadSummary collecting statistics and duplicates
+        warn: Called as warn(row_num, prefix, suffix) for every skipped row
+        first_row: Row number of the first data row
+
+    Yields:
+        Index entries (Entry: title_upper, description, page, book, course)
+    """
+    title_col, desc_col, page_col, book_col, course_col = columns
+    has_course_column = summary.has_course_column
+
+    for row_num, row in enumerate(reader, start=first_row):
+        try:
+            # Extract values
+            title = row.get(title_col, "").strip()
+            description = row.get(desc_col, "").strip()
+            page = row.get(page_col, "").strip()
+            book = row.get(book_col, "").strip()
+            course = row.get(course_col, "").strip() if has_course_column else ""
+
+            # Skip entries with empty titles but warn user
             if not title:
-                empty_title_count += 1
+                summary.empty_title_count += 1
                 continue
 
-            # Track duplicates
-            dup_key = (title.upper(), book, page, course) if has_course_column else (title.upper(), book, page)
-            duplicate_tracker[dup_key].append(row_num)
-
-            # Store entry
-            index.append([title.upper(), description, page, book, course])  # For case-insensitive sorting
+            # Store with uppercase title for sorting, original values for display
+            entry = summary.record(title.upper(), description, page, book, course, row_num)
 
+        except KeyError as e:
+            # Handle missing column
+            warn(row_num, f"Warning: Missing column {e} in row ", ", skipping")
+            continue
         except Exception as e:
-            print(f"Warning: Error parsing Excel row {row_num}: {e}, skipping", file=sys.stderr)
+            # Handle other parsing errors
+            warn(row_num, "Warning: Error parsing row ", f": {e}, skipping")
             continue
 
-    # Close workbook
-    wb.close()
-
-    # Report statistics (reuse same logic as CSV)
-    if empty_title_count > 0:
-        print(f"Info: Skipped {empty_title_count} entries with empty titles", file=sys.stderr)
-
-    # Report duplicates
-    duplicates = {k: v for k, v in duplicate_tracker.items() if len(v) > 1}
-    if duplicates:
-        print(f"Warning: Found {len(duplicates)} duplicate entries:", file=sys.stderr)
-        for dup_key, rows in list(duplicates.items())[:5]:
-            if has_course_column:
-                title, book, page, course = dup_key
-                print(
-                    f"  - '{title}' (Book: {book}, Course: {course}, Page: {page}) on rows: {', '.join(map(str, rows))}",  # noqa: E501
-                    file=sys.stderr,
-                )
-            else:
-                title, book, page = dup_key
-                print(
-                    f"  - '{title}' (Book: {book}, Page: {page}) on rows: {', '.join(map(str, rows))}", file=sys.stderr
-                )
-        if len(duplicates) > 5:
-            print(f"  ... and {len(duplicates) - 5} more duplicates", file=sys.stderr)
-
-    return index, has_course_column
+        yield entry
 
 
-def read_json_data(filename):
+def iter_csv_data(filename, summary=None, jobs=1):
     """
-    Read and parse JSON file into index entries.
+    Stream index entries from a CSV/TSV file one row at a time.
+
+    The file is opened once; the delimiter is detected from the header line.
+    With jobs > 1, files of at least PARALLEL_CSV_MIN_SIZE bytes are parsed
+    in record-aligned chunks by a worker pool (see plan_csv_chunks()); the
+    entries, row numbers and warnings are the same as when parsed serially.
 
     Args:
-        filename: Path to JSON file
+        filename: Path to CSV/TSV file with columns: Title, Description, Page, Book, Course (optional),
+            or binary stream (see sniff_input())
+        summary: Optional ReadSummary collecting statistics and duplicates
+        jobs: Number of worker processes for large files (1 = in-process)
 
-    Returns:
-        Tuple of (index_data, has_course_column)
-            - index_data: List of [title_upper, description, page, book, course]
-            - has_course_column: Boolean indicating if Course column present
+    Yields:
+        Index entries (Entry: title_upper, description, page, book, course)
 
     Raises:
-        json.JSONDecodeError: If file is not valid JSON
-        ValueError: If JSON structure invalid or required fields missing
+        FileNotFoundError: If input file doesn't exist
+        csv.Error: If CSV parsing fails
+        ValueError: If required columns are missing
     """
-    # Load JSON file
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON format: {e}")
+    if summary is None:
+        summary = ReadSummary()
 
-    # Support two formats:
+    # Compressed files cannot be memory-mapped; they are decompressed serially
+    if jobs > 1 and isinstance(filename, (str, os.PathLike)) and not compression_suffix(os.fspath(filename)):
+        plan = plan_csv_chunks(filename)
+        if plan is not None:
+            yield from _iter_csv_chunks(filename, summary, jobs, *plan)
+            return
+
+    # Use newline='' for cross-platform CSV compatibility (Mac/Windows/Linux)
+    with open_text_input(filename) as f:
+        # Auto-detect delimiter from the header line, then hand it back to the reader
+        first_line = f.readline()
+        delimiter = delimiter_from_header(first_line)
+        reader = csv.DictReader(itertools.chain([first_line], f), delimiter=delimiter)
+        columns = _csv_columns(reader.fieldnames, summary)
+
+        yield from _iter_csv_entries(reader, columns, summary)
+
+
+def _record_patterns(delimiter, quotechar):
+    """
+    Compile the patterns used by _next_record_end() for one dialect.
+
+    Like the csv module, a quote character only opens a quoted field at the
+    start of a field (after a delimiter or a newline); elsewhere, e.g. in
+    '3.5" disk', it is an ordinary character.
+
+    Returns:
+        Tuple of (field-opening quote pattern, field-opening quote or newline pattern)
+    """
+    field_start = b"(?<![^\n" + re.escape(delimiter) + b"])" + re.escape(quotechar)
+    return re.compile(field_start), re.compile(b"\n|" + field_start)
+
+
+def _closing_quote_end(data, position, quotechar):
+    """Return the offset just past the quote closing the quoted field that position is in, or -1."""
+    while True:
+        quote = data.find(quotechar, position)
+        if quote < 0:
+            return -1
+        if data[quote + 1 : quote + 2] != quotechar:
+            return quote + 1
+        position = quote + 2  # Doubled quote: a literal quote inside the field
+
+
+def _next_record_end(data, position, target, patterns, quotechar=b'"'):
+    """
+    Find the end of the first CSV record that ends at or after target.
+
+    A newline ends a record unless it is inside a quoted field; quoted fields
+    are followed from their opening quote (see _record_patterns()) to their
+    closing quote, so quotes inside unquoted fields do not count.
+
+    Args:
+        data: Buffer supporting find(), slicing and re (bytes or mmap)
+        position: Offset of a record start, at or before target
+        target: Offset the record must end at or after
+        patterns: _record_patterns() of the file's dialect
+
+    Returns:
+        Tuple of (offset just past the record's newline or len(data), False if a quoted field is unterminated)
+    """
+    field_quote, field_quote_or_newline = patterns
+    while True:
+        if position < target:
+            # Newlines before target do not matter; only quoted fields can carry the record past it
+            match = field_quote.search(data, position, target)
+            if match is None:
+                position = target
+                continue
+        else:
+            match = field_quote_or_newline.search(data, position)
+            if match is None:
+                return len(data), True
+            if match.group() == b"\n":
+                return match.end(), True
+        position = _closing_quote_end(data, match.end(), quotechar)
+        if position < 0:
+            return len(data), False
+
+
+def find_record_boundaries(data, start=0, chunk_size=PARALLEL_CSV_CHUNK_SIZE, delimiter=b",", quotechar=b'"'):
+    """
+    Split a CSV/TSV buffer into byte ranges of about chunk_size that end on record boundaries.
+
+    Quoted multi-line fields never straddle two ranges: quoted fields are
+    tracked from record start to record end the way the csv module reads
+    them (see _next_record_end()).
+
+    Args:
+        data: Buffer supporting find(), slicing and re (bytes or mmap)
+        start: Offset of the first record
+        chunk_size: Approximate range size in bytes
+        delimiter: Field delimiter byte
+
+    Returns:
+        Tuple of (ascending offsets from start to len(data), True if the quotes are balanced)
+    """
+    patterns = _record_patterns(delimiter, quotechar)
+    end = len(data)
+    offsets = [start]
+    position = start
+    balanced = True
+    while balanced and position < end:
+        position, balanced = _next_record_end(data, position, min(position + chunk_size, end), patterns, quotechar)
+        offsets.append(position)
+    return offsets, balanced
+
+
+def plan_csv_chunks(filename):
+    """
+    Prepare chunk-parallel parsing of a large CSV/TSV file.
+
+    The file is memory-mapped; the header record gives the delimiter and the
+    field names, and the remainder is split with find_record_boundaries().
+
+    Args:
+        filename: Path to CSV/TSV file
+
+    Returns:
+        Tuple of (offsets, delimiter, fieldnames), or None if the file is smaller than
+        PARALLEL_CSV_MIN_SIZE or its quotes are unbalanced (it is then parsed serially)
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size < PARALLEL_CSV_MIN_SIZE:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            first_line_end = data.find(b"\n")
+            if first_line_end < 0:
+                return None
+            # Reported below, once the file is known to be parsed in chunks (else the serial reader reports it)
+            with collect_diagnostics() as messages:
+                delimiter = delimiter_from_header(data[:first_line_end].decode("utf-8"))
+            header_end, _ = _next_record_end(data, 0, 0, _record_patterns(delimiter.encode(), b'"'))
+            offsets, balanced = find_record_boundaries(data, header_end, PARALLEL_CSV_CHUNK_SIZE, delimiter.encode())
+            header = data[:header_end].decode("utf-8")
+
+    if not balanced or len(offsets) < 3:
+        return None
+
+    for message in messages:
+        diagnostic(message)
+    fieldnames = next(csv.reader(io.StringIO(header, newline=""), delimiter=delimiter), None)
+    return offsets, delimiter, fieldnames
+
+
+def _parse_csv_chunk(filename, start, end, delimiter, fieldnames, columns, has_course_column, hash_keys):
+    """
+    Parse one record-aligned byte range of a CSV/TSV file (process pool worker).
+
+    Returns:
+        Tuple of (entries as plain tuples, ReadSummary with row numbers counted from 1 within
+        the chunk, skipped-row warnings as (row_num, prefix, suffix) tuples)
+    """
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode("utf-8")
+
+    summary = ReadSummary(hash_keys)
+    summary.has_course_column = has_course_column
+    reader = csv.DictReader(io.StringIO(text, newline=""), fieldnames, delimiter=delimiter)
+    warnings = []
+    warn = lambda *warning: warnings.append(warning)  # noqa: E731
+    # Plain tuples pickle about twice as fast as Entry named tuples
+    entries = [tuple(entry) for entry in _iter_csv_entries(reader, columns, summary, warn, first_row=1)]
+    return entries, summary, warnings
+
+
+def _iter_csv_chunks(filename, summary, jobs, offsets, delimiter, fieldnames):
+    """Yield the entries of a CSV/TSV file parsed chunk by chunk in a worker pool, in file order."""
+    columns = _csv_columns(fieldnames, summary)
+    chunks = len(offsets) - 1
+    last_row = 1  # Header row
+
+    with ProcessPoolExecutor(max_workers=min(jobs, chunks)) as executor:
+        results = executor.map(
+            _parse_csv_chunk,
+            itertools.repeat(filename, chunks),
+            offsets[:-1],
+            offsets[1:],
+            itertools.repeat(delimiter, chunks),
+            itertools.repeat(fieldnames, chunks),
+            itertools.repeat(columns, chunks),
+            itertools.repeat(summary.has_course_column, chunks),
+            itertools.repeat(summary.hash_keys, chunks),
+        )
+        for entries, chunk_summary, warnings in results:
+            for row_num, prefix, suffix in warnings:
+                _print_row_warning(last_row + row_num, prefix, suffix)
+            summary.merge(chunk_summary, last_row, entries)
+            # Every data row is an entry, an empty title or a warning
+            last_row += chunk_summary.entry_count + chunk_summary.empty_title_count + len(warnings)
+            yield from itertools.starmap(Entry, entries)
+
+
+def read_csv_data(filename):
+    """
+    Read and parse CSV/TSV file into index entries.
+
+    Args:
+        filename: Path to CSV/TSV file with columns: Title, Description, Page, Book, Course (optional)
+
+    Returns:
+        Tuple of (index_data, has_course_column)
+            - index_data: List of Entry (title_upper, description, page, book, course)
+            - has_course_column: Boolean indicating if Course column present
+
+    Raises:
+        FileNotFoundError: If input file doesn't exist
+        csv.Error: If CSV parsing fails
+        ValueError: If required columns are missing
+    """
+    summary = new_read_summary()
+    index = list(iter_csv_data(filename, summary))
+    summary.report()
+    return index, summary.has_course_column
+
+
+# SpreadsheetML namespaces used by the built-in XLSX reader
+XLSX_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+XLSX_DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+XLSX_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Bytes of worksheet XML fed to the parser at a time
+XLSX_READ_CHUNK_SIZE = 64 * 1024
+
+# Built-in number formats that openpyxl converts to dates/times
+XLSX_BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(27, 37)) | set(range(45, 48)) | set(range(50, 59))
+
+
+class _XlsxFallback(Exception):
+    """
+    Raised when a workbook needs openpyxl (date cells, strict OOXML, unusual layout).
+
+    Attributes:
+        row_num: Row at which openpyxl should take over (1 = whole sheet)
+    """
+
+    def __init__(self, row_num=1):
+        super().__init__(row_num)
+        self.row_num = row_num
+
+
+def _xlsx_column_index(ref):
+    """Convert a cell reference such as 'AB12' to a 0-based column index."""
+    col = 0
+    for ch in ref:
+        if "A" <= ch <= "Z":
+            col = col * 26 + ord(ch) - 64
+        else:
+            break
+    return col - 1
+
+
+def _xlsx_is_date_format(code):
+    """Check whether a custom number format code displays a date or time."""
+    # Ignore quoted literals, escaped characters and [Red]/[$-409] sections
+    code = re.sub(r'"[^"]*"|\\.|\[[^\]]*\]', "", code).lower()
+    return any(ch in code for ch in "dmyhs")
+
+
+def _read_xlsx_workbook(archive):
+    """
+    Read the sheet list of an open .xlsx archive.
+
+    Returns:
+        Tuple of (sheet elements in workbook order, index of the active sheet)
+
+    Raises:
+        _XlsxFallback: If the workbook is not transitional SpreadsheetML
+    """
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    if workbook.tag != f"{XLSX_MAIN_NS}workbook":
+        raise _XlsxFallback()  # Strict OOXML or another dialect
+
+    sheets = workbook.findall(f"{XLSX_MAIN_NS}sheets/{XLSX_MAIN_NS}sheet")
+    if not sheets:
+        raise _XlsxFallback()
+    view = workbook.find(f"{XLSX_MAIN_NS}bookViews/{XLSX_MAIN_NS}workbookView")
+    active = int(view.get("activeTab", 0)) if view is not None else 0
+    return sheets, active
+
+
+class _XlsxSheetReader:
+    """
+    Minimal streaming reader for one worksheet of an .xlsx workbook.
+
+    Uses zipfile and incremental XML parsing instead of openpyxl: shared
+    strings are loaded once, the sheet XML is streamed row by row and only
+    the requested columns are decoded. Anything it does not handle raises
+    _XlsxFallback so the caller can switch to openpyxl.
+    """
+
+    def __init__(self, filename, sheet_name=None):
+        try:
+            self.archive = zipfile.ZipFile(filename)
+        except (OSError, zipfile.BadZipFile):
+            raise _XlsxFallback()
+
+        try:
+            self.sheet_path = self._find_sheet(sheet_name)
+            self.shared_strings = self._read_shared_strings()
+            self.date_styles = self._read_date_styles()
+            self.column_cache = {}
+        except _XlsxFallback:
+            self.archive.close()
+            raise
+        except (KeyError, IndexError, ValueError, ET.ParseError):
+            self.archive.close()
+            raise _XlsxFallback()
+
+    def close(self):
+        """Close the underlying zip archive."""
+        self.archive.close()
+
+    def _find_sheet(self, sheet_name):
+        """Resolve the worksheet part: the named sheet, or the active one."""
+        sheets, active = _read_xlsx_workbook(self.archive)
+        if sheet_name is None:
+            sheet = sheets[active] if active < len(sheets) else sheets[0]
+        else:
+            matches = [sheet for sheet in sheets if sheet.get("name") == sheet_name]
+            if not matches:
+                raise ValueError(f"Worksheet '{sheet_name}' not found")
+            sheet = matches[0]
+        self.sheet_name = sheet.get("name")
+
+        rel_id = sheet.get(f"{XLSX_DOC_REL_NS}id")
+        rels = ET.fromstring(self.archive.read("xl/_rels/workbook.xml.rels"))
+        for rel in rels.iter(f"{XLSX_PKG_REL_NS}Relationship"):
+            if rel.get("Id") == rel_id:
+                target = rel.get("Target")
+                # Targets are relative to xl/ unless absolute within the package
+                return target.lstrip("/") if target.startswith("/") else posixpath.normpath(f"xl/{target}")
+        raise _XlsxFallback()
+
+    def _read_shared_strings(self):
+        """Load the shared string table (concatenating rich text runs)."""
+        try:
+            source = self.archive.open("xl/sharedStrings.xml")
+        except KeyError:
+            return []
+
+        si_tag = f"{XLSX_MAIN_NS}si"
+        t_tag = f"{XLSX_MAIN_NS}t"
+        run_text = f"{XLSX_MAIN_NS}r/{XLSX_MAIN_NS}t"
+        strings = []
+        with source:
+            for _, elem in ET.iterparse(source):
+                if elem.tag == si_tag:
+                    text = elem.findtext(t_tag)
+                    if text is None:
+                        text = "".join(node.text or "" for node in elem.iterfind(run_text))
+                    strings.append(text)
+                    elem.clear()
+        return strings
+
+    def _read_date_styles(self):
+        """Return the cell style indexes whose number format is a date or time."""
+        try:
+            styles = ET.fromstring(self.archive.read("xl/styles.xml"))
+        except KeyError:
+            return frozenset()
+
+        custom = {
+            int(fmt.get("numFmtId")): fmt.get("formatCode", "")
+            for fmt in styles.iterfind(f"{XLSX_MAIN_NS}numFmts/{XLSX_MAIN_NS}numFmt")
+        }
+        date_styles = set()
+        for index, xf in enumerate(styles.iterfind(f"{XLSX_MAIN_NS}cellXfs/{XLSX_MAIN_NS}xf")):
+            fmt_id = int(xf.get("numFmtId", 0))
+            if fmt_id in XLSX_BUILTIN_DATE_FORMATS or (fmt_id in custom and _xlsx_is_date_format(custom[fmt_id])):
+                date_styles.add(str(index))
+        return frozenset(date_styles)
+
+    def iter_rows(self, wanted=None):
+        """
+        Stream worksheet rows.
+
+        Args:
+            wanted: Optional set of 0-based column indexes to decode; other
+                non-blank cells are reported as True (enough for blank-row checks)
+
+        Yields:
+            Tuple of (row_num, row_values) with openpyxl-compatible values
+            (str, int, float, bool or None), indexed by column
+
+        Raises:
+            _XlsxFallback: On a cell openpyxl would convert to a date/time
+        """
+        # expat callbacks are far cheaper than building an ElementTree node
+        # per cell, so collect raw (ref, type, style, text) cells per row.
+        # Namespace processing is skipped; sheets that use a prefixed or
+        # foreign namespace are left to openpyxl.
+        main_ns = XLSX_MAIN_NS[1:-1]
+        raw_rows = []
+        raw_cells = []
+        cell = []
+        text = []
+        state = {"row": None, "collect": False, "phonetic": False, "root": True}
+
+        def start(tag, attrs):
+            if tag == "c":
+                cell[:] = (attrs.get("r"), attrs.get("t", "n"), attrs.get("s"), False)
+                text.clear()
+            elif tag == "v" or (tag == "t" and not state["phonetic"]):
+                state["collect"] = True
+            elif tag == "is":
+                cell[3] = True
+            elif tag == "row":
+                state["row"] = attrs.get("r")
+                raw_cells.clear()
+            elif tag == "rPh":
+                state["phonetic"] = True
+            elif state["root"]:
+                if tag != "worksheet" or attrs.get("xmlns") != main_ns:
+                    raise _XlsxFallback()
+                state["root"] = False
+
+        def end(tag):
+            if tag == "c":
+                raw_cells.append((cell[0], cell[1], cell[2], "".join(text) if cell[3] else ("".join(text) or None)))
+            elif tag == "v" or tag == "t":
+                state["collect"] = False
+            elif tag == "row":
+                raw_rows.append((state["row"], raw_cells[:]))
+            elif tag == "rPh":
+                state["phonetic"] = False
+
+        def data(chunk):
+            if state["collect"]:
+                text.append(chunk)
+
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = data
+
+        row_num = 0
+        with self.archive.open(self.sheet_path) as source:
+            while True:
+                chunk = source.read(XLSX_READ_CHUNK_SIZE)
+                try:
+                    parser.Parse(chunk, not chunk)
+                except expat.ExpatError:
+                    raise _XlsxFallback(row_num + 1)
+                for row_ref, row_cells in raw_rows:
+                    row_num = int(row_ref) if row_ref else row_num + 1
+                    yield row_num, self._decode_row(row_num, row_cells, wanted)
+                raw_rows.clear()
+                if not chunk:
+                    break
+
+    def _decode_row(self, row_num, row_cells, wanted):
+        """Turn raw (ref, type, style, text) cells into a list of values indexed by column."""
+        shared_strings = self.shared_strings
+        column_cache = self.column_cache
+        cells = {}
+        position = -1
+        for ref, cell_type, style, text in row_cells:
+            if ref:
+                letters = ref.rstrip(string.digits)
+                position = column_cache.get(letters)
+                if position is None:
+                    position = column_cache[letters] = _xlsx_column_index(letters)
+            else:
+                position += 1
+            if text is None:
+                continue
+
+            if wanted is not None and position not in wanted:
+                # Only blankness matters for columns we do not extract
+                if cell_type == "s":
+                    text = shared_strings[int(text)]
+                cells[position] = True if text.strip() else None
+                continue
+
+            if cell_type == "s":
+                value = shared_strings[int(text)]
+            elif cell_type in ("inlineStr", "str", "e"):
+                value = text
+            elif cell_type == "b":
+                value = bool(int(text))
+            elif cell_type == "n":
+                if style in self.date_styles:
+                    raise _XlsxFallback(row_num)
+                value = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+            else:
+                raise _XlsxFallback(row_num)  # ISO 8601 date cells (t="d")
+            cells[position] = value
+
+        row_values = [None] * (max(cells) + 1) if cells else []
+        for position, value in cells.items():
+            row_values[position] = value
+        return row_values
+
+
+def _load_openpyxl_workbook(filename):
+    """
+    Open a workbook with openpyxl (read-only mode).
+
+    Raises:
+        ImportError: If openpyxl not installed
+        ValueError: If the workbook cannot be read
+    """
+    # Try to import openpyxl with helpful error message
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError(
+            "Excel file support requires the 'openpyxl' library.\n"
+            "Install with: pip install openpyxl\n\n"
+            "Alternatively, export your Excel file to CSV format."
+        )
+
+    # Load Excel workbook (read-only mode for performance)
+    try:
+        return load_workbook(filename, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Unable to read Excel file: {e}")
+
+
+def _iter_openpyxl_rows(filename, min_row=1, sheet_name=None):
+    """
+    Stream worksheet rows through openpyxl (read-only mode).
+
+    Args:
+        filename: Path to Excel file (.xlsx)
+        min_row: First row to yield
+        sheet_name: Worksheet to read (default: the active sheet)
+
+    Yields:
+        Tuple of (row_num, row_values)
+
+    Raises:
+        ImportError: If openpyxl not installed
+        ValueError: If the workbook or worksheet cannot be read
+    """
+    wb = _load_openpyxl_workbook(filename)
+    try:
+        if sheet_name is None:
+            ws = wb.active  # Use first/active worksheet
+        elif sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+        else:
+            raise ValueError(f"Worksheet '{sheet_name}' not found in {filename}")
+
+        yield from enumerate(ws.iter_rows(min_row=min_row, values_only=True), start=min_row)
+    finally:
+        # Close workbook
+        wb.close()
+
+
+def _iter_xlsx_data_rows(filename, sheet_reader, wanted):
+    """Stream data rows with the built-in reader, handing over to openpyxl if it bails out."""
+    try:
+        for row_num, row_values in sheet_reader.iter_rows(wanted):
+            if row_num > 1:
+                yield row_num, row_values
+    except _XlsxFallback as e:
+        yield from _iter_openpyxl_rows(filename, min_row=max(e.row_num, 2), sheet_name=sheet_reader.sheet_name)
+
+
+def _open_xlsx_sheet(filename, sheet_name=None):
+    """
+    Open a worksheet with the built-in reader and read its first row.
+
+    Returns:
+        Tuple of (_XlsxSheetReader, first_row), or (None, None) if openpyxl is needed
+    """
+    try:
+        sheet_reader = _XlsxSheetReader(filename, sheet_name)
+    except _XlsxFallback:
+        return None, None
+
+    rows = sheet_reader.iter_rows()
+    try:
+        return sheet_reader, next(rows, None)
+    except _XlsxFallback:
+        sheet_reader.close()
+        return None, None
+    except BaseException:
+        sheet_reader.close()
+        raise
+    finally:
+        rows.close()
+
+
+def _check_uncompressed_workbook(filename):
+    """Reject compressed workbooks (.xlsx.gz, ...): zipfile needs random access to the archive."""
+    if isinstance(filename, (str, os.PathLike)) and compression_suffix(os.fspath(filename)):
+        raise ValueError(
+            f"Compressed Excel workbooks are not supported: {filename}\n"
+            "An .xlsx file is a zip archive already; use the uncompressed workbook."
+        )
+
+
+def list_worksheets(filename):
+    """
+    List the worksheets of an Excel workbook.
+
+    Args:
+        filename: Path to Excel file (.xlsx)
+
+    Returns:
+        Tuple of (sheet names in workbook order, name of the active sheet)
+
+    Raises:
+        ImportError: If openpyxl is needed but not installed
+        ValueError: If the workbook cannot be read
+    """
+    _check_uncompressed_workbook(filename)
+    try:
+        with zipfile.ZipFile(filename) as archive:
+            sheets, active = _read_xlsx_workbook(archive)
+        names = [sheet.get("name") for sheet in sheets]
+        return names, names[active] if active < len(names) else names[0]
+    except (zipfile.BadZipFile, KeyError, ValueError, ET.ParseError, _XlsxFallback):
+        pass
+
+    wb = _load_openpyxl_workbook(filename)
+    try:
+        return list(wb.sheetnames), wb.active.title
+    finally:
+        wb.close()
+
+
+def select_worksheets(filename, sheets):
+    """
+    Resolve a worksheet selection against a workbook.
+
+    Args:
+        filename: Path to Excel file (.xlsx)
+        sheets: "all" for every worksheet, or an iterable of worksheet names
+
+    Returns:
+        List of worksheet names, in workbook order for "all" and as given otherwise
+
+    Raises:
+        ValueError: If a requested worksheet does not exist
+    """
+    names, _ = list_worksheets(filename)
+    if sheets == "all":
+        return names
+
+    selected = list(sheets)
+    missing = [name for name in selected if name not in names]
+    if missing:
+        raise ValueError(f"Worksheet '{missing[0]}' not found in {filename}\nAvailable worksheets: {', '.join(names)}")
+    return selected
+
+
+def _cell_text(row_values, idx):
+    """Get a cell as a stripped string, converting missing/None cells to ''."""
+    if idx < len(row_values) and row_values[idx] is not None:
+        return str(row_values[idx]).strip()
+    return ""
+
+
+def iter_excel_data(filename, summary=None, sheet_name=None, book_from_sheet=False):
+    """
+    Stream index entries from an Excel file (.xlsx) one row at a time.
+
+    The workbook is read with a built-in streaming reader (zipfile +
+    expat) that decodes only the Title/Description/Page/Book/Course
+    columns. Workbooks it cannot read faithfully (date-formatted cells,
+    strict OOXML, ...) fall back to openpyxl, from the affected row onward.
+
+    Args:
+        filename: Path to Excel file (.xlsx)
+        summary: Optional ReadSummary collecting statistics and duplicates
+        sheet_name: Worksheet to read (default: the active sheet)
+        book_from_sheet: If the sheet has no Book column, use the sheet name as Book
+
+    Yields:
+        Index entries (Entry: title_upper, description, page, book, course)
+
+    Raises:
+        ImportError: If openpyxl is needed but not installed
+        ValueError: If required columns missing or validation fails
+        Exception: If Excel file cannot be read
+    """
+    if summary is None:
+        summary = ReadSummary()
+    _check_uncompressed_workbook(filename)
+    if book_from_sheet and sheet_name is None:
+        sheet_name = list_worksheets(filename)[1]
+
+    sheet_reader, header = _open_xlsx_sheet(filename, sheet_name)
+    rows = None
+    if sheet_reader is None:
+        rows = _iter_openpyxl_rows(filename, sheet_name=sheet_name)
+        header = next(rows, None)
+
+    try:
+        # Read headers from first row
+        headers_row = header[1] if header is not None and header[0] == 1 else None
+        if not headers_row:
+            raise ValueError("Excel file appears to be empty (no header row)")
+
+        # Convert headers to strings; empty cells keep their column position
+        headers = [str(h).strip() if h is not None else "" for h in headers_row]
+
+        # Validate columns using existing validation logic
+        required = REQUIRED_COLUMNS - {"Book"} if book_from_sheet else REQUIRED_COLUMNS
+        is_valid, error_msg, column_map = validate_columns([h for h in headers if h], required)
+        if not is_valid:
+            raise ValueError(f"Worksheet '{sheet_name}': {error_msg}" if sheet_name is not None else error_msg)
+
+        # Check if optional Course column is present
+        summary.has_course_column = "Course" in column_map
+        if summary.has_course_column:
+            diagnostic("Info: Course column detected (GSE mode)")
+
+        # Get column indices for required fields
+        title_idx = headers.index(column_map.get("Title", "Title"))
+        desc_idx = headers.index(column_map.get("Description", "Description"))
+        page_idx = headers.index(column_map.get("Page", "Page"))
+        book_idx = headers.index(column_map["Book"]) if "Book" in column_map else None
+        course_idx = headers.index(column_map.get("Course", "Course")) if summary.has_course_column else None
+
+        if sheet_reader is not None:
+            wanted = {title_idx, desc_idx, page_idx, book_idx, course_idx} - {None}
+            rows = _iter_xlsx_data_rows(filename, sheet_reader, wanted)
+
+        # Parse data rows
+        for row_num, row_values in rows:
+            try:
+                # Handle empty rows or rows shorter than expected
+                if not row_values or all(v is None or str(v).strip() == "" for v in row_values):
+                    continue
+
+                # Extract values, converting None to empty string
+                title = _cell_text(row_values, title_idx)
+                description = _cell_text(row_values, desc_idx)
+                page = _cell_text(row_values, page_idx)
+                book = _cell_text(row_values, book_idx) if book_idx is not None else sheet_name
+                course = _cell_text(row_values, course_idx) if course_idx is not None else ""
+
+                # Skip entries with empty titles
+                if not title:
+                    summary.empty_title_count += 1
+                    continue
+
+                # Store entry (uppercase title for case-insensitive sorting)
+                entry = summary.record(title.upper(), description, page, book, course, row_num)
+
+            except Exception as e:
+                diagnostic(f"Warning: Error parsing Excel row {row_num}: {e}, skipping")
+                continue
+
+            yield entry
+
+    finally:
+        if rows is not None:
+            rows.close()
+        if sheet_reader is not None:
+            sheet_reader.close()
+
+
+def read_excel_data(filename):
+    """
+    Read and parse Excel file (.xlsx) into index entries.
+
+    Args:
+        filename: Path to Excel file (.xlsx)
+
+    Returns:
+        Tuple of (index_data, has_course_column)
+            - index_data: List of Entry (title_upper, description, page, book, course)
+            - has_course_column: Boolean indicating if Course column present
+
+    Raises:
+        ImportError: If openpyxl not installed
+        ValueError: If required columns missing or validation fails
+        Exception: If Excel file cannot be read
+    """
+    summary = new_read_summary()
+    index = list(iter_excel_data(filename, summary))
+    summary.report()
+    return index, summary.has_course_column
+
+
+def iter_json_data(filename, summary=None):
+    """
+    Stream index entries from a JSON file one entry at a time.
+
+    The JSON document itself is decoded with json.load(); entries are then
+    validated and normalized lazily as they are consumed.
+
+    Args:
+        filename: Path to JSON file, or binary stream (see sniff_input())
+        summary: Optional ReadSummary collecting statistics and duplicates
+
+    Yields:
+        Index entries (Entry: title_upper, description, page, book, course)
+
+    Raises:
+        json.JSONDecodeError: If file is not valid JSON
+        ValueError: If JSON structure invalid or required fields missing
+    """
+    if summary is None:
+        summary = ReadSummary()
+    summary.location_label = "entries"
+
+    # Load JSON file
+    try:
+        with open_text_input(filename) as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON format: {e}")
+
+    # Support two formats:
     # 1. {"entries": [...]} - wrapped format (recommended)
     # 2. [...] - direct array format
     if isinstance(data, dict):
@@ -512,288 +1956,3702 @@ def read_json_data(filename):
     elif isinstance(data, list):
         entries = data
     else:
-        raise ValueError("JSON must be either an object with 'entries' key or an array of entries")
+        raise ValueError("JSON must be either an object with 'entries' key or an array of entries")
+
+    if not entries:
+        raise ValueError("JSON file contains no entries")
+
+    if not isinstance(entries, list):
+        raise ValueError("Entries must be an array/list")
+
+    # Validate first entry has required fields
+    if not entries or not isinstance(entries[0], dict):
+        raise ValueError("Each entry must be a JSON object with Title, Description, Page, Book fields")
+
+    # Get field names from first entry (case-insensitive)
+    first_entry = entries[0]
+    fieldnames = list(first_entry.keys())
+
+    # Validate columns using existing validation logic
+    is_valid, error_msg, column_map = validate_columns(fieldnames)
+    if not is_valid:
+        raise ValueError(error_msg)
+
+    # Check if optional Course column is present
+    summary.has_course_column = "Course" in column_map
+    if summary.has_course_column:
+        diagnostic("Info: Course column detected (GSE mode)")
+
+    has_course_column = summary.has_course_column
+
+    # Get actual field names from user's JSON
+    title_field = column_map.get("Title", "Title")
+    desc_field = column_map.get("Description", "Description")
+    page_field = column_map.get("Page", "Page")
+    book_field = column_map.get("Book", "Book")
+    course_field = column_map.get("Course", "Course")
+
+    # Parse entries
+    for entry_num, entry in enumerate(entries, start=1):
+        try:
+            if not isinstance(entry, dict):
+                diagnostic(f"Warning: Entry {entry_num} is not a JSON object, skipping")
+                continue
+
+            # Extract values (case-insensitive field access via column_map)
+            title = str(entry.get(title_field, "")).strip()
+            description = str(entry.get(desc_field, "")).strip()
+            page = str(entry.get(page_field, "")).strip()
+            book = str(entry.get(book_field, "")).strip()
+            course = str(entry.get(course_field, "")).strip() if has_course_column else ""
+
+            # Skip entries with empty titles
+            if not title:
+                summary.empty_title_count += 1
+                continue
+
+            # Store entry (uppercase title for case-insensitive sorting)
+            index_entry = summary.record(title.upper(), description, page, book, course, entry_num)
+
+        except Exception as e:
+            diagnostic(f"Warning: Error parsing JSON entry {entry_num}: {e}, skipping")
+            continue
+
+        yield index_entry
+
+
+def read_json_data(filename):
+    """
+    Read and parse JSON file into index entries.
+
+    Args:
+        filename: Path to JSON file
+
+    Returns:
+        Tuple of (index_data, has_course_column)
+            - index_data: List of Entry (title_upper, description, page, book, course)
+            - has_course_column: Boolean indicating if Course column present
+
+    Raises:
+        json.JSONDecodeError: If file is not valid JSON
+        ValueError: If JSON structure invalid or required fields missing
+    """
+    summary = new_read_summary()
+    index = list(iter_json_data(filename, summary))
+    summary.report()
+    return index, summary.has_course_column
+
+
+def iter_jsonl_data(filename, summary=None):
+    """
+    Stream index entries from a JSON Lines (.jsonl/.ndjson) file, one line at a time.
+
+    Each non-blank line holds one JSON object. Columns are validated from the
+    first object (case-insensitive, via validate_columns()); lines that are
+    not valid JSON objects are reported with their line number and skipped.
+    Memory use does not grow with the file size.
+
+    Args:
+        filename: Path to JSON Lines file, or binary stream (see sniff_input())
+        summary: Optional ReadSummary collecting statistics and duplicates
+
+    Yields:
+        Index entries (Entry: title_upper, description, page, book, course)
+
+    Raises:
+        ValueError: If the file has no entries or required fields are missing
+    """
+    if summary is None:
+        summary = ReadSummary()
+    summary.location_label = "lines"
+
+    column_map = None
+    has_course_column = False
+
+    with open_text_input(filename) as f:
+        for line_num, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                diagnostic(f"Warning: Invalid JSON on line {line_num}: {e}, skipping")
+                continue
+
+            if not isinstance(entry, dict):
+                diagnostic(f"Warning: Line {line_num} is not a JSON object, skipping")
+                continue
+
+            if column_map is None:
+                # Validate columns from the first object using existing validation logic
+                is_valid, error_msg, column_map = validate_columns(list(entry.keys()))
+                if not is_valid:
+                    raise ValueError(error_msg)
+
+                # Check if optional Course column is present
+                has_course_column = summary.has_course_column = "Course" in column_map
+                if has_course_column:
+                    diagnostic("Info: Course column detected (GSE mode)")
+
+                # Get actual field names from user's JSON
+                title_field = column_map.get("Title", "Title")
+                desc_field = column_map.get("Description", "Description")
+                page_field = column_map.get("Page", "Page")
+                book_field = column_map.get("Book", "Book")
+                course_field = column_map.get("Course", "Course")
+
+            try:
+                # Extract values (case-insensitive field access via column_map)
+                title = str(entry.get(title_field, "")).strip()
+                description = str(entry.get(desc_field, "")).strip()
+                page = str(entry.get(page_field, "")).strip()
+                book = str(entry.get(book_field, "")).strip()
+                course = str(entry.get(course_field, "")).strip() if has_course_column else ""
+
+                # Skip entries with empty titles
+                if not title:
+                    summary.empty_title_count += 1
+                    continue
+
+                # Store entry (uppercase title for case-insensitive sorting)
+                index_entry = summary.record(title.upper(), description, page, book, course, line_num)
+
+            except Exception as e:
+                diagnostic(f"Warning: Error parsing JSON line {line_num}: {e}, skipping")
+                continue
+
+            yield index_entry
+
+    if column_map is None:
+        raise ValueError("JSON Lines file contains no entries")
+
+
+def read_jsonl_data(filename):
+    """
+    Read and parse JSON Lines file into index entries.
+
+    Args:
+        filename: Path to JSON Lines file (.jsonl/.ndjson)
+
+    Returns:
+        Tuple of (index_data, has_course_column)
+            - index_data: List of Entry (title_upper, description, page, book, course)
+            - has_course_column: Boolean indicating if Course column present
+
+    Raises:
+        ValueError: If the file has no entries or required fields are missing
+    """
+    summary = new_read_summary()
+    index = list(iter_jsonl_data(filename, summary))
+    summary.report()
+    return index, summary.has_course_column
+
+
+def iter_input_file(filename, summary=None, sheet_name=None, book_from_sheet=False, jobs=1):
+    """
+    Stream entries from an input file in any supported format (CSV/TSV/Excel/JSON/JSONL).
+
+    Streaming counterpart of read_input_file(): entries are yielded one at a
+    time and statistics accumulate in the summary, which the caller reports
+    once the stream is exhausted.
+
+    Args:
+        filename: Path to input file, or '-' for stdin (format detected from the content)
+        summary: Optional ReadSummary collecting statistics and duplicates
+        sheet_name: Excel only - worksheet to read (default: the active sheet)
+        book_from_sheet: Excel only - fill a missing Book column from the sheet name
+        jobs: CSV/TSV only - worker processes for chunk-parallel parsing of large files
+
+    Yields:
+        Index entries (Entry: title_upper, description, page, book, course)
+
+    Raises:
+        ValueError: If format unsupported or file invalid
+        FileNotFoundError: If file doesn't exist
+    """
+    if filename == STDIN_PATH:
+        # Detect the format from the content; a workbook's zip directory is at
+        # its end, so stdin is buffered in memory for Excel only
+        file_format, filename = sniff_input(sys.stdin.buffer)
+        if file_format == "excel":
+            filename = io.BytesIO(filename.read())
+    else:
+        # Detect file format from extension
+        file_format = detect_file_format(filename)
+
+    # Dispatch to appropriate streaming reader
+    readers = {
+        "csv": iter_csv_data,
+        "tsv": iter_csv_data,  # Same handler as CSV
+        "excel": iter_excel_data,
+        "json": iter_json_data,
+        "jsonl": iter_jsonl_data,
+    }
+
+    reader = readers[file_format]
+    if file_format == "excel":
+        return reader(filename, summary, sheet_name, book_from_sheet)
+    if file_format in ("csv", "tsv"):
+        return reader(filename, summary, jobs)
+    return reader(filename, summary)
+
+
+def read_input_file(filename):
+    """
+    Read input file in any supported format (CSV/TSV/Excel/JSON/JSONL).
+    Unified entry point that dispatches to format-specific readers.
+
+    Args:
+        filename: Path to input file
+
+    Returns:
+        Tuple of (index_data, has_course_column)
+            - index_data: List of Entry (title_upper, description, page, book, course)
+            - has_course_column: Boolean indicating if Course column present
+
+    Raises:
+        ValueError: If format unsupported or file invalid
+        FileNotFoundError: If file doesn't exist
+    """
+    # Detect file format from extension
+    file_format = detect_file_format(filename)
+
+    # Dispatch to appropriate reader
+    readers = {
+        "csv": read_csv_data,
+        "tsv": read_csv_data,  # Same handler as CSV
+        "excel": read_excel_data,
+        "json": read_json_data,
+        "jsonl": read_jsonl_data,
+    }
+
+    reader = readers[file_format]
+    with timed_stage("read") as timing:
+        entries, has_course = reader(filename)
+        timing.rows += len(entries)
+    return entries, has_course
+
+
+def expand_input_paths(paths):
+    """
+    Expand input paths into a list of input files.
+
+    Directories are searched recursively (in sorted order) for files with a
+    supported extension; hidden files and Excel lock files ('~$...') are
+    skipped. Other paths are passed through unchanged.
+
+    Args:
+        paths: Iterable of file and/or directory paths
+
+    Returns:
+        List of input file paths
+
+    Raises:
+        ValueError: If a directory contains no supported input files
+    """
+    filenames = []
+    for path in paths:
+        if not os.path.isdir(path):
+            filenames.append(path)
+            continue
+
+        found = []
+        for dirpath, dirnames, names in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for name in sorted(names):
+                if name.startswith((".", "~$")):
+                    continue
+                try:
+                    file_format = detect_file_format(name)
+                except ValueError:
+                    continue
+                if file_format == "excel" and compression_suffix(name):
+                    continue  # Compressed workbooks cannot be read
+                found.append(os.path.join(dirpath, name))
+
+        if not found:
+            raise ValueError(f"No supported input files found in directory '{path}'")
+        filenames.extend(found)
+
+    return filenames
+
+
+def expand_input_sources(filenames, sheets=None):
+    """
+    Expand input files into (filename, sheet_name) sources.
+
+    Excel workbooks are split into one source per selected worksheet; every
+    other file (and every workbook when sheets is None) is a single source
+    with sheet_name None.
+
+    Args:
+        filenames: List of input file paths
+        sheets: None (active sheet only), "all", or an iterable of worksheet names
+
+    Returns:
+        List of (filename, sheet_name) tuples
+    """
+    sources = []
+    for filename in filenames:
+        if sheets is not None and filename != STDIN_PATH and detect_file_format(filename) == "excel":
+            sources.extend((filename, sheet_name) for sheet_name in select_worksheets(filename, sheets))
+        else:
+            sources.append((filename, None))
+    return sources
+
+
+def source_label(filename, sheet_name):
+    """Name an input source in diagnostics: 'notes.xlsx [Book 1]' for a worksheet."""
+    return filename if sheet_name is None else f"{filename} [{sheet_name}]"
+
+
+def _source_variant(sheet_name, book_from_sheet):
+    """Parse cache key suffix for the options that change how a file is read."""
+    parts = []
+    if sheet_name is not None:
+        parts.append(f"sheet={sheet_name}")
+    if book_from_sheet:
+        parts.append("book-from-sheet")
+    return ";".join(parts)
+
+
+def _read_file_worker(filename, sheet_name=None, book_from_sheet=False, hash_keys=False, jobs=1, summary=None):
+    """Parse one input file (or worksheet) completely (process pool worker, or in-process with jobs)."""
+    if summary is None:
+        summary = new_read_summary(hash_keys)
+    entries = list(iter_input_file(filename, summary, sheet_name, book_from_sheet, jobs))
+    return entries, summary
+
+
+def _read_file_process(filename, sheet_name=None, book_from_sheet=False, hash_keys=False):
+    """Process pool worker: _read_file_worker(), with its diagnostics returned for the parent to report."""
+    with collect_diagnostics() as messages:
+        entries, summary = _read_file_worker(filename, sheet_name, book_from_sheet, hash_keys)
+    return entries, summary, messages
+
+
+def iter_input_files(filenames, summaries, jobs=1, cache=None, sheets=None, book_from_sheet=False, hash_keys=False):
+    """
+    Stream entries from several input files, in the order given.
+
+    With jobs > 1 the files are parsed concurrently in a process pool through
+    iter_input_file(); otherwise they are streamed one after another. With a
+    ParseCache, unchanged files are loaded from the cache and the others are
+    parsed and stored. With sheets, every selected worksheet of an Excel
+    workbook is a separate input (parsed in its own worker with jobs > 1).
+    A single large CSV/TSV input is parsed in chunks instead (see iter_csv_data()).
+
+    Args:
+        filenames: List of input file paths
+        summaries: List that receives a (label, ReadSummary) pair per file or worksheet
+        jobs: Number of worker processes used for parsing
+        cache: Optional ParseCache
+        sheets: None (active sheet only), "all", or an iterable of worksheet names
+        book_from_sheet: Fill a missing Book column from the worksheet name
+        hash_keys: Track duplicate keys as 64-bit hashes (see ReadSummary)
+
+    Yields:
+        Index entries (Entry: title_upper, description, page, book, course)
+    """
+    sources = expand_input_sources(filenames, sheets)
+
+    if jobs <= 1 or len(sources) <= 1:
+        for filename, sheet_name in sources:
+            label = source_label(filename, sheet_name)
+            variant = _source_variant(sheet_name, book_from_sheet)
+            cached = None
+            if cache is not None and filename != STDIN_PATH:
+                cached = cache.load(filename, variant, ReadSummary(hash_keys))
+            if cached is not None:
+                entries, summary = cached
+                summaries.append((label, summary))
+                yield from entries
+                continue
+
+            summary = new_read_summary(hash_keys)
+            summaries.append((label, summary))
+            if cache is None or filename == STDIN_PATH:
+                yield from iter_input_file(filename, summary, sheet_name, book_from_sheet, jobs)
+            elif jobs <= 1:
+                entries = iter_input_file(filename, summary, sheet_name, book_from_sheet)
+                yield from cache.iter_store(filename, entries, summary, variant)
+            else:
+                # Chunk-parallel parsing records a chunk's rows before yielding them: store afterwards
+                entries, _ = _read_file_worker(filename, sheet_name, book_from_sheet, hash_keys, jobs, summary)
+                cache.store(filename, entries, summary, variant)
+                yield from entries
+        return
+
+    results = {}
+    if cache is not None:
+        for filename, sheet_name in sources:
+            if filename == STDIN_PATH:
+                continue
+            cached = cache.load(filename, _source_variant(sheet_name, book_from_sheet), ReadSummary(hash_keys))
+            if cached is not None:
+                results[filename, sheet_name] = cached
+
+    # Standard input can only be read by this process; a repeated source is parsed once
+    pending = [source for source in dict.fromkeys(sources) if source not in results and source[0] != STDIN_PATH]
+    if len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+            parsed = executor.map(
+                _read_file_process,
+                [filename for filename, _ in pending],
+                [sheet_name for _, sheet_name in pending],
+                [book_from_sheet] * len(pending),
+                [hash_keys] * len(pending),
+            )
+            for source, (entries, summary, messages) in zip(pending, parsed):
+                for message in messages:
+                    diagnostic(message)
+                results[source] = entries, summary
+    else:
+        results.update(
+            ((filename, sheet_name), _read_file_worker(filename, sheet_name, book_from_sheet, hash_keys, jobs))
+            for filename, sheet_name in pending
+        )
+    if (STDIN_PATH, None) in sources:
+        results[STDIN_PATH, None] = _read_file_worker(STDIN_PATH, None, book_from_sheet, hash_keys)
+
+    if cache is not None:
+        for filename, sheet_name in pending:
+            variant = _source_variant(sheet_name, book_from_sheet)
+            cache.store(filename, *results[filename, sheet_name], variant=variant)
+
+    # Every occurrence of a source is yielded, like the serial path; the last one releases it
+    remaining = Counter(sources)
+    for source in sources:
+        remaining[source] -= 1
+        entries, summary = results.pop(source)
+        if remaining[source]:
+            # Cached entries stream only once: keep a list for the next occurrence
+            entries = list(entries)
+            results[source] = entries, summary
+        summaries.append((source_label(*source), summary))
+        yield from entries
+
+
+def default_cache_path():
+    """
+    Get the default parse cache location ($XDG_CACHE_HOME or ~/.cache).
+
+    Returns:
+        str: Path to the SQLite parse cache file
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "xenocrates", "parse-cache.sqlite3")
+
+
+def hash_file(filename):
+    """Return the SHA-256 hex digest of a file's content, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    On-disk SQLite cache of parsed input files.
+
+    Stores the normalized entries (with their row numbers) and read statistics
+    for each file, keyed by absolute path (plus a variant naming the worksheet
+    and read options, if any) and validated against size, mtime and a SHA-256
+    content hash. Entries are encoded while the file is streamed (see
+    iter_store()) and decoded lazily, so caching keeps only the compressed
+    payload in memory, not the file's entries. Invalidation rules:
+
+    - A different cache schema, parser revision or Xenocrates version is a miss
+    - Matching size and mtime is a hit without reading the file
+    - Otherwise the content hash decides; a hit refreshes the stored mtime
+
+    Attributes:
+        path: Location of the SQLite database
+        hits: Number of files loaded from the cache
+        misses: Number of files that had to be parsed
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._pending = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS parsed_files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT, version TEXT, payload BLOB)"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def _fingerprint(filename, variant=""):
+        """Return (cache key, size, mtime_ns) for a file; the key is its absolute path[::variant]."""
+        stat = os.stat(filename)
+        path = os.path.abspath(filename)
+        return f"{path}::{variant}" if variant else path, stat.st_size, stat.st_mtime_ns
+
+    def load(self, filename, variant="", summary=None):
+        """
+        Load a file's parsed entries if the cache holds a valid copy.
+
+        Args:
+            filename: Path to input file
+            variant: Optional key suffix distinguishing worksheets/read options of one file
+            summary: Optional empty ReadSummary to fill in (default: a new one)
+
+        Returns:
+            Tuple of (entries, ReadSummary), or None on a cache miss
+        """
+        path, size, mtime_ns = self._fingerprint(filename, variant)
+        row = self.connection.execute(
+            "SELECT size, mtime_ns, sha256, version, payload FROM parsed_files WHERE path = ?", (path,)
+        ).fetchone()
+
+        content_hash = None
+        if row is not None and row[3] == CACHE_VERSION:
+            if (row[0], row[1]) != (size, mtime_ns):
+                # Touched or rewritten - the content hash decides
+                content_hash = hash_file(filename)
+                if content_hash == row[2]:
+                    self.connection.execute(
+                        "UPDATE parsed_files SET size = ?, mtime_ns = ? WHERE path = ?", (size, mtime_ns, path)
+                    )
+                    self.connection.commit()
+                else:
+                    row = None
+        else:
+            row = None
+
+        if row is None:
+            self.misses += 1
+            self._pending[path] = (size, mtime_ns, content_hash or hash_file(filename))
+            return None
+
+        self.hits += 1
+        return self._decode(row[4], summary)
+
+    def store(self, filename, entries, summary, variant=""):
+        """
+        Store a freshly parsed file (after a load() miss).
+
+        Nothing is stored if the file changed while it was being parsed.
+
+        Args:
+            filename: Path to input file
+            entries: List of index entries read from the file
+            summary: ReadSummary filled in while reading
+            variant: Key suffix passed to load()
+        """
+        # Recover each entry's row number from the duplicate tracker (rows are recorded in order)
+        locations = {key: iter(rows) for key, rows in summary.iter_locations()}
+        encoder = _CachePayloadEncoder()
+        for entry in entries:
+            title_upper, _, page, book, course = entry
+            encoder.add(next(locations[summary.key(title_upper, book, page, course)]), entry)
+        self._write(filename, variant, encoder.finish(summary))
+
+    def iter_store(self, filename, entries, summary, variant=""):
+        """
+        Pass entries through while storing them (after a load() miss).
+
+        The entries must come straight from a reader filling in summary, one
+        record() per entry (see iter_input_file() with jobs=1); the file is
+        stored once they are exhausted.
+
+        Args:
+            filename: Path to input file
+            entries: Iterable of index entries being read from the file
+            summary: ReadSummary being filled in by the reader
+            variant: Key suffix passed to load()
+
+        Yields:
+            The entries
+        """
+        tracker = summary.duplicate_tracker
+        encoder = _CachePayloadEncoder()
+        for entry in entries:
+            # The entry was just recorded: its row is the latest location of its key
+            title_upper, _, page, book, course = entry
+            location = tracker[summary.key(title_upper, book, page, course)]
+            encoder.add(location[-1] if type(location) is list else location, entry)
+            yield entry
+        self._write(filename, variant, encoder.finish(summary))
+
+    def _write(self, filename, variant, payload):
+        """Write a payload for a file, unless it changed since load() (see store())."""
+        path, size, mtime_ns = self._fingerprint(filename, variant)
+        pending = self._pending.pop(path, None)
+        if pending is None or pending[:2] != (size, mtime_ns):
+            return
+
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO parsed_files (path, size, mtime_ns, sha256, version, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, pending[2], CACHE_VERSION, payload),
+            )
+            self.connection.commit()
+        except sqlite3.OperationalError as e:
+            # E.g. locked by another process writing to the same cache (batch); the file is parsed again next time
+            self.connection.rollback()
+            diagnostic(f"Warning: Parse cache not updated for {filename}: {e}")
+
+    @staticmethod
+    def _decode(blob, summary=None):
+        """
+        Read a stored payload's statistics into a ReadSummary and decode its rows lazily.
+
+        Returns:
+            Tuple of (iterator of entries, ReadSummary); the summary's duplicate
+            tracking is complete once the entries are exhausted
+        """
+        decompressor = zlib.decompressobj()
+        header = json.loads(decompressor.decompress(blob).decode("utf-8"))
+
+        if summary is None:
+            summary = ReadSummary()
+        summary.has_course_column = header["has_course_column"]
+        summary.location_label = header["location_label"]
+        summary.empty_title_count = header["empty_title_count"]
+        if summary.has_course_column:
+            diagnostic("Info: Course column detected (GSE mode)")
+        return _iter_cache_rows(decompressor.unused_data, summary), summary
+
+    def report(self):
+        """Report the cache hit/miss summary (see diagnostic())."""
+        diagnostic(f"Info: Parse cache: {self.hits} hits, {self.misses} misses ({self.path})")
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+class _CachePayloadEncoder:
+    """
+    Incremental encoder of a parse cache payload.
+
+    A payload is a zlib stream of the read statistics followed by a zlib
+    stream of row batches, one JSON array of [row, title, description, page,
+    book, course] rows per line; rows are compressed as they are added.
+    """
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(CACHE_COMPRESSION_LEVEL)
+        self._chunks = []
+        self._batch = []
+
+    def add(self, row, entry):
+        """Add an entry read from row (or entry/line number) row."""
+        self._batch.append((row, *entry))
+        if len(self._batch) == CACHE_ROW_BATCH:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        line = json.dumps(self._batch, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._chunks.append(self._compressor.compress(line.encode("utf-8")))
+        self._batch = []
+
+    def finish(self, summary):
+        """Return the payload, with the statistics of summary."""
+        if self._batch:
+            self._flush_batch()
+        header = {
+            "has_course_column": summary.has_course_column,
+            "location_label": summary.location_label,
+            "empty_title_count": summary.empty_title_count,
+        }
+        header = zlib.compress(json.dumps(header).encode("utf-8"))
+        return b"".join([header, *self._chunks, self._compressor.flush()])
+
+
+def _iter_cache_rows(data, summary):
+    """Decode the row batches of a parse cache payload (see _CachePayloadEncoder), recording them in summary."""
+    record = summary.record
+    decompressor = zlib.decompressobj()
+    view = memoryview(data)
+    rest = b""
+    for offset in range(0, len(data), CACHE_READ_CHUNK_SIZE):
+        lines = (rest + decompressor.decompress(view[offset : offset + CACHE_READ_CHUNK_SIZE])).split(b"\n")
+        rest = lines.pop()  # Every batch ends with a newline: this is the start of the next one
+        for line in lines:
+            for row, title, description, page, book, course in json.loads(line):
+                yield record(title, description, page, book, course, row)
+
+
+def open_parse_cache(path):
+    """
+    Open the parse cache, falling back to no caching if it is unusable.
+
+    Args:
+        path: Location of the SQLite cache, or None to disable caching
+
+    Returns:
+        ParseCache instance, or None
+    """
+    if path is None:
+        return None
+    try:
+        return ParseCache(path)
+    except (OSError, sqlite3.Error) as e:
+        diagnostic(f"Warning: Parse cache disabled ({path}): {e}")
+        return None
+
+
+def find_cross_file_duplicates(summaries):
+    """
+    Find duplicate keys (title, book, page[, course]) that occur in more than one file.
+
+    Args:
+        summaries: List of (filename, ReadSummary) pairs
+
+    Returns:
+        Dict mapping duplicate keys to lists of (filename, summary, locations)
+    """
+    any_course = any(summary.has_course_column for _, summary in summaries)
+
+    occurrences = {}
+    for filename, summary in summaries:
+        # Files without a Course column are compared with an empty course
+        # (hashed keys always include the course)
+        pad = any_course and not summary.has_course_column and not summary.hash_keys
+        for dup_key, locations in summary.iter_locations():
+            occurrences.setdefault(dup_key + ("",) if pad else dup_key, []).append((filename, summary, locations))
+
+    return {k: v for k, v in occurrences.items() if len(v) > 1}
+
+
+def report_input_summaries(summaries):
+    """
+    Report statistics and duplicate warnings for every input file (see diagnostic()).
+
+    A single input is reported exactly as before; several inputs get a
+    per-file entry count and a report of duplicates spanning files.
+
+    Args:
+        summaries: List of (filename, ReadSummary) pairs
+    """
+    if len(summaries) == 1:
+        summaries[0][1].report()
+        return
+
+    for filename, summary in summaries:
+        diagnostic(f"Info: Read {summary.entry_count} entries from {filename}")
+        summary.report()
+    report_cross_file_duplicates(summaries)
+
+
+def report_cross_file_duplicates(summaries):
+    """
+    Report duplicate entries that span several inputs (see find_cross_file_duplicates()).
+
+    Args:
+        summaries: List of (filename, ReadSummary) pairs
+    """
+    duplicates = find_cross_file_duplicates(summaries)
+    if not duplicates:
+        return
+
+    diagnostic(f"Warning: Found {len(duplicates)} duplicate entries across files:")
+    for dup_key, occurrences in list(duplicates.items())[:5]:  # Show first 5
+        where = "; ".join(
+            f"{filename} ({summary.location_label} {', '.join(map(str, locations))})"
+            for filename, summary, locations in occurrences
+        )
+        # Hashed keys are only readable if they also repeat within one file
+        dup_key = next(filter(None, (summary.key_label(dup_key) for _, summary, _ in occurrences)), None)
+        if dup_key is None:
+            diagnostic(f"  - Same title/book/page in {where}")
+        elif len(dup_key) == 4:
+            title, book, page, course = dup_key
+            diagnostic(f"  - '{title}' (Book: {book}, Course: {course}, Page: {page}) in {where}")
+        else:
+            title, book, page = dup_key
+            diagnostic(f"  - '{title}' (Book: {book}, Page: {page}) in {where}")
+    if len(duplicates) > 5:
+        diagnostic(f"  ... and {len(duplicates) - 5} more duplicates")
+
+
+# Near-duplicate titles: MinHash over character shingles, bucketed with LSH.
+# A pair becomes a candidate when all NEAR_DUPLICATE_ROWS values of any of
+# the NEAR_DUPLICATE_BANDS bands agree (about 95% of pairs at similarity 0.6,
+# 28% at 0.3). Buckets larger than NEAR_DUPLICATE_MAX_BUCKET are skipped: they
+# hold titles that only share very common shingles and would cost O(n^2).
+NEAR_DUPLICATE_THRESHOLD = 0.6
+NEAR_DUPLICATE_SHINGLE_SIZE = 3
+NEAR_DUPLICATE_BANDS = 12
+NEAR_DUPLICATE_ROWS = 3
+NEAR_DUPLICATE_MAX_BUCKET = 500
+NEAR_DUPLICATE_SEED = 2718281828
+NEAR_DUPLICATE_REPORT_LIMIT = 10
+
+
+def normalize_title(title):
+    """Reduce a title to uppercase alphanumeric words separated by single spaces."""
+    return " ".join(re.sub(r"[\W_]+", " ", title.upper()).split())
+
+
+def _bit_count(value):
+    """Number of set bits of a non-negative int (int.bit_count() before Python 3.10)."""
+    return bin(value).count("1")
+
+
+if hasattr(int, "bit_count"):
+    _bit_count = int.bit_count  # noqa: F811
+
+
+def title_shingles(normalized):
+    """Return the set of character shingles of a normalized title (padded with spaces)."""
+    padded = f" {normalized} "
+    size = NEAR_DUPLICATE_SHINGLE_SIZE
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i : i + size] for i in range(len(padded) - size + 1)}
+
+
+class NearDuplicateIndex:
+    """
+    Find clusters of similar titles without comparing every pair.
+
+    Titles are normalized (case, punctuation and spacing are ignored), cut
+    into character shingles and summarized by a MinHash signature. Titles
+    whose signatures agree on a whole LSH band share a bucket, and only
+    those candidate pairs are compared exactly (shingle Jaccard similarity
+    >= threshold). The cost grows with the number of titles, not pairs.
+    Hashes are seeded, so results are the same on every run.
+
+    Attributes:
+        threshold: Minimum Jaccard similarity of two titles' shingle sets
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._books = {}  # title_upper -> books it appears in (ordered dict keys)
+        rng = random.Random(NEAR_DUPLICATE_SEED)
+        self._permutations = [
+            (rng.randrange(1, 1 << 32) | 1, rng.randrange(1 << 32))
+            for _ in range(NEAR_DUPLICATE_BANDS * NEAR_DUPLICATE_ROWS)
+        ]
+
+    def add(self, entry):
+        """Record an entry's title and book."""
+        self._books.setdefault(entry[0], {})[entry[3]] = None
+
+    def observe(self, entries):
+        """Pass entries through unchanged, recording each one."""
+        for entry in entries:
+            self.add(entry)
+            yield entry
+
+    def _fingerprints(self, forms):
+        """
+        Summarize the shingle sets of normalized titles, one title at a time.
+
+        Returns:
+            Tuple of lists (shingle counts, shingle sets as bit masks, MinHash signatures),
+            where a signature holds, per hash function, the minimum over the title's shingles
+        """
+        # Shingles are counted first, so that the most frequent ones get the lowest bits (the masks stay short)
+        frequency = Counter()
+        for form in forms:
+            frequency.update(title_shingles(form))
+        bits = {shingle: 1 << bit for bit, (shingle, _) in enumerate(frequency.most_common())}
+        # Each distinct shingle is hashed once; its universal-hash values are reused by every title
+        vectors = {}
+        for shingle in bits:
+            h = zlib.crc32(shingle.encode("utf-8"))
+            vectors[shingle] = tuple([(a * h + b) & 0xFFFFFFFF for a, b in self._permutations])
+
+        sizes, masks, signatures = [], [], []
+        for form in forms:
+            shingles = title_shingles(form)
+            sizes.append(len(shingles))
+            masks.append(sum(map(bits.__getitem__, shingles)))
+            if len(shingles) > 1:
+                signatures.append(tuple(map(min, *map(vectors.__getitem__, shingles))))
+            else:
+                signatures.append(vectors[next(iter(shingles))])
+        return sizes, masks, signatures
+
+    def _similar_pairs(self, members, masks, sizes):
+        """
+        Yield the pairs of a bucket whose shingle sets are similar enough.
+
+        Shingle sets are bit masks, so a pair's intersection is one AND and a
+        bit count, done in C for a whole row of the bucket (map). Pairs are
+        checked against a slightly lenient bound there, and only the few
+        passing it get the exact test: a bucket of mostly dissimilar titles
+        costs no Python-level work per pair.
+        """
+        threshold = self.threshold
+        # common >= t * (|a| + |b| - common)  <=>  common >= t / (1 + t) * (|a| + |b|)
+        factor = threshold / (1 + threshold) * (1 - 1e-9)
+        member_masks = [masks[form_id] for form_id in members]
+        member_sizes = [sizes[form_id] for form_id in members]
+        scaled = [factor * size for size in member_sizes]
+        for i in range(len(members) - 1):
+            commons = list(map(_bit_count, map(member_masks[i].__and__, member_masks[i + 1 :])))
+            passing = map(operator.ge, commons, map(scaled[i].__add__, scaled[i + 1 :]))
+            for j in itertools.compress(range(i + 1, len(members)), passing):
+                common = commons[j - i - 1]
+                if common >= threshold * (member_sizes[i] + member_sizes[j] - common):
+                    yield members[i], members[j]
+
+    def clusters(self):
+        """
+        Group the recorded titles into clusters of near-duplicates.
+
+        Returns:
+            List of clusters (each a sorted list of at least two distinct
+            titles), sorted by their first title
+        """
+        # Titles that only differ in case/punctuation/spacing share a normalized form
+        variants = defaultdict(list)
+        for title in self._books:
+            variants[normalize_title(title)].append(title)
+        forms = list(variants)
+        sizes, masks, signatures = self._fingerprints(forms)
+
+        # One band's buckets at a time, so only the signatures stay in memory
+        neighbors = defaultdict(set)
+        rows = NEAR_DUPLICATE_ROWS
+        for band in range(NEAR_DUPLICATE_BANDS):
+            buckets = defaultdict(list)
+            for form_id, signature in enumerate(signatures):
+                buckets[signature[band * rows : (band + 1) * rows]].append(form_id)
+            for members in buckets.values():
+                if 1 < len(members) <= NEAR_DUPLICATE_MAX_BUCKET:
+                    for first, second in self._similar_pairs(members, masks, sizes):
+                        neighbors[first].add(second)
+                        neighbors[second].add(first)
+
+        # Star clustering instead of transitive closure, so that a chain of
+        # slightly different titles does not merge into one giant group: the
+        # title with the most matches becomes a centre and takes all its
+        # unclaimed matches. A title left alone (its matches were all taken)
+        # joins the cluster of its first match.
+        cluster_of = {}
+        for centre in sorted(neighbors, key=lambda form_id: (-len(neighbors[form_id]), forms[form_id])):
+            if centre not in cluster_of:
+                for form_id in (centre, *neighbors[centre]):
+                    cluster_of.setdefault(form_id, centre)
+        sizes = defaultdict(int)
+        for centre in cluster_of.values():
+            sizes[centre] += 1
+        for form_id, centre in cluster_of.items():
+            if centre == form_id and sizes[centre] == 1:
+                cluster_of[form_id] = cluster_of[min(neighbors[form_id], key=forms.__getitem__)]
+
+        groups = defaultdict(list)
+        for form_id, form in enumerate(forms):
+            groups[cluster_of.get(form_id, form_id)].extend(variants[form])
+        return sorted(sorted(group) for group in groups.values() if len(group) > 1)
+
+    def report(self):
+        """Report the near-duplicate clusters, with the books of each title (see diagnostic())."""
+        clusters = self.clusters()
+        if not clusters:
+            diagnostic("Info: No near-duplicate titles found")
+            return
+
+        diagnostic(f"Warning: Found {len(clusters)} groups of near-duplicate titles:")
+        for cluster in clusters[:NEAR_DUPLICATE_REPORT_LIMIT]:
+            titles = " ~ ".join(f"'{title}' ({', '.join(self._books[title])})" for title in cluster)
+            diagnostic(f"  - {titles}")
+        if len(clusters) > NEAR_DUPLICATE_REPORT_LIMIT:
+            diagnostic(f"  ... and {len(clusters) - NEAR_DUPLICATE_REPORT_LIMIT} more groups")
+
+
+# "See also" cross-references (--see-also): at most SEE_ALSO_MAX_LINKS other
+# entries are linked per description, and titles shorter than
+# SEE_ALSO_MIN_TITLE_LENGTH characters (e.g. 'IP') are never matched. Words
+# and single punctuation marks are matched whole, so 'NTLM' is found in
+# 'uses NTLM.' but not in 'NTLMv2', and 'C++' does not match 'C'.
+SEE_ALSO_MAX_LINKS = 5
+SEE_ALSO_MIN_TITLE_LENGTH = 3
+SEE_ALSO_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def see_also_tokens(text):
+    """Split text into lowercase words and punctuation marks (the units titles are matched in)."""
+    return SEE_ALSO_TOKEN_PATTERN.findall(text.lower())
+
+
+class CrossReferences:
+    """
+    Find the other index titles a description mentions, scanning it only once.
+
+    All titles are compiled into one Aho-Corasick automaton over
+    see_also_tokens(), so a description is matched against every title in
+    a single pass over its tokens instead of searching for each title in
+    turn. Overlapping mentions resolve to the leftmost, then longest title
+    ('Kerberos ticket' refers to KERBEROS TICKET, not KERBEROS), an entry
+    never refers to its own title, and each title is referred to once.
+
+    Titles are collected with observe() while the inputs are read; the
+    automaton is built on the first lookup, when all titles are known.
+
+    Attributes:
+        limit: Maximum number of titles referred to per entry
+    """
+
+    def __init__(self, limit=SEE_ALSO_MAX_LINKS):
+        self.limit = limit
+        self._seen = set()
+        self._ids = None  # title_upper -> target id, once built
+        self._titles = []  # target id -> title shown in links
+
+    def observe(self, entries):
+        """
+        Pass entries through, remembering their titles.
+
+        Args:
+            entries: Iterable of index entries
+
+        Yields:
+            The same entries
+        """
+        seen = self._seen
+        for entry in entries:
+            seen.add(entry[0])
+            yield entry
+
+    def _build(self):
+        """Compile the collected titles into the goto/fail/output tables of the automaton."""
+        goto = [{}]
+        outputs = [[]]
+        self._ids = {}
+        patterns = {}
+        # Sorted, so ids are stable and titles that only differ in spacing or
+        # quotes share the id of the one rendered first
+        for title in sorted(self._seen):
+            stripped = title.strip('"').strip()
+            if len(stripped) < SEE_ALSO_MIN_TITLE_LENGTH or not entry_first_char(title):
+                continue
+            tokens = tuple(see_also_tokens(stripped))
+            if not any(token[0].isalnum() or token[0] == "_" for token in tokens):
+                continue
+            target = patterns.get(tokens)
+            if target is None:
+                target = patterns[tokens] = len(self._titles)
+                self._titles.append(title)
+                state = 0
+                for token in tokens:
+                    next_state = goto[state].get(token)
+                    if next_state is None:
+                        next_state = goto[state][token] = len(goto)
+                        goto.append({})
+                        outputs.append([])
+                    state = next_state
+                outputs[state].append((len(tokens), target))
+            self._ids[title] = target
+
+        # Breadth-first: a state's failure link is the longest proper suffix of
+        # its token path that is also a path; outputs inherit along those links
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for token, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and token not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(token, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+                queue.append(next_state)
+        self._goto, self._fail, self._outputs = goto, fail, outputs
+        self._seen = None
+
+    def anchor(self, title_upper):
+        """Return the link target id of a title, or None if no entry can refer to it."""
+        if self._ids is None:
+            self._build()
+        target = self._ids.get(title_upper)
+        # Only one of the titles sharing an id carries the anchor
+        return target if target is not None and self._titles[target] == title_upper else None
+
+    def find(self, title_upper, description):
+        """
+        Find the titles mentioned in a description.
+
+        Args:
+            title_upper: Title of the entry (never referred to)
+            description: Text to scan
+
+        Returns:
+            List of (target id, title) pairs in order of first mention, at most limit
+        """
+        if self._ids is None:
+            self._build()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+
+        matches = []
+        state = 0
+        for position, token in enumerate(see_also_tokens(description)):
+            next_state = goto[state].get(token)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(token)
+            state = next_state or 0
+            if outputs[state]:
+                for length, target in outputs[state]:
+                    matches.append((position - length + 1, -length, target))
+        if not matches:
+            return []
+
+        own = self._ids.get(title_upper)
+        references = {}
+        covered = 0
+        for start, negative_length, target in sorted(matches):
+            if start < covered:
+                continue
+            covered = start - negative_length
+            if target != own and target not in references:
+                references[target] = self._titles[target]
+                if len(references) >= self.limit:
+                    break
+        return list(references.items())
+
+
+# Precompiled section header (label)
+SECTION_HEADER_TEMPLATE = (
+    "<span class=Title1><b><span style='font-size:45.0pt;line-height:107%%;"
+    "color:black'>%s</span></b></span>"
+    "<span style='font-size:13.5pt;line-height:107%%;color:black'><br><br></span>"
+)
+
+
+def section_label(character):
+    """
+    Get the section of a given starting character, independent of the output format.
+
+    Args:
+        character: First character of the entry title (uppercase)
+
+    Returns:
+        Tuple of (section_number, label), e.g. (1, 'Aa') or (27, 'Numbers & Special Characters')
+    """
+    # Map A-Z to section numbers 1-26
+    if character in string.ascii_uppercase:
+        return ord(character) - ord("A") + 1, f"{character}{character.lower()}"
+    # Numbers and special characters
+    return 27, "Numbers & Special Characters"
+
+
+def get_section_header(character):
+    """
+    Get the HTML section header for a given starting character.
+
+    Args:
+        character: First character of the entry title (uppercase)
+
+    Returns:
+        Tuple of (section_number, header_html)
+    """
+    section_num, header_label = section_label(character)
+    return section_num, SECTION_HEADER_TEMPLATE % header_label
+
+
+# Precompiled entry templates (title, [course,] book, page, description).
+# Each line matches one print() call of the original per-entry writer, so
+# rendered output is byte-identical.
+ENTRY_TEMPLATE = (
+    "<span class=topic><b><span style='color:blue'>\n"
+    " %s \n"
+    "</span></b></span><span style='color:black'>&nbsp;\n"
+    "<br><i>{b-%s / p-%s}</i><br>%s<br></span>\n"
+)
+GSE_ENTRY_TEMPLATE = (
+    "<span class=topic><b><span style='color:blue'>\n"
+    " %s \n"
+    "</span></b></span><span style='color:black'>&nbsp;\n"
+    "<br><i>{c-%s / b-%s / p-%s}</i><br>%s<br></span>\n"
+)
+
+# Cross-references (--see-also): the link target written before the first
+# entry of a title, and the links appended to a description (id, title)
+SEE_ALSO_ANCHOR_TEMPLATE = "<a id=see-%d></a>"
+SEE_ALSO_TEMPLATE = "<br><i>See also: %s</i>"
+SEE_ALSO_LINK_TEMPLATE = "<a href='#see-%d'>%s</a>"
+
+# Maximum number of rendered fragments buffered before a chunk is written
+WRITE_CHUNK_ENTRIES = 4096
+
+
+class _EscapeCache(dict):
+    """HTML-escape memo for short, highly repetitive fields (Page/Book/Course)."""
+
+    def __missing__(self, value):
+        escaped = self[value] = html.escape(value, quote=True)
+        return escaped
+
+
+def render_see_also(references):
+    """
+    Render cross-references as HTML links to their entries.
+
+    Args:
+        references: List of (target id, title) pairs from CrossReferences.find()
+
+    Returns:
+        str: HTML appended to the escaped description ('' without references)
+    """
+    if not references:
+        return ""
+    links = ", ".join(SEE_ALSO_LINK_TEMPLATE % (target, html.escape(title, quote=True)) for target, title in references)
+    return SEE_ALSO_TEMPLATE % links
+
+
+def render_entry(title, description, page, book, course="", escape_cache=None, see_also=""):
+    """
+    Render a single index entry as an HTML string.
+
+    Args:
+        title: Entry title (will be HTML escaped)
+        description: Entry description (will be HTML escaped)
+        page: Page number (will be HTML escaped)
+        book: Book/course identifier (will be HTML escaped)
+        course: Optional course identifier (will be HTML escaped)
+        escape_cache: Optional _EscapeCache reused across entries for Page/Book/Course
+        see_also: Optional HTML appended to the description (see render_see_also())
+
+    Returns:
+        str: Entry HTML, including the trailing newline
+    """
+    if escape_cache is None:
+        escape_cache = _EscapeCache()
+
+    # HTML escape all fields, including quotes (quote=True)
+    title_escaped = html.escape(title, quote=True)
+    desc_escaped = html.escape(description, quote=True) + see_also
+
+    # Build reference string: {c-575 / b-SEC401 / p-142} or {b-SEC401 / p-142}
+    if course:
+        return GSE_ENTRY_TEMPLATE % (
+            title_escaped,
+            escape_cache[course],
+            escape_cache[book],
+            escape_cache[page],
+            desc_escaped,
+        )
+    return ENTRY_TEMPLATE % (title_escaped, escape_cache[book], escape_cache[page], desc_escaped)
+
+
+def print_entry(title, description, page, book, course=""):
+    """
+    Print a single index entry in HTML format to stdout.
+
+    Args:
+        title: Entry title (will be HTML escaped)
+        description: Entry description (will be HTML escaped)
+        page: Page number (will be HTML escaped)
+        book: Book/course identifier (will be HTML escaped)
+        course: Optional course identifier (will be HTML escaped)
+    """
+    print_entry_to_file(title, description, page, book, course, sys.stdout)
+
+
+def print_entry_to_file(title, description, page, book, course, output):
+    """
+    Print a single index entry in HTML format to specified file.
+
+    Args:
+        title: Entry title (will be HTML escaped)
+        description: Entry description (will be HTML escaped)
+        page: Page number (will be HTML escaped)
+        book: Book/course identifier (will be HTML escaped)
+        course: Optional course identifier (will be HTML escaped)
+        output: File object to write to
+    """
+    output.write(render_entry(title, description, page, book, course))
+
+
+def entry_first_char(title_upper):
+    """
+    Get the character that decides an entry's section.
+
+    Args:
+        title_upper: Uppercase entry title
+
+    Returns:
+        str: First character after stripping surrounding quotes, or '' if none
+    """
+    return title_upper.strip('"')[:1]
+
+
+def write_index(entries, output, current_section=0, cross_references=None):
+    """
+    Render sorted entries as HTML and write them to output in large chunks.
+
+    Each section's header and entries are joined in memory and written with a
+    single write() call (long sections are flushed every WRITE_CHUNK_ENTRIES
+    entries). Entries whose title has no usable first character are skipped.
+
+    Args:
+        entries: Iterable of index entries in sorted order
+        output: File object to write to
+        current_section: Section already open in output (0 = none, header is emitted)
+        cross_references: Optional CrossReferences; descriptions link the titles they mention
+
+    Returns:
+        int: Section number of the last entry written (current_section if none)
+    """
+    escape = html.escape
+    escape_cache = _EscapeCache()
+    section_headers = {}
+    parts = []
+    append = parts.append
+    previous_title = None
+
+    for title_upper, description, page, book, course in entries:
+        # Get first character (strip quotes if present)
+        first_char = entry_first_char(title_upper)
+
+        if not first_char:
+            continue
+
+        # Determine section and emit header if changed
+        section = section_headers.get(first_char)
+        if section is None:
+            section_num, section_header = get_section_header(first_char)
+            section = section_headers[first_char] = (section_num, section_header + "\n")
+
+        if section[0] != current_section:
+            if parts:
+                output.write("".join(parts))
+                parts.clear()
+            append(section[1])
+            current_section = section[0]
+
+        description_html = escape(description, quote=True)
+        if cross_references is not None:
+            # Duplicates are adjacent: only the first entry of a title is the link target
+            if title_upper != previous_title:
+                anchor = cross_references.anchor(title_upper)
+                if anchor is not None:
+                    append(SEE_ALSO_ANCHOR_TEMPLATE % anchor)
+                previous_title = title_upper
+            description_html += render_see_also(cross_references.find(title_upper, description))
+
+        # Inlined render_entry() - this loop runs once per entry
+        if course:
+            append(
+                GSE_ENTRY_TEMPLATE
+                % (
+                    escape(title_upper, quote=True),
+                    escape_cache[course],
+                    escape_cache[book],
+                    escape_cache[page],
+                    description_html,
+                )
+            )
+        else:
+            append(
+                ENTRY_TEMPLATE
+                % (
+                    escape(title_upper, quote=True),
+                    escape_cache[book],
+                    escape_cache[page],
+                    description_html,
+                )
+            )
+
+        if len(parts) >= WRITE_CHUNK_ENTRIES:
+            output.write("".join(parts))
+            parts.clear()
+
+    if parts:
+        output.write("".join(parts))
+
+    return current_section
+
+
+def partition_entries(entries):
+    """
+    Split entries into partitions by the first character of their sort key.
+
+    Concatenating the sorted partitions in key order reproduces the global
+    sort exactly. Every partition falls within a single section from
+    get_section_header(), except titles starting with a quote (the section
+    is decided after stripping quotes, the sort order is not).
+
+    Args:
+        entries: Iterable of index entries (consumed in one pass)
+
+    Returns:
+        List of entry lists, ordered by their leading character
+    """
+    partitions = defaultdict(list)
+    for entry in entries:
+        partitions[entry[0][:1]].append(entry)
+    return [partitions[key] for key in sorted(partitions)]
+
+
+def sort_partition(entries, dedupe="warn"):
+    """
+    Sort and deduplicate one partition (process pool worker).
+
+    Duplicates always share a partition, so deduplicating each partition is
+    the same as deduplicating the whole index.
+
+    Args:
+        entries: List of index entries sharing a leading character
+        dedupe: Duplicate policy ('warn' keeps duplicates, 'drop' or 'merge' see Deduplicator)
+
+    Returns:
+        Tuple of (sorted entries, number of duplicates dropped or merged)
+    """
+    entries.sort(key=itemgetter(0))
+    if dedupe == "warn":
+        return entries, 0
+    deduplicator = Deduplicator(dedupe)
+    entries = list(deduplicator.apply(entries))
+    return entries, deduplicator.removed
+
+
+def render_partition(entries, dedupe="warn"):
+    """
+    Sort and render one partition to an HTML fragment (process pool worker).
+
+    Args:
+        entries: List of index entries sharing a leading character
+        dedupe: Duplicate policy (see sort_partition())
+
+    Returns:
+        Tuple of (first_section, last_section, fragment_html, removed); the
+        sections are 0 when nothing in the partition was rendered, removed is
+        the number of duplicates dropped or merged
+    """
+    entries, removed = sort_partition(entries, dedupe)
+
+    first_section = 0
+    for title_upper, *_ in entries:
+        first_char = entry_first_char(title_upper)
+        if first_char:
+            first_section = get_section_header(first_char)[0]
+            break
+
+    fragment = io.StringIO()
+    last_section = write_index(entries, fragment)
+    return first_section, last_section, fragment.getvalue(), removed
+
+
+def write_index_parallel(partitions, output, jobs, dedupe="warn"):
+    """
+    Sort and render partitions across a process pool, writing fragments in order.
+
+    Each fragment opens with its own section header; it is dropped when the
+    previous fragment ended in the same section, so the result is byte-identical
+    to write_index() over the fully sorted entries.
+
+    Args:
+        partitions: Entry lists from partition_entries()
+        output: File object to write to
+        jobs: Number of worker processes
+        dedupe: Duplicate policy passed to render_partition()
+
+    Returns:
+        int: Number of duplicate entries removed
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return write_fragments(executor.map(render_partition, partitions, itertools.repeat(dedupe)), output)
+
+
+def write_fragments(fragments, output):
+    """
+    Write rendered partition fragments in order, merging sections across them.
+
+    Args:
+        fragments: Iterable of (first_section, last_section, fragment_html, removed) from render_partition()
+        output: File object to write to
+
+    Returns:
+        int: Total number of duplicate entries removed from the fragments
+    """
+    current_section = 0
+    removed = 0
+    for first_section, last_section, fragment, fragment_removed in fragments:
+        removed += fragment_removed
+        if not fragment:
+            continue
+        if first_section == current_section:
+            # Drop the fragment's opening header line (headers are single-line)
+            fragment = fragment[fragment.index("\n") + 1 :]
+        output.write(fragment)
+        current_section = last_section
+    return removed
+
+
+# Cross-references added to descriptions in formats without links
+SEE_ALSO_TEXT_TEMPLATE = " (see also: %s)"
+
+
+class IndexRenderer(abc.ABC):
+    """
+    Base class of the output formats an index can be rendered to.
+
+    A document is begin(), then for every sorted entry its section() when
+    the section changes, separator between consecutive entries and entry(),
+    then end(). Renderers hold no open files, so one sorted stream can feed
+    several of them (see write_rendered()).
+
+    Attributes:
+        names: Format names accepted in '--output FORMAT:PATH' (the first is canonical)
+        extensions: Output file extensions that select this format
+        separator: Text written between two entries
+        has_course: Whether the index has a Course column
+    """
+
+    names = ()
+    extensions = ()
+    separator = ""
+
+    def __init__(self, has_course=False):
+        self.has_course = has_course
+
+    def begin(self):
+        """Return the text opening the document."""
+        return ""
+
+    def section(self, section_num, label):
+        """Return the header of a section (see section_label())."""
+        return ""
+
+    @abc.abstractmethod
+    def entry(self, title_upper, description, page, book, course):
+        """Return one rendered entry."""
+
+    def linked_entry(self, entry, anchor, references):
+        """
+        Return one rendered entry with the titles its description mentions (see CrossReferences).
+
+        Args:
+            entry: Index entry
+            anchor: Link target id of the entry, or None (only used by formats with links)
+            references: List of (target id, title) pairs; added to the description as text
+        """
+        title_upper, description, page, book, course = entry
+        if references:
+            description += SEE_ALSO_TEXT_TEMPLATE % ", ".join(title for _, title in references)
+        return self.entry(title_upper, description, page, book, course)
+
+    def end(self):
+        """Return the text closing the document."""
+        return ""
+
+
+class HtmlRenderer(IndexRenderer):
+    """The classic HTML index (same output as write_index())."""
+
+    names = ("html", "htm")
+    extensions = (".html", ".htm")
+
+    def __init__(self, has_course=False):
+        super().__init__(has_course)
+        self._escape_cache = _EscapeCache()
+
+    def section(self, section_num, label):
+        return SECTION_HEADER_TEMPLATE % label + "\n"
+
+    def entry(self, title_upper, description, page, book, course):
+        return render_entry(title_upper, description, page, book, course, self._escape_cache)
+
+    def linked_entry(self, entry, anchor, references):
+        rendered = render_entry(*entry, self._escape_cache, render_see_also(references))
+        return rendered if anchor is None else SEE_ALSO_ANCHOR_TEMPLATE % anchor + rendered
+
+
+# Characters with a meaning in Markdown, escaped with a backslash
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>#|&])")
+
+
+def _markdown_text(text):
+    """Escape Markdown syntax and fold line breaks, so a field stays on its list item's line."""
+    return MARKDOWN_SPECIAL.sub(r"\\\1", " ".join(text.splitlines()))
+
+
+class MarkdownRenderer(IndexRenderer):
+    """One '## Aa' heading per section and one list item per entry."""
+
+    names = ("markdown", "md")
+    extensions = (".md", ".markdown")
+
+    def begin(self):
+        return "# Index\n"
+
+    def section(self, section_num, label):
+        return f"\n## {_markdown_text(label)}\n\n"
+
+    def entry(self, title_upper, description, page, book, course):
+        reference = f"c-{course} / b-{book} / p-{page}" if course else f"b-{book} / p-{page}"
+        return f"- **{_markdown_text(title_upper)}** *{{{_markdown_text(reference)}}}* {_markdown_text(description)}\n"
+
+
+class CsvRenderer(IndexRenderer):
+    """The sorted entries as a CSV file with a header row, readable as Xenocrates input."""
+
+    names = ("csv",)
+    extensions = (".csv",)
+    delimiter = ","
+
+    def _field(self, field):
+        # csv.writer's QUOTE_MINIMAL rules, without a writer object per renderer
+        if self.delimiter in field or '"' in field or "\n" in field or "\r" in field:
+            return '"' + field.replace('"', '""') + '"'
+        return field
+
+    def _line(self, fields):
+        return self.delimiter.join(map(self._field, fields)) + "\n"
+
+    def begin(self):
+        columns = ("Title", "Description", "Page", "Book", "Course")
+        return self._line(columns if self.has_course else columns[:4])
+
+    def entry(self, title_upper, description, page, book, course):
+        fields = (title_upper, description, page, book, course)
+        return self._line(fields if self.has_course else fields[:4])
+
+
+class TsvRenderer(CsvRenderer):
+    """The sorted entries as a tab-separated file with a header row."""
+
+    names = ("tsv",)
+    extensions = (".tsv", ".txt")
+    delimiter = "\t"
+
+
+class JsonRenderer(IndexRenderer):
+    """The sorted entries in the {"entries": [...]} input format."""
+
+    names = ("json",)
+    extensions = (".json",)
+    separator = ","
+
+    def begin(self):
+        return '{"entries": ['
+
+    def entry(self, title_upper, description, page, book, course):
+        entry = {"Title": title_upper, "Description": description, "Page": page, "Book": book}
+        if self.has_course:
+            entry["Course"] = course
+        return "\n  " + json.dumps(entry, ensure_ascii=False)
+
+    def end(self):
+        return "\n]}\n"
+
+
+RENDERERS = (HtmlRenderer, MarkdownRenderer, CsvRenderer, TsvRenderer, JsonRenderer)
+OUTPUT_FORMATS = {name: renderer for renderer in RENDERERS for name in renderer.names}
+
+
+def parse_output_spec(spec):
+    """
+    Parse an output target given as 'FORMAT:PATH' or 'PATH'.
+
+    Without a known format prefix, the format follows the file extension
+    (a compression extension is looked through); unknown extensions are HTML.
+
+    Args:
+        spec: Output target, e.g. 'md:notes.md', 'index.html.gz' or 'json:-' (stdout)
+
+    Returns:
+        Tuple of (canonical format name, path)
+
+    Raises:
+        ValueError: If the path is empty
+    """
+    prefix, colon, path = spec.partition(":")
+    renderer = OUTPUT_FORMATS.get(prefix.lower()) if colon else None
+    if renderer is None:
+        path = spec
+        base = path[: -len(compression_suffix(path))] if compression_suffix(path) else path
+        ext = os.path.splitext(base)[1].lower()
+        renderer = next((r for r in RENDERERS if ext in r.extensions), HtmlRenderer)
+    if not path:
+        raise ValueError(f"Output '{spec}' has no path")
+    return renderer.names[0], path
+
+
+def write_rendered(entries, targets, cross_references=None):
+    """
+    Render sorted entries to several outputs in a single pass.
+
+    Every entry's section (and cross-references) is decided once and handed
+    to all renderers; output is buffered per target and written every
+    WRITE_CHUNK_ENTRIES entries. Entries whose title has no usable first
+    character are skipped.
+
+    Args:
+        entries: Iterable of index entries in sorted order
+        targets: List of (IndexRenderer, file object) pairs
+        cross_references: Optional CrossReferences (see IndexRenderer.linked_entry())
+    """
+    buffers = [[renderer.begin()] for renderer, _ in targets]
+    renderers = [(renderer, buffer.append) for (renderer, _), buffer in zip(targets, buffers)]
+    sections = {}
+    current_section = 0
+    pending = 0
+    first = True
+    previous_title = None
+
+    for entry in entries:
+        first_char = entry_first_char(entry[0])
+        if not first_char:
+            continue
+
+        section = sections.get(first_char)
+        if section is None:
+            section = sections[first_char] = section_label(first_char)
+        new_section = section[0] != current_section
+        current_section = section[0]
+
+        if cross_references is not None:
+            anchor = cross_references.anchor(entry[0]) if entry[0] != previous_title else None
+            previous_title = entry[0]
+            references = cross_references.find(entry[0], entry[1])
+
+        for renderer, append in renderers:
+            if new_section:
+                append(renderer.section(*section))
+            if not first:
+                append(renderer.separator)
+            if cross_references is None:
+                append(renderer.entry(*entry))
+            else:
+                append(renderer.linked_entry(entry, anchor, references))
+        first = False
+
+        pending += 1
+        if pending >= WRITE_CHUNK_ENTRIES:
+            for (_, output), buffer in zip(targets, buffers):
+                output.write("".join(buffer))
+                buffer.clear()
+            pending = 0
+
+    for (renderer, output), buffer in zip(targets, buffers):
+        buffer.append(renderer.end())
+        output.write("".join(buffer))
+
+
+def parse_memory_size(value):
+    """
+    Parse a human-readable memory size such as '512M' or '2G' into bytes.
+
+    Args:
+        value: Size string with optional K/M/G suffix (binary units, 'B'/'iB' allowed)
+
+    Returns:
+        int: Size in bytes
+
+    Raises:
+        ValueError: If the size cannot be parsed or is not positive
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmg]?)(?:i?b)?\s*", str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid memory size: '{value}' (examples: 512M, 2G, 65536)")
+
+    number, unit = match.groups()
+    multiplier = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}[unit.lower()]
+    size = int(float(number) * multiplier)
+    if size <= 0:
+        raise ValueError(f"Memory size must be positive: '{value}'")
+
+    return size
+
+
+def estimate_entry_size(entry):
+    """
+    Estimate the in-memory footprint of an index entry in bytes.
+
+    Args:
+        entry: Index Entry (title_upper, description, page, book, course)
+
+    Returns:
+        int: Approximate size of the entry container and its strings
+    """
+    return sys.getsizeof(entry) + sum(map(sys.getsizeof, entry))
+
+
+def _spill_run(run):
+    """Write a sorted run to an anonymous temporary file and rewind it."""
+    spill_file = tempfile.TemporaryFile(prefix="xenocrates-run-")
+    for start in range(0, len(run), SPILL_BLOCK_SIZE):
+        pickle.dump(run[start : start + SPILL_BLOCK_SIZE], spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+    spill_file.seek(0)
+    return spill_file
+
+
+def _iter_run(spill_file):
+    """Stream entries back from a spilled run, one block at a time."""
+    while True:
+        try:
+            block = pickle.load(spill_file)
+        except EOFError:
+            return
+        yield from block
+
+
+def _merge_spilled_runs(runs):
+    """
+    Reduce spilled runs to at most MERGE_FAN_IN by merging consecutive groups.
+
+    Consecutive runs are merged so that entries with equal titles keep their
+    original input order (heapq.merge prefers earlier iterables on ties).
+    """
+    while len(runs) > MERGE_FAN_IN:
+        merged_runs = []
+        for start in range(0, len(runs), MERGE_FAN_IN):
+            group = runs[start : start + MERGE_FAN_IN]
+            spill_file = tempfile.TemporaryFile(prefix="xenocrates-run-")
+            block = []
+            for entry in heapq.merge(*map(_iter_run, group), key=itemgetter(0)):
+                block.append(entry)
+                if len(block) >= SPILL_BLOCK_SIZE:
+                    pickle.dump(block, spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+                    block = []
+            if block:
+                pickle.dump(block, spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+            spill_file.seek(0)
+            for run_file in group:
+                run_file.close()
+            merged_runs.append(spill_file)
+        runs[:] = merged_runs
+    return runs
+
+
+def external_sort(entries, max_memory):
+    """
+    Sort entries by title using sorted runs spilled to disk once a budget is exceeded.
+
+    Entries are buffered until their estimated size reaches max_memory, then the
+    buffer is sorted and written to a temporary file. The runs are k-way merged
+    lazily, so the result can be streamed straight into the HTML writer. The
+    sort is stable, matching sorted(entries, key=itemgetter(0)) exactly.
+
+    Args:
+        entries: Iterable of index entries
+        max_memory: Buffer budget in bytes
+
+    Yields:
+        Index entries in sorted order
+    """
+    runs = []
+    run = []
+    run_size = 0
+
+    try:
+        for entry in entries:
+            run.append(entry)
+            run_size += estimate_entry_size(entry)
+            if run_size >= max_memory:
+                run.sort(key=itemgetter(0))
+                runs.append(_spill_run(run))
+                run = []
+                run_size = 0
+
+        run.sort(key=itemgetter(0))
+        if not runs:
+            # Everything fit in the budget - no disk I/O needed
+            yield from run
+            return
+
+        _merge_spilled_runs(runs)
+        # The final run stays in memory; it is the newest input, so it goes last
+        yield from heapq.merge(*map(_iter_run, runs), run, key=itemgetter(0))
+    finally:
+        for spill_file in runs:
+            spill_file.close()
+
+
+def sort_entries(entries, max_memory=None):
+    """
+    Sort index entries alphabetically by title (case-insensitive, already uppercase).
+
+    Args:
+        entries: Iterable of index entries
+        max_memory: Optional memory budget in bytes; when set, sorted runs are
+            spilled to temporary files instead of holding everything in memory
+
+    Returns:
+        Iterable of entries in sorted order
+    """
+    if max_memory is None:
+        return sorted(entries, key=itemgetter(0))
+    return external_sort(entries, max_memory)
+
+
+DEDUPE_POLICIES = ("warn", "drop", "merge")
+
+# Joins the distinct descriptions of merged duplicates
+MERGE_SEPARATOR = "; "
+
+
+class Deduplicator:
+    """
+    Drop or merge duplicate entries (same title, book, page and course) in a sorted stream.
+
+    Duplicates share a title, so after the stable sort they are adjacent and
+    still in input order: only one title's entries are held at a time and no
+    key table is built, whatever the input size or number of input files.
+    The first occurrence keeps its position; with 'merge' its description
+    becomes the distinct non-empty descriptions of all occurrences, joined
+    with MERGE_SEPARATOR.
+
+    Attributes:
+        policy: 'drop' or 'merge'
+        removed: Number of duplicate entries removed so far
+    """
+
+    def __init__(self, policy):
+        if policy not in ("drop", "merge"):
+            raise ValueError(f"Unknown dedupe policy '{policy}' (expected drop or merge)")
+        self.policy = policy
+        self.removed = 0
+
+    def apply(self, entries):
+        """
+        Remove duplicates from sorted entries.
+
+        Args:
+            entries: Iterable of index entries in sorted order
+
+        Yields:
+            Entries in the same order, duplicates removed or merged
+        """
+        for _, group in itertools.groupby(entries, key=itemgetter(0)):
+            first = next(group)
+            rest = list(group)
+            if not rest:
+                yield first
+                continue
+
+            kept = {}
+            for entry in itertools.chain([first], rest):
+                key = (entry.book, entry.page, entry.course)
+                if key in kept:
+                    kept[key].append(entry.description)
+                    self.removed += 1
+                else:
+                    kept[key] = [entry]
+
+            for entry, *descriptions in kept.values():
+                if descriptions and self.policy == "merge":
+                    merged = dict.fromkeys(d for d in [entry.description, *descriptions] if d.strip())
+                    entry = entry._replace(description=MERGE_SEPARATOR.join(merged) or entry.description)
+                yield entry
+
+
+def report_deduplication(policy, removed):
+    """Report how many duplicate entries a drop/merge policy removed (see diagnostic())."""
+    if removed:
+        action = "Dropped" if policy == "drop" else "Merged"
+        diagnostic(f"Info: {action} {removed} duplicate entries")
+
+
+# A run of consecutive sorted entries under one section header
+Section = namedtuple("Section", ["number", "label", "entries"])
+
+
+class Index:
+    """
+    A parsed and sorted index, as returned by build_index().
+
+    The index is not modified after it is built, so one instance can be
+    rendered from several threads at once.
+
+    Attributes:
+        entries: Tuple of Entry in sorted order (after deduplication)
+        has_course: Whether any input has a Course column
+        diagnostics: List of Diagnostic reported while building (warnings, statistics)
+        summaries: List of (input label, ReadSummary) pairs, one per file or worksheet
+        removed: Number of duplicate entries dropped or merged
+    """
+
+    def __init__(self, entries, has_course=False, diagnostics=(), summaries=(), removed=0):
+        self.entries = tuple(entries)
+        self.has_course = has_course
+        self.diagnostics = list(diagnostics)
+        self.summaries = list(summaries)
+        self.removed = removed
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    @property
+    def warnings(self):
+        """Messages of the diagnostics at warning level."""
+        return [d.message for d in self.diagnostics if d.level == "warning"]
+
+    def report(self):
+        """Report the collected diagnostics again, through diagnostic()."""
+        for level, message in self.diagnostics:
+            # Detail lines ('  - ...') were reported without a level prefix
+            diagnostic(message if message.startswith(" ") else f"{level.capitalize()}: {message}")
+
+    def sections(self):
+        """
+        Group the entries as the HTML index shows them.
+
+        Entries without a usable first character are left out, like in the
+        rendered output. A section can occur more than once, e.g. numbers
+        before 'A' and symbols after 'Z'.
+
+        Returns:
+            List of Section(number, label, entries) in document order
+        """
+        sections = []
+        for first_char, group in itertools.groupby(self.entries, key=lambda entry: entry_first_char(entry[0])):
+            if not first_char:
+                continue
+            number, label = section_label(first_char)
+            if sections and sections[-1].number == number:
+                sections[-1].entries.extend(group)
+            else:
+                sections.append(Section(number, label, list(group)))
+        return sections
+
+    def render(self, output=None, format="html"):
+        """
+        Render the index in one of the output formats.
+
+        Args:
+            output: Text or binary file-like object to write to; None returns the document
+            format: Output format name (see OUTPUT_FORMATS)
+
+        Returns:
+            bytes: The UTF-8 encoded document if output is None, otherwise None
+
+        Raises:
+            ValueError: If format is unknown
+        """
+        renderer = OUTPUT_FORMATS.get(format.lower())
+        if renderer is None:
+            raise ValueError(f"Unknown output format '{format}' (expected one of: {', '.join(OUTPUT_FORMATS)})")
+        if output is None:
+            buffer = io.BytesIO()
+            self.render(buffer, format)
+            return buffer.getvalue()
+
+        binary = isinstance(output, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(output, "mode", "")
+        text = io.TextIOWrapper(output, encoding="utf-8", write_through=True) if binary else output
+        try:
+            if renderer is HtmlRenderer:
+                write_index(self.entries, text)
+            else:
+                write_rendered(self.entries, [(renderer(self.has_course), text)])
+        finally:
+            if binary:
+                text.flush()
+                text.detach()  # Leave the caller's stream open
+        return None
+
+
+def build_index(
+    sources,
+    jobs=1,
+    cache_path=None,
+    sheets=None,
+    book_from_sheet=False,
+    dedupe="warn",
+    hash_keys=False,
+    near_duplicates=False,
+):
+    """
+    Parse and sort input files into an Index, without writing any output.
+
+    The library counterpart of generate_index(): warnings and statistics
+    are returned as Index.diagnostics instead of being printed, and the
+    result can be rendered to any stream or to bytes. Safe to call from
+    several threads at once (diagnostics are collected per thread).
+
+    Args:
+        sources: Path to an input file or directory, or a list of them
+        jobs: Number of worker processes for parsing and sorting (1 = in-process)
+        cache_path: Optional SQLite parse cache (see ParseCache)
+        sheets: Excel worksheets to read: None (active sheet), "all", or a list of names
+        book_from_sheet: Fill a missing Book column from the worksheet name
+        dedupe: Duplicate policy: 'warn', 'drop' or 'merge' (see Deduplicator)
+        hash_keys: Track duplicate keys as 64-bit hashes to save memory on huge inputs
+        near_duplicates: Report clusters of similar titles (see NearDuplicateIndex)
+
+    Returns:
+        Index
+
+    Raises:
+        ValueError: If dedupe is unknown or an input is invalid
+        FileNotFoundError: If an input file doesn't exist
+    """
+    if dedupe not in DEDUPE_POLICIES:
+        raise ValueError(f"Unknown dedupe policy '{dedupe}' (expected one of: {', '.join(DEDUPE_POLICIES)})")
+
+    with collect_diagnostics() as messages:
+        filenames = expand_input_paths([sources] if isinstance(sources, (str, os.PathLike)) else sources)
+        summaries = []
+        cache = open_parse_cache(cache_path)
+        try:
+            entries = iter_input_files(filenames, summaries, jobs, cache, sheets, book_from_sheet, hash_keys)
+            finder = NearDuplicateIndex() if near_duplicates else None
+            if finder is not None:
+                entries = finder.observe(entries)
+
+            if jobs > 1:
+                index = SortedPartitions(partition_entries(entries), jobs, dedupe)
+                entries = list(index)
+                removed = index.removed
+            else:
+                entries = sorted(entries, key=itemgetter(0))
+                removed = 0
+                if dedupe != "warn":
+                    deduplicator = Deduplicator(dedupe)
+                    entries = list(deduplicator.apply(entries))
+                    removed = deduplicator.removed
+        finally:
+            if cache is not None:
+                cache.report()
+                cache.close()
+
+        report_input_summaries(summaries)
+        if finder is not None:
+            finder.report()
+        report_deduplication(dedupe, removed)
+
+    has_course = any(summary.has_course_column for _, summary in summaries)
+    return Index(entries, has_course, parse_diagnostics(messages), summaries, removed)
+
+
+def generate_index(
+    filename,
+    output_file=None,
+    max_memory=None,
+    jobs=1,
+    cache_path=None,
+    sheets=None,
+    book_from_sheet=False,
+    dedupe="warn",
+    hash_keys=False,
+    near_duplicates=False,
+    outputs=None,
+    split_sections=False,
+    search_index=False,
+    see_also=0,
+):
+    """
+    Generate HTML index from input file(s) (CSV/TSV/Excel/JSON/JSONL).
+
+    With outputs, the index is parsed and sorted once and rendered to every
+    target in the same pass (see write_rendered()).
+
+    Args:
+        filename: Path to input file (supports .csv, .tsv, .xlsx, .json, .jsonl), or a
+            list of files and/or directories merged into one index
+        output_file: Optional path to output HTML file (default: stdout)
+        outputs: Optional list of further targets, as 'FORMAT:PATH' strings (see
+            parse_output_spec()) or (format, path) tuples; '-' as path is stdout
+        split_sections: Write every section to its own file next to output_file, which
+            becomes a table of contents (see write_split_sections())
+        search_index: Append a search box with prebuilt postings to the HTML (see ClientSearchIndex)
+        see_also: Refer each description to up to this many other entries whose titles it
+            mentions, as links in HTML (0 = off; see CrossReferences)
+        max_memory: Optional sort memory budget in bytes (spills to disk when exceeded)
+        jobs: Number of worker processes for parsing, sorting and rendering (1 = in-process)
+        cache_path: Optional SQLite parse cache; unchanged inputs are loaded instead of re-parsed
+        sheets: Excel worksheets to read: None (active sheet), "all", or a list of names
+        book_from_sheet: Fill a missing Book column from the worksheet name
+        dedupe: Duplicate policy: 'warn' (report only), 'drop' (keep the first occurrence)
+            or 'merge' (keep the first occurrence with all distinct descriptions)
+        hash_keys: Track duplicate keys as 64-bit hashes to save memory on huge inputs
+        near_duplicates: Report clusters of similar titles (see NearDuplicateIndex)
+
+    Raises:
+        ValueError: If jobs > 1 is combined with max_memory, dedupe is unknown, an output is invalid
+            or split_sections lacks a single HTML output file
+    """
+    if jobs > 1 and max_memory is not None:
+        raise ValueError("--jobs and --max-memory cannot be combined (parallel partitions are sorted in memory)")
+    if dedupe not in DEDUPE_POLICIES:
+        raise ValueError(f"Unknown dedupe policy '{dedupe}' (expected one of: {', '.join(DEDUPE_POLICIES)})")
+
+    targets = [("html", output_file)] if output_file else []
+    targets += [parse_output_spec(spec) if isinstance(spec, str) else tuple(spec) for spec in outputs or ()]
+    for file_format, _ in targets:
+        if file_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{file_format}' (expected one of: {', '.join(OUTPUT_FORMATS)})")
+    # A single HTML file keeps the HTML-only writers (and their parallel rendering)
+    output_file = targets.pop()[1] if len(targets) == 1 and targets[0][0] == "html" else None
+    if output_file == "-":
+        output_file = None
+    if split_sections and (targets or not output_file):
+        raise ValueError("--split-sections needs a single HTML output file (the table of contents)")
+    if split_sections and max_memory is not None:
+        raise ValueError("--split-sections and --max-memory cannot be combined (sections are sorted in memory)")
+    if search_index and (targets or split_sections):
+        raise ValueError("--search-index needs a single HTML output (not --split-sections or other formats)")
+    if see_also and split_sections:
+        raise ValueError("--see-also and --split-sections cannot be combined (links would cross section files)")
+
+    filenames = expand_input_paths([filename] if isinstance(filename, (str, os.PathLike)) else filename)
+
+    # Stream entries from the input files (auto-detects format)
+    summaries = []
+    cache = open_parse_cache(cache_path)
+    try:
+        entries = timed_iter(
+            "read", iter_input_files(filenames, summaries, jobs, cache, sheets, book_from_sheet, hash_keys)
+        )
+        finder = NearDuplicateIndex() if near_duplicates else None
+        if finder is not None:
+            entries = timed_iter("near-duplicates", finder.observe(entries))
+        references = CrossReferences(see_also) if see_also else None
+        if references is not None:
+            entries = references.observe(entries)
+
+        if split_sections:
+            # Every section becomes its own file, sorted and rendered separately
+            with timed_stage("partition"):
+                sections = partition_sections(entries)
+        elif jobs > 1:
+            # One pass splits entries into partitions sorted and rendered by workers
+            with timed_stage("partition"):
+                partitions = partition_entries(entries)
+        else:
+            # Pull the first sorted entry: by then the whole input has been consumed,
+            # so the summaries are complete and an empty input creates no output file
+            with timed_stage("sort") as timing:
+                index = iter(sort_entries(entries, max_memory))
+                first_entry = next(index, None)
+                if first_entry is not None:
+                    index = itertools.chain([first_entry], index)
+    finally:
+        if cache is not None:
+            cache.report()
+            cache.close()
+
+    with timed_stage("track duplicates"):
+        report_input_summaries(summaries)
+    if finder is not None:
+        with timed_stage("near-duplicates"):
+            finder.report()
+
+    entry_count = sum(summary.entry_count for _, summary in summaries)
+    has_course = any(summary.has_course_column for _, summary in summaries)
+    if not split_sections and jobs <= 1:
+        timing.rows += entry_count
+
+    if not entry_count:
+        diagnostic("Warning: No valid entries found in input file")
+        return
+
+    if split_sections:
+        with timed_stage("sort and write") as timing:
+            removed = write_split_sections(sections, output_file, jobs, dedupe)
+            timing.rows += entry_count - removed
+        report_deduplication(dedupe, removed)
+        mode_str = " (GSE mode)" if has_course else ""
+        diagnostic(
+            f"Success: Generated index with {entry_count - removed} entries{mode_str} "
+            f"in {len(sections)} section files → {output_file}"
+        )
+        return
+
+    if targets:
+        # Fan-out: one sorted (and deduplicated) stream feeds every renderer
+        counter = None
+        if jobs > 1:
+            index = counter = SortedPartitions(partitions, jobs, dedupe)
+        elif dedupe != "warn":
+            counter = Deduplicator(dedupe)
+            index = timed_iter("dedupe", counter.apply(index))
+        with timed_stage("sort and write" if jobs > 1 else "write") as timing:
+            write_rendered_outputs(index, targets, has_course, references)
+            removed = counter.removed if counter is not None else 0
+            timing.rows += entry_count - removed
+
+        report_deduplication(dedupe, removed)
+        mode_str = " (GSE mode)" if has_course else ""
+        entry_count -= removed
+        paths = ", ".join(path for _, path in targets if path != "-")
+        if paths:
+            diagnostic(f"Success: Generated index with {entry_count} entries{mode_str} → {paths}")
+        return
+
+    # Redirect output to file if specified
+    # A .gz/.bz2/.xz output name is compressed while the index is written
+    output = open_text_output(output_file) if output_file else sys.stdout
+
+    try:
+        with timed_stage("sort and write" if jobs > 1 else "write") as timing:
+            removed = 0
+            if search_index or references is not None:
+                # Search ids follow the written order and cross-references need every
+                # title: workers only sort, this process renders
+                counter = None
+                if jobs > 1:
+                    index = counter = SortedPartitions(partitions, jobs, dedupe)
+                elif dedupe != "warn":
+                    counter = Deduplicator(dedupe)
+                    index = timed_iter("dedupe", counter.apply(index))
+                search = ClientSearchIndex() if search_index else None
+                write_index(search.observe(index) if search else index, output, cross_references=references)
+                if search is not None:
+                    output.write(search.render_script())
+                removed = counter.removed if counter is not None else 0
+            elif jobs > 1:
+                removed = write_index_parallel(partitions, output, jobs, dedupe)
+            elif dedupe != "warn":
+                deduplicator = Deduplicator(dedupe)
+                write_index(timed_iter("dedupe", deduplicator.apply(index)), output)
+                removed = deduplicator.removed
+            else:
+                write_index(index, output)
+            timing.rows += entry_count - removed
+
+        report_deduplication(dedupe, removed)
+        entry_count -= removed
+
+        if output_file:
+            mode_str = " (GSE mode)" if has_course else ""
+            diagnostic(f"Success: Generated index with {entry_count} entries{mode_str} → {output_file}")
+
+    finally:
+        if output_file and output != sys.stdout:
+            output.close()
+
+
+class SortedPartitions:
+    """
+    Iterate over partitions sorted and deduplicated by a process pool, in order.
+
+    Attributes:
+        removed: Number of duplicate entries removed so far (see sort_partition())
+    """
+
+    def __init__(self, partitions, jobs, dedupe="warn"):
+        self.partitions = partitions
+        self.jobs = jobs
+        self.dedupe = dedupe
+        self.removed = 0
+
+    def __iter__(self):
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            for entries, removed in executor.map(sort_partition, self.partitions, itertools.repeat(self.dedupe)):
+                self.removed += removed
+                yield from entries
+
+
+def write_rendered_outputs(index, targets, has_course=False, cross_references=None):
+    """
+    Open output targets and render the sorted index to all of them in one pass.
+
+    Args:
+        index: Iterable of index entries in sorted order
+        targets: List of (format, path) tuples; '-' writes to stdout
+        has_course: Whether the index has a Course column
+        cross_references: Optional CrossReferences (see write_rendered())
+    """
+    with contextlib.ExitStack() as stack:
+        opened = []
+        for file_format, path in targets:
+            output = sys.stdout if path == "-" else stack.enter_context(open_text_output(path))
+            opened.append((OUTPUT_FORMATS[file_format](has_course), output))
+        write_rendered(index, opened, cross_references)
+
+
+def write_file_atomically(path, write):
+    """
+    Write a UTF-8 text file through a temporary file swapped in with os.replace().
+
+    Readers of path see either the old or the new content, never a partial file.
+    The content is compressed if path ends in .gz, .bz2 or .xz.
+
+    Args:
+        path: Destination file
+        write: Callable receiving the open temporary file object
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".xenocrates-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as raw, open_text_output(path, raw) as output:
+            write(output)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def partition_sections(entries):
+    """
+    Split entries by their section (see get_section_header()).
+
+    Entries whose title has no usable first character are dropped, as the
+    writers skip them.
+
+    Args:
+        entries: Iterable of index entries (consumed in one pass)
+
+    Returns:
+        Dict mapping section numbers to entry lists, in ascending section order
+    """
+    sections = defaultdict(list)
+    section_of = {}
+    for entry in entries:
+        first_char = entry_first_char(entry[0])
+        if not first_char:
+            continue
+        section_num = section_of.get(first_char)
+        if section_num is None:
+            section_num = section_of[first_char] = section_label(first_char)[0]
+        sections[section_num].append(entry)
+    return {section_num: sections[section_num] for section_num in sorted(sections)}
+
+
+def section_file_path(output_file, section_num):
+    """
+    Get the file of one section next to the table of contents.
+
+    index.html gives index-a.html ... index-z.html and index-numbers.html;
+    a compression extension is kept at the end (index-a.html.gz).
+    """
+    suffix = compression_suffix(output_file)
+    root, ext = os.path.splitext(output_file[: -len(suffix)] if suffix else output_file)
+    name = string.ascii_lowercase[section_num - 1] if section_num <= 26 else "numbers"
+    return f"{root}-{name}{ext}{suffix}"
+
+
+def write_if_changed(path, text):
+    """
+    Write a UTF-8 text file atomically unless it already holds text.
+
+    Unchanged files keep their modification time, so browsers and sync
+    tools do not fetch them again.
+
+    Returns:
+        bool: True if the file was written
+    """
+    try:
+        with io.TextIOWrapper(open_binary(path), encoding="utf-8") as existing:
+            if existing.read() == text:
+                return False
+    except (OSError, EOFError, UnicodeDecodeError, lzma.LZMAError):
+        pass  # Missing or unreadable: write it
+    write_file_atomically(path, lambda output: output.write(text))
+    return True
+
+
+def write_section_file(entries, path, dedupe="warn"):
+    """
+    Sort, render and write one section file (process pool worker).
+
+    Returns:
+        Tuple of (entries written, duplicates removed, True if the file changed)
+    """
+    entries, removed = sort_partition(entries, dedupe)
+    fragment = io.StringIO()
+    write_index(entries, fragment)
+    return len(entries), removed, write_if_changed(path, fragment.getvalue())
+
+
+# Table of contents of a split index: one link per section file
+SECTION_LINK_TEMPLATE = "<a href='%s'>%s</a> <i>(%d)</i><br>\n"
+
+
+def write_split_sections(sections, output_file, jobs=1, dedupe="warn"):
+    """
+    Write every section to its own HTML file and a table of contents linking to them.
+
+    Section files are rendered in parallel with jobs > 1 and only rewritten
+    when their content changed; files of sections that have become empty
+    are removed.
+
+    Args:
+        sections: Dict of section number -> entries, from partition_sections()
+        output_file: Path of the table of contents; section files are named by section_file_path()
+        jobs: Number of worker processes
+        dedupe: Duplicate policy (see sort_partition())
+
+    Returns:
+        int: Number of duplicate entries removed
+    """
+    paths = [section_file_path(output_file, section_num) for section_num in sections]
+    if jobs > 1 and len(sections) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(sections))) as executor:
+            results = list(executor.map(write_section_file, sections.values(), paths, itertools.repeat(dedupe)))
+    else:
+        results = [write_section_file(entries, path, dedupe) for entries, path in zip(sections.values(), paths)]
 
-    if not entries:
-        raise ValueError("JSON file contains no entries")
+    for section_num in range(1, 28):
+        stale = section_file_path(output_file, section_num)
+        if section_num not in sections and os.path.exists(stale):
+            os.unlink(stale)
 
-    if not isinstance(entries, list):
-        raise ValueError("Entries must be an array/list")
+    contents = [SECTION_HEADER_TEMPLATE % "Index" + "\n"]
+    for section_num, path, (count, _, _) in zip(sections, paths, results):
+        label = section_label(string.ascii_uppercase[section_num - 1] if section_num <= 26 else "#")[1]
+        href = html.escape(urllib.parse.quote(os.path.basename(path)), quote=True)
+        contents.append(SECTION_LINK_TEMPLATE % (href, html.escape(label), count))
+    write_if_changed(output_file, "".join(contents))
 
-    # Validate first entry has required fields
-    if not entries or not isinstance(entries[0], dict):
-        raise ValueError("Each entry must be a JSON object with Title, Description, Page, Book fields")
+    changed = sum(1 for _, _, file_changed in results if file_changed)
+    diagnostic(f"Info: {changed} of {len(results)} section files updated")
+    return sum(removed for _, removed, _ in results)
 
-    # Get field names from first entry (case-insensitive)
-    first_entry = entries[0]
-    fieldnames = list(first_entry.keys())
 
-    # Validate columns using existing validation logic
-    is_valid, error_msg, column_map = validate_columns(fieldnames)
-    if not is_valid:
-        raise ValueError(error_msg)
+class IndexWatcher:
+    """
+    Incrementally rebuild an HTML index when its input files change.
+
+    Each input file is parsed on its own and kept in memory. When a file
+    changes, only that file is re-parsed; only the partitions (see
+    partition_entries()) whose entries actually changed are re-sorted and
+    re-rendered, and the cached fragments of all other partitions are reused.
+    The output file is replaced atomically.
+
+    Attributes:
+        paths: Input files and/or directories being watched
+        output_file: Output HTML file
+        sheets: Excel worksheets to read: None (active sheet), "all", or a list of names
+        book_from_sheet: Fill a missing Book column from the worksheet name
+        dedupe: Duplicate policy ('warn', 'drop' or 'merge'), applied per partition
+        hash_keys: Track duplicates by 64-bit key hashes (see ReadSummary)
+    """
 
-    # Check if optional Course column is present
-    has_course_column = "Course" in column_map
-    if has_course_column:
-        print("Info: Course column detected (GSE mode)", file=sys.stderr)
+    def __init__(self, paths, output_file, sheets=None, book_from_sheet=False, dedupe="warn", hash_keys=False):
+        self.paths = list(paths)
+        self.output_file = output_file
+        self.sheets = sheets
+        self.book_from_sheet = book_from_sheet
+        self.dedupe = dedupe
+        self.hash_keys = hash_keys
+        self._files = {}  # filename -> (fingerprint, entries, [(label, ReadSummary)])
+        self._partitions = {}  # leading character -> entries in input order
+        self._fragments = {}  # leading character -> render_partition() result
+
+    @staticmethod
+    def _fingerprint(filename):
+        stat = os.stat(filename)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _parse(self, filename):
+        """Parse every selected worksheet of a file; return (entries, [(label, ReadSummary)])."""
+        entries = []
+        summaries = []
+        for _, sheet_name in expand_input_sources([filename], self.sheets):
+            sheet_entries, summary = _read_file_worker(filename, sheet_name, self.book_from_sheet, self.hash_keys)
+            entries.extend(sheet_entries)
+            summaries.append((source_label(filename, sheet_name), summary))
+        return entries, summaries
+
+    def refresh(self):
+        """
+        Re-parse changed inputs and regenerate the output if anything changed.
+
+        Returns:
+            bool: True if the output file was rewritten
+        """
+        start = time.perf_counter()
+        filenames = expand_input_paths(self.paths)
+
+        changed = {}
+        for filename in filenames:
+            fingerprint = self._fingerprint(filename)
+            previous = self._files.get(filename)
+            if previous is None or previous[0] != fingerprint:
+                changed[filename] = fingerprint
+        removed = [filename for filename in self._files if filename not in filenames]
+
+        if not changed and not removed:
+            return False
+
+        # Parse everything that changed before touching any state, so a parse
+        # error leaves the watcher consistent for the next attempt
+        parsed = {filename: self._parse(filename) for filename in changed}
+
+        # Partitions touched by the old or new entries of a changed file are dirty
+        dirty = set()
+        for filename in removed:
+            dirty.update(entry[0][:1] for entry in self._files.pop(filename)[1])
+        for filename, (entries, summaries) in parsed.items():
+            for _, summary in summaries:
+                summary.report()
+            if filename in self._files:
+                dirty.update(entry[0][:1] for entry in self._files[filename][1])
+            dirty.update(entry[0][:1] for entry in entries)
+            self._files[filename] = (changed[filename], entries, summaries)
+
+        # Duplicates across inputs are reported for the whole current input set
+        report_cross_file_duplicates([pair for filename in filenames for pair in self._files[filename][2]])
+
+        # Input order decides ties, so partitions are collected in file order
+        partitions = defaultdict(list)
+        for filename in filenames:
+            for entry in self._files[filename][1]:
+                key = entry[0][:1]
+                if key in dirty:
+                    partitions[key].append(entry)
+
+        # Only partitions whose entries actually differ are re-rendered
+        rebuilt = 0
+        for key in dirty:
+            entries = partitions.get(key)
+            if not entries:
+                self._partitions.pop(key, None)
+                self._fragments.pop(key, None)
+            elif entries != self._partitions.get(key):
+                self._partitions[key] = entries
+                self._fragments[key] = render_partition(list(entries), self.dedupe)
+                rebuilt += 1
+
+        entry_count = sum(len(self._files[filename][1]) for filename in filenames)
+        if not entry_count:
+            diagnostic("Warning: No valid entries found in input file")
+            return False
+
+        fragments = [self._fragments[key] for key in sorted(self._fragments)]
+        write_file_atomically(self.output_file, lambda output: write_fragments(fragments, output))
+        removed = sum(fragment[3] for fragment in fragments)
+        report_deduplication(self.dedupe, removed)
+        entry_count -= removed
+
+        elapsed = time.perf_counter() - start
+        names = ", ".join(sorted(changed)) or "file removed"
+        diagnostic(
+            f"Success: Rebuilt {rebuilt} of {len(self._fragments)} partitions ({names}) "
+            f"with {entry_count} entries → {self.output_file} in {elapsed:.2f}s"
+        )
+        return True
 
-    # Get actual field names from user's JSON
-    title_field = column_map.get("Title", "Title")
-    desc_field = column_map.get("Description", "Description")
-    page_field = column_map.get("Page", "Page")
-    book_field = column_map.get("Book", "Book")
-    course_field = column_map.get("Course", "Course")
+    def watch(self, interval=1.0):
+        """
+        Poll the inputs every interval seconds and rebuild on change, until interrupted.
 
-    # Parse entries
-    index = []
-    empty_title_count = 0
-    duplicate_tracker = defaultdict(list)
+        Parse errors are reported and the previous output is kept until the
+        input is fixed.
 
-    for entry_num, entry in enumerate(entries, start=1):
+        Args:
+            interval: Polling interval in seconds
+        """
+        diagnostic(f"Info: Watching {', '.join(self.paths)} (Ctrl+C to stop)")
         try:
-            if not isinstance(entry, dict):
-                print(f"Warning: Entry {entry_num} is not a JSON object, skipping", file=sys.stderr)
-                continue
+            while True:
+                try:
+                    self.refresh()
+                except (ValueError, OSError, csv.Error, UnicodeDecodeError) as e:
+                    diagnostic(f"Error: {e}")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            diagnostic("Info: Watch stopped")
 
-            # Extract values (case-insensitive field access via column_map)
-            title = str(entry.get(title_field, "")).strip()
-            description = str(entry.get(desc_field, "")).strip()
-            page = str(entry.get(page_field, "")).strip()
-            book = str(entry.get(book_field, "")).strip()
-            course = str(entry.get(course_field, "")).strip() if has_course_column else ""
 
-            # Skip entries with empty titles
-            if not title:
-                empty_title_count += 1
-                continue
+# Words indexed for search: runs of letters/digits/underscore, lowercased
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
 
-            # Track duplicates
-            dup_key = (title.upper(), book, page, course) if has_course_column else (title.upper(), book, page)
-            duplicate_tracker[dup_key].append(entry_num)
+# Default and largest number of results returned by one query
+SEARCH_DEFAULT_LIMIT = 50
+SEARCH_MAX_LIMIT = 1000
 
-            # Store entry
-            index.append([title.upper(), description, page, book, course])  # For case-insensitive sorting
+# Prefix words ('kerb*') are checked entry by entry once the other terms leave
+# at most this many matches, instead of merging the postings of every word
+SEARCH_VERIFY_LIMIT = 2000
 
-        except Exception as e:
-            print(f"Warning: Error parsing JSON entry {entry_num}: {e}, skipping", file=sys.stderr)
-            continue
 
-    # Report statistics
-    if empty_title_count > 0:
-        print(f"Info: Skipped {empty_title_count} entries with empty titles", file=sys.stderr)
+def search_tokens(text):
+    """Split text into lowercase search tokens."""
+    return SEARCH_TOKEN_PATTERN.findall(text.lower())
 
-    # Report duplicates
-    duplicates = {k: v for k, v in duplicate_tracker.items() if len(v) > 1}
-    if duplicates:
-        print(f"Warning: Found {len(duplicates)} duplicate entries:", file=sys.stderr)
-        for dup_key, entries_list in list(duplicates.items())[:5]:
-            if has_course_column:
-                title, book, page, course = dup_key
-                print(
-                    f"  - '{title}' (Book: {book}, Course: {course}, Page: {page}) in entries: {', '.join(map(str, entries_list))}",  # noqa: E501
-                    file=sys.stderr,
-                )
-            else:
-                title, book, page = dup_key
-                print(
-                    f"  - '{title}' (Book: {book}, Page: {page}) in entries: {', '.join(map(str, entries_list))}",
-                    file=sys.stderr,
-                )
-        if len(duplicates) > 5:
-            print(f"  ... and {len(duplicates) - 5} more duplicates", file=sys.stderr)
 
-    return index, has_course_column
+class SearchIndex:
+    """
+    In-memory inverted index over the titles and descriptions of an Index.
 
+    Entry ids are positions in the sorted entries, so results in id order
+    are alphabetical. Built once per load; queries only read it, so any
+    number of threads can search at the same time.
 
-def read_input_file(filename):
+    Attributes:
+        index: The searched Index
     """
-    Read input file in any supported format (CSV/TSV/Excel/JSON).
-    Unified entry point that dispatches to format-specific readers.
 
-    Args:
-        filename: Path to input file
+    FILTER_FIELDS = {"page": 2, "book": 3, "course": 4}
+
+    def __init__(self, index):
+        self.index = index
+        postings = defaultdict(list)
+        fields = {name: defaultdict(list) for name in self.FILTER_FIELDS}
+        for entry_id, (title_upper, description, page, book, course) in enumerate(index.entries):
+            for token in set(search_tokens(title_upper) + search_tokens(description)):
+                postings[token].append(entry_id)
+            fields["page"][page.upper()].append(entry_id)
+            fields["book"][book.upper()].append(entry_id)
+            fields["course"][course.upper()].append(entry_id)
+        self._postings = dict(postings)
+        self._fields = {name: dict(values) for name, values in fields.items()}
+        self._vocabulary = sorted(self._postings)  # For prefix tokens (bisect)
+        self._titles = [entry[0] for entry in index.entries]  # Sorted, for title prefixes
+
+    def _prefix_ids(self, prefix):
+        """Ids of entries containing a token that starts with prefix."""
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        ids = set()
+        for word in itertools.islice(self._vocabulary, start, None):
+            if not word.startswith(prefix):
+                break
+            ids.update(self._postings[word])
+        return ids
+
+    def _has_prefix(self, entry_id, prefix):
+        """Whether an entry's title or description has a token starting with prefix."""
+        title_upper, description = self.index.entries[entry_id][:2]
+        return any(token.startswith(prefix) for token in search_tokens(f"{title_upper} {description}"))
+
+    def _title_prefix_ids(self, prefix):
+        """Ids of entries whose title starts with prefix (case-insensitive)."""
+        prefix = prefix.strip().upper()
+        start = bisect.bisect_left(self._titles, prefix)
+        end = bisect.bisect_left(self._titles, prefix + "\U0010ffff")
+        return range(start, end)
+
+    def search(self, query="", mode="text", limit=SEARCH_DEFAULT_LIMIT, **filters):
+        """
+        Find entries by full text or title prefix, optionally filtered by Page/Book/Course.
+
+        Args:
+            query: Words that must all occur in title or description ('text' mode; 'kerb*' is a
+                prefix word), or the start of the title ('prefix' mode); empty matches everything
+            mode: 'text' or 'prefix'
+            limit: Maximum number of results returned
+            **filters: page, book and/or course values an entry must have (case-insensitive)
+
+        Returns:
+            Tuple of (total number of matches, list of the first limit matching Entry in sorted order)
+
+        Raises:
+            ValueError: If mode or a filter is unknown
+        """
+        candidates = []
+        prefixes = []
+        for name, value in filters.items():
+            if name not in self.FILTER_FIELDS:
+                raise ValueError(f"Unknown filter '{name}' (expected one of: {', '.join(self.FILTER_FIELDS)})")
+            if value is not None:
+                candidates.append(self._fields[name].get(value.strip().upper(), ()))
+
+        if mode == "prefix":
+            if query.strip():
+                candidates.append(self._title_prefix_ids(query))
+        elif mode == "text":
+            for token in re.findall(r"\w+\**", query.lower()):
+                if token.endswith("*"):
+                    prefixes.append(token.rstrip("*"))
+                else:
+                    candidates.append(self._postings.get(token, ()))
+        else:
+            raise ValueError(f"Unknown search mode '{mode}' (expected 'text' or 'prefix')")
 
-    Returns:
-        Tuple of (index_data, has_course_column)
-            - index_data: List of [title_upper, description, page, book, course]
-            - has_course_column: Boolean indicating if Course column present
+        if not candidates and prefixes:
+            candidates.append(self._prefix_ids(prefixes.pop()))
 
-    Raises:
-        ValueError: If format unsupported or file invalid
-        FileNotFoundError: If file doesn't exist
-    """
-    # Detect file format from extension
-    file_format = detect_file_format(filename)
+        if not candidates:
+            matches = range(len(self.index.entries))
+        else:
+            # Intersect starting from the shortest posting list
+            candidates.sort(key=len)
+            matches = set(candidates[0])
+            for ids in candidates[1:]:
+                if not matches:
+                    break
+                matches.intersection_update(ids)
+            for prefix in prefixes:
+                if len(matches) <= SEARCH_VERIFY_LIMIT:
+                    matches = {entry_id for entry_id in matches if self._has_prefix(entry_id, prefix)}
+                else:
+                    matches.intersection_update(self._prefix_ids(prefix))
+            matches = sorted(matches)
+
+        entries = self.index.entries
+        return len(matches), [entries[entry_id] for entry_id in itertools.islice(matches, limit)]
+
+
+def _base36(number):
+    """Encode a non-negative integer in base 36 (parseInt(s, 36) in JavaScript)."""
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    encoded = ""
+    while True:
+        number, digit = divmod(number, 36)
+        encoded = digits[digit] + encoded
+        if not number:
+            return encoded
+
+
+# Search box and lookup code appended to the HTML with --search-index. The data
+# holds the sorted tokens ("t") and, per token, the ids of the entries containing
+# it ("p": base-36 gaps joined by '.'); entry id N is the N-th span.topic. The
+# last word of a query matches as a prefix, by binary search over the tokens.
+SEARCH_SCRIPT_TEMPLATE = """<div id=xsearch style='position:fixed;top:8px;right:8px;background:white;\
+border:1px solid #888;padding:4px;max-height:60%%;overflow:auto;font-family:sans-serif'>\
+<input id=xq type=search placeholder='Search' size=30><div id=xr></div></div>
+<script>
+(function(){
+var D=%s,T=D.t,P=D.p,E=document.querySelectorAll("span.topic"),q=document.getElementById("xq"),
+r=document.getElementById("xr");
+function ids(i){var s=P[i].split("."),o=[],n=0;for(var k=0;k<s.length;k++){n+=parseInt(s[k],36);o.push(n)}return o}
+function find(w,prefix){var lo=0,hi=T.length;while(lo<hi){var m=(lo+hi)>>1;if(T[m]<w)lo=m+1;else hi=m}
+if(!prefix)return T[lo]===w?ids(lo):[];var seen={},o=[];
+for(var i=lo;i<T.length&&T[i].lastIndexOf(w,0)===0;i++)ids(i).forEach(function(x){if(!seen[x]){seen[x]=1;o.push(x)}});
+return o.sort(function(a,b){return a-b})}
+function show(){var w=q.value.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu)||[];r.innerHTML="";if(!w.length)return;
+var hits=null;w.forEach(function(t,i){var f=find(t,i===w.length-1);if(hits===null)hits=f;else{var s={};
+f.forEach(function(x){s[x]=1});hits=hits.filter(function(x){return s[x]})}});
+hits.slice(0,%d).forEach(function(id){var a=document.createElement("a");a.href="#";
+a.textContent=E[id].textContent.trim();a.style.display="block";a.onclick=function(e){e.preventDefault();
+E[id].scrollIntoView({block:"center"});E[id].style.background="yellow";
+setTimeout(function(){E[id].style.background=""},1500)};r.appendChild(a)});
+var more=document.createElement("i");more.textContent=hits.length+" found";r.appendChild(more)}
+q.addEventListener("input",show)})();
+</script>
+"""
 
-    # Dispatch to appropriate reader
-    readers = {
-        "csv": read_csv_data,
-        "tsv": read_csv_data,  # Same handler as CSV
-        "excel": read_excel_data,
-        "json": read_json_data,
-    }
 
-    reader = readers[file_format]
-    return reader(filename)
+class ClientSearchIndex:
+    """
+    Prebuilt postings for the search box embedded in the HTML index (--search-index).
 
+    Built at generation time from the entries in the order they are
+    rendered, so the browser only decodes the postings of the words it
+    looks up and never tokenizes the document.
 
-def get_section_header(character):
+    Attributes:
+        count: Number of rendered entries seen so far (the next entry id)
     """
-    Get the HTML section header for a given starting character.
 
-    Args:
-        character: First character of the entry title (uppercase)
+    def __init__(self):
+        self.count = 0
+        self._postings = defaultdict(list)
+
+    def observe(self, entries):
+        """
+        Pass sorted entries through, giving every rendered entry the next id.
+
+        Args:
+            entries: Iterable of index entries in the order they are written
+
+        Yields:
+            The same entries
+        """
+        postings = self._postings
+        for entry in entries:
+            if entry_first_char(entry[0]):
+                for token in set(search_tokens(f"{entry[0]} {entry[1]}")):
+                    postings[token].append(self.count)
+                self.count += 1
+            yield entry
+
+    def to_json(self):
+        """Serialize the postings compactly: sorted tokens and base-36 id gaps."""
+        tokens = sorted(self._postings)
+        encoded = []
+        # Most gaps are small and repeat, so each is encoded only once
+        gap_strings = {}
+        for token in tokens:
+            previous = 0
+            gaps = []
+            for entry_id in self._postings[token]:
+                gap = entry_id - previous
+                text = gap_strings.get(gap)
+                if text is None:
+                    text = gap_strings[gap] = _base36(gap)
+                gaps.append(text)
+                previous = entry_id
+            encoded.append(".".join(gaps))
+        return json.dumps({"t": tokens, "p": encoded}, ensure_ascii=False, separators=(",", ":"))
+
+    def render_script(self, limit=SEARCH_DEFAULT_LIMIT):
+        """Return the search box and lookup script to append to the HTML index."""
+        # '</' would end the <script> element early
+        return SEARCH_SCRIPT_TEMPLATE % (self.to_json().replace("</", "<\\/"), limit)
+
+
+class IndexServer:
+    """
+    Serve searches over an index from a local HTTP endpoint, reloading it when inputs change.
 
-    Returns:
-        Tuple of (section_number, header_html)
+    GET /search?q=WORDS[&mode=text|prefix][&book=B][&page=P][&course=C][&limit=N]
+    answers with JSON: {"total": ..., "results": [{"title": ..., ...}], "took_ms": ...}.
+
+    Attributes:
+        paths: Input files and/or directories
+        options: Keyword arguments passed to build_index()
+        search_index: The current SearchIndex (replaced as a whole on reload)
     """
-    # Map A-Z to section numbers 1-26
-    if character in string.ascii_uppercase:
-        section_num = ord(character) - ord("A") + 1
-        header_label = f"{character}{character.lower()}"
-    else:
-        # Numbers and special characters
-        section_num = 27
-        header_label = "Numbers & Special Characters"
-
-    header_html = (
-        f"<span class=Title1><b><span style='font-size:45.0pt;line-height:107%;"
-        f"color:black'>{header_label}</span></b></span>"
-        f"<span style='font-size:13.5pt;line-height:107%;color:black'><br><br></span>"
-    )
 
-    return section_num, header_html
+    def __init__(self, paths, **options):
+        self.paths = list(paths)
+        self.options = options
+        self.search_index = None
+        self._fingerprints = None
+        self.load()
+
+    def _current_fingerprints(self):
+        fingerprints = {}
+        for filename in expand_input_paths(self.paths):
+            stat = os.stat(filename)
+            fingerprints[filename] = (stat.st_size, stat.st_mtime_ns)
+        return fingerprints
+
+    def load(self):
+        """Parse the inputs and swap in a new SearchIndex."""
+        start = time.perf_counter()
+        fingerprints = self._current_fingerprints()
+        index = build_index(self.paths, **self.options)
+        index.report()
+        self.search_index = SearchIndex(index)
+        self._fingerprints = fingerprints
+        elapsed = time.perf_counter() - start
+        diagnostic(f"Info: Loaded {len(index)} entries in {elapsed:.2f}s")
+
+    def reload_if_changed(self):
+        """
+        Reload the index if an input file changed, was added or was removed.
+
+        A failed reload, whatever the error, is reported and keeps serving the
+        previous index, so the polling thread of serve() never dies.
+
+        Returns:
+            bool: True if the index was reloaded
+        """
+        try:
+            if self._current_fingerprints() == self._fingerprints:
+                return False
+            self.load()
+            return True
+        except (ValueError, OSError, csv.Error, UnicodeDecodeError) as e:
+            diagnostic(f"Error: Reload failed, still serving the previous index: {e}")
+        except Exception as e:  # noqa: BLE001 - a bad reload must not stop the watcher thread
+            diagnostic(f"Error: Reload failed unexpectedly, still serving the previous index: {e!r}")
+        return False
+
+    def query(self, params):
+        """
+        Answer a /search request.
+
+        Args:
+            params: Dict of query parameters (single values)
+
+        Returns:
+            JSON-serializable response dict
+
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        start = time.perf_counter()
+        limit = min(int(params.get("limit", SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT)
+        filters = {name: params.get(name) for name in SearchIndex.FILTER_FIELDS}
+        total, entries = self.search_index.search(params.get("q", ""), params.get("mode", "text"), limit, **filters)
+        results = [
+            {"title": title, "description": description, "page": page, "book": book, "course": course}
+            for title, description, page, book, course in entries
+        ]
+        took_ms = (time.perf_counter() - start) * 1000
+        return {"total": total, "results": results, "took_ms": round(took_ms, 3)}
+
+    def make_server(self, host="127.0.0.1", port=8000):
+        """Create the HTTP server (not started); port 0 picks a free port."""
+        index_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                if url.path != "/search":
+                    return self._send(404, {"error": "Not found; use /search?q=..."})
+                params = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+                try:
+                    return self._send(200, index_server.query(params))
+                except ValueError as e:
+                    return self._send(400, {"error": str(e)})
+
+            def _send(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep stderr for diagnostics
+
+        return ThreadingHTTPServer((host, port), Handler)
+
+    def serve(self, host="127.0.0.1", port=8000, interval=1.0):
+        """Serve until interrupted, checking the inputs for changes every interval seconds."""
+        server = self.make_server(host, port)
+        stop = threading.Event()
+
+        def watch():
+            while not stop.wait(interval):
+                self.reload_if_changed()
+
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+        host, port = server.server_address[:2]
+        diagnostic(f"Info: Serving on http://{host}:{port}/search?q=... (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            diagnostic("Info: Server stopped")
+        finally:
+            stop.set()
+            server.server_close()
 
 
-def print_entry(title, description, page, book, course=""):
+def serve_main(argv):
+    """Entry point of 'xenocrates.py serve'."""
+    parser = argparse.ArgumentParser(
+        prog="xenocrates.py serve",
+        description="Search the index over a local HTTP endpoint (GET /search?q=...), reloading it when inputs change",
+    )
+    parser.add_argument("paths", nargs="+", metavar="input_file", help="Input files or directories")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: %(default)s)")
+    parser.add_argument(
+        "--interval", type=float, default=1.0, metavar="SECONDS", help="Input polling interval (default: 1.0)"
+    )
+    parser.add_argument("-j", "--jobs", type=_jobs_arg, default=1, metavar="N", help="Worker processes for parsing")
+    parser.add_argument("--sheets", type=_sheets_arg, default=None, metavar="NAMES", help="Excel worksheets to read")
+    parser.add_argument("--book-from-sheet", action="store_true", help="Excel: use the worksheet name as Book")
+    parser.add_argument("--dedupe", choices=DEDUPE_POLICIES, default="warn", help="Duplicate entries policy")
+    parser.add_argument(
+        "--cache", dest="cache_path", default=default_cache_path(), metavar="PATH", help="Parse cache file"
+    )
+    parser.add_argument("--no-cache", dest="cache_path", action="store_const", const=None, help="Disable the cache")
+    args = parser.parse_args(argv)
+
+    if STDIN_PATH in args.paths:
+        parser.error("serve cannot read from stdin")
+    try:
+        server = IndexServer(
+            args.paths,
+            jobs=args.jobs,
+            cache_path=args.cache_path,
+            sheets=args.sheets,
+            book_from_sheet=args.book_from_sheet,
+            dedupe=args.dedupe,
+        )
+    except (ValueError, OSError, ImportError, csv.Error, UnicodeDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    server.serve(args.host, args.port, args.interval)
+
+
+# A batch manifest job: inputs merged into one index, written to (format, path)
+# targets, with generate_index() keyword options; error is set (and the job not
+# run) if the manifest entry is invalid
+BatchJob = namedtuple("BatchJob", ["name", "inputs", "outputs", "options", "error"], defaults=(None,))
+
+# Outcome of a batch job: error is None on success; diagnostics are those of its generate_index() run
+BatchResult = namedtuple("BatchResult", ["name", "error", "seconds", "diagnostics"])
+
+# Per-job manifest options, with the check their value must pass
+BATCH_OPTIONS = {
+    "sheets": lambda value: value is None or isinstance(value, (str, list)),
+    "book_from_sheet": lambda value: isinstance(value, bool),
+    "dedupe": lambda value: value in DEDUPE_POLICIES,
+    "hash_keys": lambda value: isinstance(value, bool),
+    "near_duplicates": lambda value: isinstance(value, bool),
+    "split_sections": lambda value: isinstance(value, bool),
+    "search_index": lambda value: isinstance(value, bool),
+    "see_also": lambda value: isinstance(value, int) and value >= 0,
+    "max_memory": lambda value: isinstance(value, (str, int)) and not isinstance(value, bool),
+}
+
+
+def _batch_job(number, spec, base_dir):
+    """Validate one manifest job (defaults already applied) and resolve its paths against base_dir."""
+    spec = dict(spec)
+    label = f"Job {number}" + (f" ({spec['name']})" if "name" in spec else "")
+
+    inputs = spec.pop("inputs", spec.pop("input", None))
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    if not inputs or not all(isinstance(path, str) for path in inputs):
+        raise ValueError(f"{label}: 'inputs' must be a path or a list of paths")
+
+    specs = spec.pop("outputs", [])
+    if isinstance(specs, str):
+        specs = [specs]
+    if "output" in spec:
+        specs = [spec.pop("output"), *specs]
+    if not specs or not all(isinstance(target, str) for target in specs):
+        raise ValueError(f"{label}: 'output' or 'outputs' must give at least one output file")
+
+    try:
+        outputs = [parse_output_spec(target) for target in specs]
+    except ValueError as e:
+        raise ValueError(f"{label}: {e}")
+    if STDIN_PATH in inputs or any(path == "-" for _, path in outputs):
+        raise ValueError(f"{label}: batch jobs read and write files, not stdin/stdout")
+    outputs = [(file_format, os.path.join(base_dir, path)) for file_format, path in outputs]
+
+    name = str(spec.pop("name", outputs[0][1]))
+    for option, value in spec.items():
+        check = BATCH_OPTIONS.get(option)
+        if check is None:
+            raise ValueError(f"{label}: unknown option '{option}' (expected one of: {', '.join(BATCH_OPTIONS)})")
+        if option == "see_also" and isinstance(value, bool):
+            value = spec[option] = SEE_ALSO_MAX_LINKS if value else 0
+        if not check(value):
+            raise ValueError(f"{label}: invalid value for '{option}': {value!r}")
+    if isinstance(spec.get("sheets"), str):
+        spec["sheets"] = "all" if spec["sheets"].lower() == "all" else [s for s in spec["sheets"].split(",") if s]
+    if isinstance(spec.get("max_memory"), str):
+        spec["max_memory"] = parse_memory_size(spec["max_memory"])
+
+    return BatchJob(name, [os.path.join(base_dir, path) for path in inputs], outputs, spec)
+
+
+def load_manifest(path):
     """
-    Print a single index entry in HTML format to stdout.
+    Read a batch manifest (TOML or JSON) into a list of jobs.
+
+    The manifest has a list of jobs and optional defaults applied to every
+    job. A job gives 'inputs' (a path or list of files and directories),
+    'output' and/or 'outputs' ('[FORMAT:]PATH' as with --output), an
+    optional 'name', and any of BATCH_OPTIONS. Relative paths are relative
+    to the manifest's directory. An invalid job does not stop the others: it
+    is returned with its error set (see run_batch()). In TOML:
+
+        [defaults]
+        dedupe = "merge"
+
+        [[jobs]]
+        name = "sec401"
+        inputs = ["shared/glossary.tsv", "sec401.xlsx"]
+        outputs = ["out/sec401.html", "md:out/sec401.md"]
+        see_also = true
 
     Args:
-        title: Entry title (will be HTML escaped)
-        description: Entry description (will be HTML escaped)
-        page: Page number (will be HTML escaped)
-        book: Book/course identifier (will be HTML escaped)
-        course: Optional course identifier (will be HTML escaped)
+        path: Manifest file; '.toml' is TOML (Python 3.11+), anything else JSON
+
+    Returns:
+        List of BatchJob, in manifest order
+
+    Raises:
+        ValueError: If the manifest cannot be read or has no jobs
     """
-    print_entry_to_file(title, description, page, book, course, sys.stdout)
+    with open(path, "rb") as f:
+        if path.lower().endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("TOML manifests need Python 3.11 or later (use a JSON manifest)")
+            try:
+                manifest = tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise ValueError(f"Invalid TOML manifest {path}: {e}")
+        else:
+            try:
+                manifest = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON manifest {path}: {e}")
+
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list) or not manifest["jobs"]:
+        raise ValueError(f"Manifest {path} has no 'jobs' list")
+    defaults = manifest.get("defaults", {})
+    if not isinstance(defaults, dict):
+        raise ValueError(f"Manifest {path}: 'defaults' must be a table/object")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    for number, spec in enumerate(manifest["jobs"], 1):
+        name = spec.get("name") if isinstance(spec, dict) else None
+        name = str(name) if name is not None else f"job {number}"
+        try:
+            if not isinstance(spec, dict):
+                raise ValueError(f"Job {number}: expected a table/object")
+            jobs.append(_batch_job(number, {**defaults, **spec}, base_dir))
+        except ValueError as e:
+            jobs.append(BatchJob(name, [], [], {}, str(e)))
+    return jobs
 
 
-def print_entry_to_file(title, description, page, book, course, output):
+def shared_batch_inputs(jobs):
     """
-    Print a single index entry in HTML format to specified file.
+    Find the input files read by more than one job with the same read options.
 
-    Args:
-        title: Entry title (will be HTML escaped)
-        description: Entry description (will be HTML escaped)
-        page: Page number (will be HTML escaped)
-        book: Book/course identifier (will be HTML escaped)
-        course: Optional course identifier (will be HTML escaped)
-        output: File object to write to
+    Returns:
+        List of (filename, sheets, book_from_sheet) tuples, in first-use order
     """
-    # HTML escape all fields, including quotes (quote=True)
-    title_escaped = html.escape(title, quote=True)
-    desc_escaped = html.escape(description, quote=True)
-    page_escaped = html.escape(page, quote=True)
-    book_escaped = html.escape(book, quote=True)
-    course_escaped = html.escape(course, quote=True) if course else ""
+    users = defaultdict(set)
+    for number, job in enumerate(jobs):
+        if job.error is not None:
+            continue
+        try:
+            filenames = expand_input_paths(job.inputs)
+        except ValueError:  # reported by the job
+            continue
+        for filename in filenames:
+            sheets = job.options.get("sheets")
+            key = (os.path.abspath(filename), tuple(sheets) if isinstance(sheets, list) else sheets)
+            users[key + (job.options.get("book_from_sheet", False),)].add(number)
+    return [
+        (filename, list(sheets) if isinstance(sheets, tuple) else sheets, book_from_sheet)
+        for (filename, sheets, book_from_sheet), numbers in users.items()
+        if len(numbers) > 1
+    ]
+
+
+def _warm_batch_input(filename, sheets, book_from_sheet, cache_path):
+    """Parse one shared input into the parse cache (batch worker); jobs then load it from there."""
+    with collect_diagnostics():
+        cache = open_parse_cache(cache_path)
+        try:
+            for _ in iter_input_files([filename], [], 1, cache, sheets, book_from_sheet):
+                pass
+        except Exception:  # noqa: BLE001 - every job reading the file reports the error itself
+            pass
+        finally:
+            if cache is not None:
+                cache.close()
 
-    # Print entry in format
-    print("<span class=topic><b><span style='color:blue'>", file=output)
-    print(f" {title_escaped} ", file=output)
-    print("</span></b></span><span style='color:black'>&nbsp;", file=output)
 
-    # Build reference string: {c-575 / b-SEC401 / p-142} or {b-SEC401 / p-142}
-    if course:
-        ref_str = f"{{c-{course_escaped} / b-{book_escaped} / p-{page_escaped}}}"
-    else:
-        ref_str = f"{{b-{book_escaped} / p-{page_escaped}}}"
+def run_batch_job(job, cache_path=None):
+    """
+    Run one batch job with generate_index(), collecting its diagnostics.
+
+    Args:
+        job: BatchJob
+        cache_path: Parse cache shared by the jobs of the batch
 
-    print(f"<br><i>{ref_str}</i><br>{desc_escaped}<br></span>", file=output)
+    Returns:
+        BatchResult; a failed job has its error message instead of raising
+    """
+    start = time.perf_counter()
+    error = None
+    outputs = {path for _, path in job.outputs}
+    with collect_diagnostics() as messages:
+        try:
+            for directory in sorted({os.path.dirname(path) for path in outputs} - {""}):
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                except OSError as e:
+                    raise ValueError(f"Cannot create output directory '{directory}': {e.strerror or e}")
+            generate_index(job.inputs, outputs=job.outputs, cache_path=cache_path, **job.options)
+        except FileNotFoundError as e:
+            if e.filename in outputs:
+                error = f"Cannot write output file '{e.filename}': {e.strerror}"
+            else:
+                error = f"File '{e.filename or job.inputs[0]}' not found"
+        except (ValueError, OSError, ImportError, csv.Error, UnicodeDecodeError) as e:
+            error = str(e)
+        except Exception as e:  # noqa: BLE001 - one broken job must not stop the batch
+            error = f"Unexpected error: {e}"
+    return BatchResult(job.name, error, time.perf_counter() - start, parse_diagnostics(messages))
 
 
-def generate_index(filename, output_file=None):
+def run_batch(jobs, workers=1, cache_path=None):
     """
-    Generate HTML index from input file (CSV/TSV/Excel/JSON).
+    Run batch jobs, parsing inputs shared between jobs only once.
+
+    Shared inputs are parsed first (concurrently, into the parse cache);
+    then the jobs run, loading those inputs from the cache. Without a
+    cache_path a temporary cache is used for the batch. With workers > 1
+    both steps run on one process pool, so every worker imports Xenocrates
+    once for the whole batch. Invalid jobs (see load_manifest()) are not
+    run; their result is their error.
 
     Args:
-        filename: Path to input file (supports .csv, .tsv, .xlsx, .json)
-        output_file: Optional path to output HTML file (default: stdout)
+        jobs: List of BatchJob (see load_manifest())
+        workers: Number of worker processes (1 = in-process, one job after another)
+        cache_path: Optional persistent parse cache
+
+    Returns:
+        List of BatchResult, in job order
     """
-    # Read and parse input file (auto-detects format)
-    index, has_course = read_input_file(filename)
+    runnable = [job for job in jobs if job.error is None]
+    with contextlib.ExitStack() as stack:
+        if cache_path is None:
+            cache_path = os.path.join(stack.enter_context(tempfile.TemporaryDirectory()), "batch-cache.sqlite3")
+        shared = shared_batch_inputs(runnable)
+
+        if workers <= 1 or len(runnable) <= 1:
+            for filename, sheets, book_from_sheet in shared:
+                _warm_batch_input(filename, sheets, book_from_sheet, cache_path)
+            results = [run_batch_job(job, cache_path) for job in runnable]
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=min(workers, len(runnable))))
+            if shared:
+                list(executor.map(_warm_batch_input, *zip(*shared), itertools.repeat(cache_path)))
+            results = list(executor.map(run_batch_job, runnable, itertools.repeat(cache_path)))
 
-    if not index:
-        print("Warning: No valid entries found in input file", file=sys.stderr)
-        return
+    results = iter(results)
+    return [next(results) if job.error is None else BatchResult(job.name, job.error, 0.0, []) for job in jobs]
 
-    # Sort alphabetically by title (case-insensitive, already uppercase)
-    index = sorted(index, key=itemgetter(0))
 
-    # Redirect output to file if specified
-    output = open(output_file, "w", encoding="utf-8") if output_file else sys.stdout
+def batch_main(argv):
+    """Entry point of 'xenocrates.py batch'."""
+    parser = argparse.ArgumentParser(
+        prog="xenocrates.py batch",
+        description="Build every index listed in a manifest (TOML or JSON) in one run, "
+        "parsing input files shared between jobs only once",
+    )
+    parser.add_argument("manifest", help="Manifest file (.toml or .json), see load_manifest()")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_jobs_arg,
+        default=0,
+        metavar="N",
+        help="Worker processes running the jobs (0 = one per CPU; default: 0)",
+    )
+    parser.add_argument(
+        "--cache", dest="cache_path", default=default_cache_path(), metavar="PATH", help="Parse cache file"
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache_path",
+        action="store_const",
+        const=None,
+        help="Use a temporary parse cache for this batch only",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show every job's warnings and statistics")
+    args = parser.parse_args(argv)
+    jobs = args.jobs or os.cpu_count() or 1
 
     try:
-        # Track current section to avoid duplicate headers
-        current_section = 0
+        manifest_jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-        # Process each entry
-        for entry in index:
-            title_upper, description, page, book, course = entry
+    start = time.perf_counter()
+    results = run_batch(manifest_jobs, jobs, args.cache_path)
+    failed = 0
+    for result in results:
+        warnings = sum(1 for d in result.diagnostics if d.level == "warning" and not d.message.startswith(" "))
+        if result.error is None:
+            notes = f", {warnings} warning{'s' if warnings != 1 else ''}" if warnings else ""
+            diagnostic(f"Success: [{result.name}] built in {result.seconds:.2f}s{notes}")
+        else:
+            failed += 1
+            diagnostic(f"Error: [{result.name}] {result.error}")
+        if args.verbose:
+            for level, message in result.diagnostics:
+                diagnostic(f"    {message}" if message.startswith(" ") else f"    {level.capitalize()}: {message}")
+
+    diagnostic(
+        f"Info: Batch finished in {time.perf_counter() - start:.2f}s: "
+        f"{len(results) - failed} of {len(results)} jobs succeeded"
+    )
+    if failed:
+        sys.exit(1)
 
-            # Get first character (strip quotes if present)
-            first_char = title_upper.strip('"').lstrip('"')[0] if title_upper else ""
 
-            if not first_char:
-                continue
+def _memory_size_arg(value):
+    """argparse type wrapper for parse_memory_size()."""
+    try:
+        return parse_memory_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
-            # Determine section and print header if changed
-            section_num, section_header = get_section_header(first_char)
 
-            if section_num != current_section:
-                print(section_header, file=output)
-                current_section = section_num
+def split_cli_paths(paths):
+    """
+    Split positional CLI paths into input paths and an optional output file.
 
-            # Print the entry with explicit file parameter
-            print_entry_to_file(title_upper, description, page, book, course, output)
+    Keeps the legacy 'input_file [output_file]' form working alongside
+    multiple inputs: of exactly two paths, the second is the output unless it
+    is a directory or '-'; three or more paths are all inputs (the output is
+    then given with -o). Whether the last path exists does not matter, so a
+    previous output is never read back as an input.
 
-        if output_file:
-            mode_str = " (GSE mode)" if has_course else ""
-            print(f"Success: Generated index with {len(index)} entries{mode_str} → {output_file}", file=sys.stderr)
+    Args:
+        paths: Positional paths from the command line
+
+    Returns:
+        Tuple of (input_paths, output_file or None)
+    """
+    if len(paths) != 2:
+        return paths, None
+
+    last = paths[-1]
+    if last == STDIN_PATH or os.path.isdir(last):
+        return paths, None
+    return paths[:-1], last
+
+
+def _jobs_arg(value):
+    """argparse type for --jobs: a positive worker count, or 0 for one per CPU."""
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid job count: '{value}'")
+    if jobs < 0:
+        raise argparse.ArgumentTypeError("job count cannot be negative")
+    return jobs or os.cpu_count() or 1
+
+
+def _see_also_limit_arg(value):
+    """argparse type for --see-also-limit: a positive number of references."""
+    try:
+        limit = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid reference limit: '{value}'")
+    if limit < 1:
+        raise argparse.ArgumentTypeError("reference limit must be at least 1")
+    return limit
 
-    finally:
-        if output_file and output != sys.stdout:
-            output.close()
+
+def _sheets_arg(value):
+    """argparse type for --sheets: "all", or a comma-separated list of worksheet names."""
+    if value.strip().lower() == "all":
+        return "all"
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    if not names:
+        raise argparse.ArgumentTypeError("no worksheet names given")
+    return names
 
 
 def main():
     """Main entry point."""
+    if sys.argv[1:2] == ["serve"]:
+        return serve_main(sys.argv[2:])
+    if sys.argv[1:2] == ["batch"]:
+        return batch_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(
         description="Xenocrates - GIAC Certification Exam Index Generator",
-        epilog="Examples: xenocrates.py notes.tsv index.html | xenocrates.py notes.xlsx index.html | xenocrates.py notes.json index.html",  # noqa: E501
+        epilog="Examples: xenocrates.py notes.tsv index.html | xenocrates.py notes.xlsx index.html | xenocrates.py notes.json index.html | xenocrates.py book1.xlsx book2.tsv notes/ -o index.html | cat notes.tsv | xenocrates.py - index.html",  # noqa: E501
+    )
+
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        metavar="input_file",
+        help="Input files (.csv, .tsv, .xlsx, .json, .jsonl) or directories of them, with columns: "
+        "Title, Description, Page, Book, Course (optional); '-' reads stdin (format detected from content). "
+        "Of exactly two paths, the second is the output HTML file unless it is a directory or '-'; "
+        "more paths are all inputs, use -o (default: print to stdout for redirection)",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="outputs",
+        action="append",
+        default=None,
+        metavar="[FORMAT:]PATH",
+        help="Output file; repeat to write several formats from one parse and sort. FORMAT is one of "
+        f"{', '.join(renderer.names[0] for renderer in RENDERERS)} (default: from the extension, else html); "
+        "PATH '-' is stdout",
+    )
+
+    parser.add_argument(
+        "--split-sections",
+        action="store_true",
+        help="Write every section (Aa, Bb, ..., Numbers) to its own HTML file next to the output file, "
+        "which becomes a table of contents; unchanged section files are not rewritten",
+    )
+
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="Add a search box to the HTML, backed by a word index built now (no tokenizing in the browser)",
+    )
+
+    parser.add_argument(
+        "--see-also",
+        action="store_true",
+        help="Append 'See also' references to entries whose description mentions other indexed titles "
+        "(links in HTML, text in other formats)",
+    )
+
+    parser.add_argument(
+        "--see-also-limit",
+        type=_see_also_limit_arg,
+        default=SEE_ALSO_MAX_LINKS,
+        metavar="N",
+        help="Most references per entry with --see-also (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Report wall time, rows/sec and peak memory of every pipeline stage on stderr",
+    )
+
+    parser.add_argument(
+        "--stats-json",
+        metavar="PATH",
+        help="Write the --stats report as JSON to PATH (implies --stats without the summary)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Profile the run with cProfile: pstats data to PATH, collapsed stacks for flame graphs "
+        "to PATH.collapsed",
+    )
+
+    parser.add_argument(
+        "--max-memory",
+        type=_memory_size_arg,
+        default=None,
+        metavar="SIZE",
+        help="Sort memory budget (e.g. 512M, 2G); sorted runs spill to temporary files once exceeded",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_jobs_arg,
+        default=1,
+        metavar="N",
+        help="Parse input files and sort/render sections in N worker processes (0 = one per CPU; default: 1)",
+    )
+
+    parser.add_argument(
+        "--sheets",
+        type=_sheets_arg,
+        default=None,
+        metavar="NAMES",
+        help="Excel worksheets to read: 'all' or a comma-separated list of names (default: the active sheet); "
+        "with --jobs the worksheets are parsed concurrently",
+    )
+
+    parser.add_argument(
+        "--book-from-sheet",
+        action="store_true",
+        help="Excel: use the worksheet name as Book for sheets without a Book column",
+    )
+
+    parser.add_argument(
+        "--dedupe",
+        choices=DEDUPE_POLICIES,
+        default="warn",
+        help="Duplicate entries (same title, book, page and course, also across files): 'warn' lists them, "
+        "'drop' keeps only the first, 'merge' keeps the first with all distinct descriptions (default: warn)",
+    )
+
+    parser.add_argument(
+        "--hash-keys",
+        action="store_true",
+        help="Track duplicates by 64-bit key hashes instead of full titles (less memory for huge inputs)",
+    )
+
+    parser.add_argument(
+        "--near-duplicates",
+        action="store_true",
+        help="Report groups of similar titles (e.g. 'SQL Injection' ~ 'SQL-Injection' ~ 'SQLi Injection') "
+        "that were probably meant to be one entry",
+    )
+
+    parser.add_argument(
+        "--cache",
+        dest="cache_path",
+        default=default_cache_path(),
+        metavar="PATH",
+        help="Parse cache file; unchanged inputs load from it instead of being re-parsed (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--no-cache", dest="cache_path", action="store_const", const=None, help="Always re-parse every input file"
     )
 
     parser.add_argument(
-        "input_file",
-        help="Input file (.csv, .tsv, .xlsx, .json) with columns: Title, Description, Page, Book, Course (optional)",
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate the output whenever an input file changes",
     )
 
     parser.add_argument(
-        "output_file", nargs="?", default=None, help="Output HTML file (default: print to stdout for redirection)"
+        "--interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Polling interval for --watch (default: 1.0)",
     )
 
     parser.add_argument("--version", action="version", version=f"Xenocrates {__version__}")
 
     args = parser.parse_args()
 
+    if args.outputs:
+        input_files = args.paths
+        try:
+            targets = [parse_output_spec(spec) for spec in args.outputs]
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        # The legacy positional output is always HTML, whatever its extension (see -o for other formats)
+        input_files, output_file = split_cli_paths(args.paths)
+        targets = [("html", output_file)] if output_file else []
+
+    if args.jobs > 1 and args.max_memory is not None:
+        parser.error("--jobs and --max-memory cannot be combined")
+
+    if args.watch:
+        if not targets:
+            parser.error("--watch requires an output file")
+        if len(targets) > 1 or targets[0][0] != "html" or targets[0][1] == "-":
+            parser.error("--watch writes a single HTML output file")
+        if args.max_memory is not None:
+            parser.error("--watch keeps the index in memory and cannot be combined with --max-memory")
+        if args.near_duplicates:
+            parser.error("--near-duplicates cannot be combined with --watch")
+        if args.split_sections:
+            parser.error("--split-sections cannot be combined with --watch")
+        if args.search_index:
+            parser.error("--search-index cannot be combined with --watch")
+        if args.see_also:
+            parser.error("--see-also cannot be combined with --watch")
+        if args.stats or args.stats_json or args.profile:
+            parser.error("--stats, --stats-json and --profile cannot be combined with --watch")
+        if args.jobs > 1:
+            parser.error("--watch re-parses only changed files and cannot be combined with --jobs")
+        if args.cache_path not in (None, parser.get_default("cache_path")):
+            parser.error("--watch keeps parsed inputs in memory and cannot be combined with --cache")
+        if STDIN_PATH in input_files:
+            parser.error("--watch cannot read from stdin")
+        watcher = IndexWatcher(
+            input_files, targets[0][1], args.sheets, args.book_from_sheet, args.dedupe, args.hash_keys
+        )
+        watcher.watch(args.interval)
+        return
+
+    stats = None
     try:
-        generate_index(args.input_file, args.output_file)
-    except FileNotFoundError:
-        print(f"Error: File '{args.input_file}' not found", file=sys.stderr)
+        with contextlib.ExitStack() as stack:
+            if args.stats or args.stats_json:
+                stats = stack.enter_context(record_stats())
+            if args.profile:
+                stack.enter_context(profile_to(args.profile))
+            generate_index(
+                input_files,
+                max_memory=args.max_memory,
+                jobs=args.jobs,
+                cache_path=args.cache_path,
+                sheets=args.sheets,
+                book_from_sheet=args.book_from_sheet,
+                dedupe=args.dedupe,
+                hash_keys=args.hash_keys,
+                near_duplicates=args.near_duplicates,
+                outputs=targets,
+                split_sections=args.split_sections,
+                search_index=args.search_index,
+                see_also=args.see_also_limit if args.see_also else 0,
+            )
+        if args.stats:
+            stats.report()
+        if args.stats_json:
+            stats.write_json(args.stats_json)
+    except FileNotFoundError as e:
+        print(f"Error: File '{e.filename or input_files[0]}' not found", file=sys.stderr)
         sys.exit(1)
-    except PermissionError:
-        print(f"Error: Permission denied reading '{args.input_file}'", file=sys.stderr)
+    except PermissionError as e:
+        print(f"Error: Permission denied reading '{e.filename or input_files[0]}'", file=sys.stderr)
         sys.exit(1)
     except ImportError as e:
         print(f"Error: {e}", file=sys.stderr)